@@ -2,55 +2,378 @@
 Hidemium API Service
 Kết nối với Hidemium Browser API
 """
+import copy
+import math
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
-from typing import Optional, Dict, List, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, List, Any, Iterator, Callable, Set
 from config import HIDEMIUM_BASE_URL, HIDEMIUM_TOKEN
 
+# Số kết nối keep-alive giữ tới Hidemium (dùng chung cho mọi thread)
+POOL_SIZE = 32
+# Retry khi kết nối bị từ chối (request chưa tới server), hoặc lỗi đọc với GET thuần đọc
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.3  # giây: 0.3, 0.6, ...
+# GET nhưng đổi trạng thái: lỗi đọc có thể xảy ra sau khi server đã mở/đóng browser, không gửi lại
+NO_READ_RETRY_ENDPOINTS = ("/openProfile", "/closeProfile")
+
+CONNECT_TIMEOUT = 3  # Hidemium chạy local, kết nối lâu hơn vậy là daemon đã treo
+DEFAULT_TIMEOUT = 30
+# Read timeout theo endpoint (giây)
+ENDPOINT_TIMEOUTS = {
+    "/v2/status-profile": 5,
+    "/v2/tag": 5,
+    "/authorize": 10,
+    "/closeProfile": 15,
+    "/v1/browser/list": 20,
+    "/v1/folder/list": 10,
+    "/openProfile": 60,
+}
+
+# Số trang profiles tải song song trong iter_profiles()
+PROFILE_FETCH_WORKERS = 4
+
+# TTL (giây) cho response của các endpoint ít thay đổi, theo nhóm cache
+CACHE_TTLS = {
+    "folders": 60,
+    "tags": 300,
+    "default_configs": 600,
+    "status_list": 10,  # Cùng endpoint với trạng thái running, giữ ngắn
+    "scripts": 120,
+}
+
+# Số mẫu thời gian gần nhất giữ lại cho mỗi endpoint (tính p50/p95/p99)
+METRICS_WINDOW = 1000
+# In log cho request chậm hơn ngưỡng này (giây); None = tắt
+SLOW_CALL_THRESHOLD: Optional[float] = 2.0
+
+# Đoạn path là uuid/số -> {id}, để /v1/browser/<uuid> gộp chung một endpoint
+_ID_SEGMENT = re.compile(r"^(?:\d+|[0-9a-fA-F-]{16,})$")
+
+
+class ApiMetrics:
+    """
+    Thống kê request theo endpoint, thread-safe.
+
+    Mỗi endpoint (method + path đã thay id bằng {id}) giữ số lần gọi, số byte,
+    số lỗi theo loại (connection, timeout, http, parse) và METRICS_WINDOW thời gian
+    gần nhất để tính p50/p95/p99.
+    """
+
+    ERROR_KINDS = ("connection", "timeout", "http", "parse")
+
+    def __init__(self, window: int = METRICS_WINDOW, slow_threshold: Optional[float] = SLOW_CALL_THRESHOLD):
+        self.window = window
+        self.slow_threshold = slow_threshold
+        self._lock = threading.Lock()
+        self._routes: Dict[str, dict] = {}
+        self._since = time.time()
+
+    @staticmethod
+    def route_key(method: str, endpoint: str) -> str:
+        path = endpoint.split("?", 1)[0]
+        path = "/".join("{id}" if _ID_SEGMENT.match(part) else part for part in path.split("/"))
+        return f"{method.upper()} {path}"
+
+    def record(self, method: str, endpoint: str, duration: float, status: Optional[int] = None,
+               size: int = 0, error: Optional[str] = None):
+        """Ghi một request: thời gian (giây), HTTP status, số byte response, loại lỗi nếu có"""
+        key = self.route_key(method, endpoint)
+        with self._lock:
+            route = self._routes.get(key)
+            if route is None:
+                route = self._routes[key] = {
+                    'durations': deque(maxlen=self.window), 'calls': 0, 'bytes': 0,
+                    'errors': dict.fromkeys(self.ERROR_KINDS, 0), 'last_status': None,
+                    'last_error': None, 'max': 0.0,
+                }
+            route['calls'] += 1
+            route['bytes'] += size
+            route['durations'].append(duration)
+            route['max'] = max(route['max'], duration)
+            if status is not None:
+                route['last_status'] = status
+            if error:
+                route['errors'][error] += 1
+                route['last_error'] = time.time()
+
+        if self.slow_threshold is not None and duration >= self.slow_threshold:
+            print(f"[API] Slow call {key} {duration:.2f}s (status {status}, {size} bytes)")
+
+    def record_error(self, method: str, endpoint: str, error: str):
+        """Thêm lỗi cho request đã ghi (vd. response không phải JSON)"""
+        key = self.route_key(method, endpoint)
+        with self._lock:
+            route = self._routes.get(key)
+            if route is not None:
+                route['errors'][error] += 1
+                route['last_error'] = time.time()
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Thống kê hiện tại: {endpoint: {calls, errors, error_rate, bytes, p50_ms, p95_ms, p99_ms, max_ms, ...}}"""
+        with self._lock:
+            routes = {key: (sorted(r['durations']), dict(r), dict(r['errors'])) for key, r in self._routes.items()}
+
+        stats = {}
+        for key, (durations, route, errors) in routes.items():
+            total_errors = sum(errors.values())
+            stats[key] = {
+                'calls': route['calls'],
+                'errors': total_errors,
+                'error_kinds': errors,
+                'error_rate': total_errors / route['calls'] if route['calls'] else 0.0,
+                'bytes': route['bytes'],
+                'last_status': route['last_status'],
+                'last_error': route['last_error'],
+                'p50_ms': self._percentile(durations, 50),
+                'p95_ms': self._percentile(durations, 95),
+                'p99_ms': self._percentile(durations, 99),
+                'max_ms': round(route['max'] * 1000, 1),
+            }
+        return stats
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self._since = time.time()
+
+    @property
+    def since(self) -> float:
+        """Thời điểm bắt đầu thống kê (epoch)"""
+        return self._since
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], percent: float) -> float:
+        """Percentile (nearest-rank) theo ms"""
+        if not sorted_values:
+            return 0.0
+        rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+        return round(sorted_values[rank - 1] * 1000, 1)
+
+
+class ResponseCache:
+    """
+    Cache TTL cho response API, thread-safe.
+
+    Các request giống nhau chạy cùng lúc chỉ gọi API một lần (single-flight):
+    thread đầu tiên gọi, các thread sau chờ và dùng chung kết quả.
+    Response lỗi không được cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[tuple, tuple] = {}  # key -> (hết hạn lúc, response)
+        self._inflight: Dict[tuple, dict] = {}  # key -> {'event', 'value'}
+        self._generations: Dict[str, int] = {}  # Tăng khi invalidate để bỏ kết quả đang tải dở
+
+    def get_or_fetch(self, namespace: str, key: tuple, ttl: float, fetch) -> Any:
+        """Trả response còn hạn trong cache, nếu không thì gọi fetch()"""
+        key = (namespace,) + key
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return copy.deepcopy(entry[1])
+            flight = self._inflight.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._inflight[key] = {'event': threading.Event(), 'value': None}
+                generation = self._generations.get(namespace, 0)
+
+        if not is_leader:
+            flight['event'].wait()
+            return copy.deepcopy(flight['value'])
+
+        value = None
+        try:
+            value = fetch()
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if not self._is_error(value) and self._generations.get(namespace, 0) == generation:
+                    self._entries[key] = (time.monotonic() + ttl, value)
+            flight['value'] = value
+            flight['event'].set()
+        return copy.deepcopy(value)
+
+    def lookup(self, namespace: str, key: tuple) -> Any:
+        """Bản copy của response còn hạn, None nếu không có (dùng cho client asyncio)"""
+        with self._lock:
+            entry = self._entries.get((namespace,) + key)
+            if entry and entry[0] > time.monotonic():
+                return copy.deepcopy(entry[1])
+        return None
+
+    def generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def store(self, namespace: str, key: tuple, ttl: float, value: Any, generation: int):
+        """Lưu response tải xong, bỏ qua nếu lỗi hoặc nhóm đã bị invalidate kể từ `generation`"""
+        with self._lock:
+            if not self._is_error(value) and self._generations.get(namespace, 0) == generation:
+                self._entries[(namespace,) + key] = (time.monotonic() + ttl, value)
+
+    def invalidate(self, *namespaces: str):
+        """Xóa cache của các nhóm (không truyền = xóa tất cả)"""
+        with self._lock:
+            targets = set(namespaces) or {key[0] for key in self._entries} | set(self._generations)
+            for namespace in targets:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            self._entries = {k: v for k, v in self._entries.items() if k[0] not in targets}
+
+    @staticmethod
+    def _is_error(value) -> bool:
+        return value is None or (isinstance(value, dict) and value.get('type') == 'error')
+
 
 class HidemiumAPI:
-    def __init__(self, base_url: str = HIDEMIUM_BASE_URL, token: str = HIDEMIUM_TOKEN):
+    def __init__(self, base_url: str = HIDEMIUM_BASE_URL, token: str = HIDEMIUM_TOKEN,
+                 pool_size: int = POOL_SIZE, max_retries: int = MAX_RETRIES,
+                 backoff: float = RETRY_BACKOFF):
         self.base_url = base_url
         self.token = token
         self.headers = {
             "Content-Type": "application/json",
             "Accept": "application/json, text/plain, */*"
         }
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._cache = ResponseCache()
+        self.metrics = ApiMetrics()
+        self.status_change_hooks: List[Callable[[], None]] = []  # Gọi sau open/close browser
+
+    @property
+    def session(self) -> requests.Session:
+        """Session keep-alive dùng chung (tạo lần đầu khi cần)"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> requests.Session:
+        """Session với connection pool và retry có backoff"""
+        def adapter(read_retries: int) -> HTTPAdapter:
+            retry = Retry(
+                total=self.max_retries,
+                connect=self.max_retries,
+                read=read_retries,  # urllib3 chỉ retry lỗi đọc với method idempotent (GET/PUT/DELETE)
+                status=0,
+                backoff_factor=self.backoff,
+                raise_on_status=False,
+            )
+            return HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+
+        session = requests.Session()
+        shared = adapter(self.max_retries)
+        session.mount("http://", shared)
+        session.mount("https://", shared)
+        # requests chọn adapter theo prefix URL dài nhất: open/close chỉ retry lỗi kết nối
+        control = adapter(0)
+        for endpoint in NO_READ_RETRY_ENDPOINTS:
+            session.mount(f"{self.base_url}{endpoint}", control)
+        return session
+
+    def close(self):
+        """Đóng các kết nối keep-alive"""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _timeout(self, endpoint: str) -> tuple:
+        """(connect, read) timeout cho endpoint"""
+        return CONNECT_TIMEOUT, ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
     
-    def _request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None) -> Dict:
-        """Thực hiện request đến API"""
-        url = f"{self.base_url}{endpoint}"
+    def _send(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """Gửi request qua session chung và ghi thời gian/status/bytes/lỗi vào self.metrics"""
+        start = time.perf_counter()
+        status, size, error = None, 0, None
         try:
-            response = requests.request(
+            response = self.session.request(
                 method=method,
-                url=url,
-                headers=self.headers,
-                params=params,
-                json=data,
-                timeout=30
+                url=f"{self.base_url}{endpoint}",
+                timeout=self._timeout(endpoint),
+                **kwargs
             )
+            status, size = response.status_code, len(response.content)
+            if status >= 400:
+                error = "http"
+            return response
+        except requests.exceptions.Timeout:
+            error = "timeout"
+            raise
+        except requests.exceptions.RequestException:
+            error = "connection"
+            raise
+        finally:
+            self.metrics.record(method, endpoint, time.perf_counter() - start, status, size, error)
+
+    def _parse_json(self, method: str, endpoint: str, response: requests.Response) -> Dict:
+        try:
             return response.json()
+        except ValueError:
+            self.metrics.record_error(method, endpoint, "parse")
+            raise
+
+    def _request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None) -> Dict:
+        """Thực hiện request đến API"""
+        try:
+            response = self._send(method, endpoint, headers=self.headers, params=params, json=data)
+            return self._parse_json(method, endpoint, response)
         except requests.exceptions.ConnectionError:
             return {"type": "error", "title": "Không thể kết nối đến Hidemium", "content": None}
         except Exception as e:
             return {"type": "error", "title": str(e), "content": None}
     
+    def _cached_request(self, namespace: str, method: str, endpoint: str, params: Dict = None) -> Dict:
+        """_request() qua cache TTL của nhóm `namespace` (xem CACHE_TTLS)"""
+        key = self._cache_key(method, endpoint, params)
+        return self._cache.get_or_fetch(
+            namespace, key, CACHE_TTLS[namespace],
+            lambda: self._request(method, endpoint, params=params)
+        )
+
+    @staticmethod
+    def _cache_key(method: str, endpoint: str, params: Dict = None) -> tuple:
+        return method, endpoint, tuple(sorted((params or {}).items()))
+
+    def invalidate_cache(self, *namespaces: str):
+        """Bỏ cache của các nhóm (vd. "folders"); không truyền = bỏ toàn bộ"""
+        self._cache.invalidate(*namespaces)
+
     def _get(self, endpoint: str, params: Dict = None) -> Dict:
         """GET request đơn giản (không cần auth)"""
-        url = f"{self.base_url}{endpoint}"
         try:
-            response = requests.get(url, params=params, timeout=30)
-            return response.json()
+            response = self._send("GET", endpoint, params=params)
+            return self._parse_json("GET", endpoint, response)
         except requests.exceptions.ConnectionError:
             return {"type": "error", "title": "Không thể kết nối đến Hidemium", "content": None}
         except Exception as e:
             return {"type": "error", "title": str(e), "content": None}
+
+    def get_stats(self) -> Dict[str, dict]:
+        """Thống kê latency/lỗi theo endpoint (xem ApiMetrics.snapshot)"""
+        return self.metrics.snapshot()
+
+    def reset_stats(self):
+        self.metrics.reset()
     
     # ============ CONNECTION CHECK ============
     
     def check_connection(self) -> bool:
         """Kiểm tra kết nối Hidemium"""
         try:
-            response = requests.get(f"{self.base_url}/v2/tag", timeout=5)
+            response = self._send("GET", "/v2/tag")
             return response.status_code == 200
         except requests.exceptions.RequestException:
             # Handle all request-related errors (connection, timeout, etc.)
@@ -58,10 +381,21 @@ class HidemiumAPI:
     
     # ============ PROFILE MANAGEMENT ============
     
-    def get_profiles(self, limit: int = 100, page: int = 1, is_local: bool = True,
-                     search: str = "", folder_id: List = None, status: str = "") -> List:
-        """Lấy danh sách profiles (POST method với body JSON)"""
-        body = {
+    def _fetch_profiles_page(self, page: int, limit: int, is_local: bool = True, search: str = "",
+                             folder_id: List = None, status: str = "") -> tuple:
+        """Lấy một trang profiles, trả về (profiles, total hoặc None, error dict hoặc None)"""
+        result = self._request(
+            "POST",
+            "/v1/browser/list",
+            params={"is_local": str(is_local).lower()},
+            data=self._profiles_body(page, limit, search, folder_id, status)
+        )
+        return self._parse_profiles_page(result)
+
+    @staticmethod
+    def _profiles_body(page: int, limit: int, search: str = "", folder_id: List = None, status: str = "") -> Dict:
+        """Body JSON cho /v1/browser/list"""
+        return {
             "orderName": 0,
             "orderLastOpen": 0,
             "page": page,
@@ -71,12 +405,17 @@ class HidemiumAPI:
             "date_range": ["", ""],
             "folder_id": folder_id or []
         }
-        result = self._request(
-            "POST",
-            "/v1/browser/list",
-            params={"is_local": str(is_local).lower()},
-            data=body
-        )
+
+    @classmethod
+    def _parse_profiles_page(cls, result: Dict) -> tuple:
+        """(profiles, total hoặc None, error dict hoặc None) từ response của /v1/browser/list"""
+        if isinstance(result, dict) and result.get('type') == 'error' and 'data' not in result:
+            return [], None, result
+        return cls._parse_profiles(result), cls._parse_total(result), None
+
+    @staticmethod
+    def _parse_profiles(result: Dict) -> List:
+        """Lấy list profiles từ response của /v1/browser/list"""
         # Parse response theo cấu trúc thực tế
         if result and 'data' in result:
             data = result['data']
@@ -97,6 +436,82 @@ class HidemiumAPI:
             elif isinstance(data, list):
                 return data
         return []
+
+    @staticmethod
+    def _parse_total(result: Dict) -> Optional[int]:
+        """Tổng số profiles nếu response có (meta.total / data.total / data.meta.total)"""
+        if not isinstance(result, dict):
+            return None
+        data = result.get('data') if isinstance(result.get('data'), dict) else {}
+        for holder in (result.get('meta'), data, data.get('meta')):
+            if isinstance(holder, dict):
+                try:
+                    return int(holder['total'])
+                except (KeyError, TypeError, ValueError):
+                    continue
+        return None
+
+    def get_profiles(self, limit: int = 100, page: int = 1, is_local: bool = True,
+                     search: str = "", folder_id: List = None, status: str = "") -> List:
+        """Lấy danh sách profiles (POST method với body JSON)"""
+        profiles, _, _ = self._fetch_profiles_page(page, limit, is_local, search, folder_id, status)
+        return profiles
+
+    def iter_profiles(self, page_size: int = 100, max_workers: int = PROFILE_FETCH_WORKERS,
+                      is_local: bool = True, search: str = "", folder_id: List = None,
+                      status: str = "") -> Iterator[List[Dict]]:
+        """
+        Lấy toàn bộ profiles, yield từng trang ngay khi tải xong.
+
+        Trang 1 được tải trước để biết tổng số, các trang còn lại tải song song
+        (tối đa max_workers) nên thứ tự các trang không cố định. Nếu API không
+        trả tổng số thì tải theo từng đợt max_workers trang tới khi gặp trang thiếu.
+
+        Raises:
+            ConnectionError: Không lấy được một trang (các trang đã yield vẫn hợp lệ,
+                nhưng danh sách chưa đủ)
+        """
+        def fetch(page):
+            profiles, _, error = self._fetch_profiles_page(page, page_size, is_local, search, folder_id, status)
+            if error:
+                # Không coi trang lỗi là trang cuối, nếu không kết quả bị cắt cụt mà không báo
+                raise ConnectionError(f"Trang {page}: {error.get('title') or 'Không thể kết nối đến Hidemium'}")
+            return profiles
+
+        first, total, error = self._fetch_profiles_page(1, page_size, is_local, search, folder_id, status)
+        if error:
+            raise ConnectionError(error.get('title') or "Không thể kết nối đến Hidemium")
+        if first:
+            yield first
+        if len(first) < page_size:
+            return
+
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="profiles")
+        try:
+            if total is not None:
+                futures = [pool.submit(fetch, page) for page in range(2, math.ceil(total / page_size) + 1)]
+                for future in as_completed(futures):
+                    profiles = future.result()
+                    if profiles:
+                        yield profiles
+                return
+
+            next_page = 2
+            while True:
+                futures = [pool.submit(fetch, page) for page in range(next_page, next_page + max_workers)]
+                last_page_reached = False
+                for future in as_completed(futures):
+                    profiles = future.result()
+                    if profiles:
+                        yield profiles
+                    if len(profiles) < page_size:
+                        last_page_reached = True
+                if last_page_reached:
+                    return
+                next_page += max_workers
+        finally:
+            # Người dùng dừng vòng lặp sớm: bỏ các trang chưa bắt đầu tải
+            pool.shutdown(wait=False, cancel_futures=True)
     
     def get_profile_detail(self, uuid: str, is_local: bool = False) -> Dict:
         """Lấy chi tiết profile"""
@@ -108,24 +523,33 @@ class HidemiumAPI:
     
     def create_profile_default(self, default_config_id: int, is_local: bool = True) -> Dict:
         """Tạo profile từ config mặc định"""
-        return self._request(
+        result = self._request(
             "POST",
             "/create-profile-by-default",
             params={"is_local": str(is_local).lower()},
             data={"defaultConfigId": default_config_id}
         )
+        self.invalidate_cache("folders", "tags")
+        return result
     
     def create_profile_custom(self, config: Dict, is_local: bool = True) -> Dict:
         """Tạo profile tùy chỉnh - POST /create-profile-custom"""
-        return self._request(
+        result = self._request(
             "POST",
             "/create-profile-custom",
             params={"is_local": str(is_local).lower()},
             data=config
         )
+        self.invalidate_cache("folders", "tags")
+        return result
     
     def create_profile(self, profile_data: Dict) -> Dict:
         """Tạo profile mới với đầy đủ options"""
+        return self.create_profile_custom(self._build_profile_config(profile_data), is_local=True)
+
+    @staticmethod
+    def _build_profile_config(profile_data: Dict) -> Dict:
+        """Config cho /create-profile-custom từ dữ liệu form tạo profile"""
         os_type = profile_data.get("os", "win")
         
         # Build config theo format API yêu cầu
@@ -175,16 +599,18 @@ class HidemiumAPI:
         if profile_data.get("proxy"):
             config["proxy"] = profile_data["proxy"]
         
-        return self.create_profile_custom(config, is_local=True)
+        return config
     
     def delete_profiles(self, uuids: List[str], is_local: bool = True) -> Dict:
         """Xóa profiles"""
-        return self._request(
+        result = self._request(
             "DELETE",
             "/v1/browser/destroy",
             params={"is_local": str(is_local).lower()},
             data={"uuid_browser": uuids}
         )
+        self.invalidate_cache("folders", "tags")
+        return result
     
     def update_profile_name(self, uuid: str, name: str) -> Dict:
         """Cập nhật tên profile"""
@@ -209,6 +635,18 @@ class HidemiumAPI:
         """
         Mở browser/profile - GET /openProfile
         """
+        result = self._get("/openProfile", params=self._open_params(uuid, command, proxy))
+        self._status_changed()
+
+        # Auto resize window position if successful
+        if auto_resize and result.get('status') == 'successfully':
+            self._auto_resize_browser_window(result)
+
+        return result
+
+    @staticmethod
+    def _open_params(uuid: str, command: str = "", proxy: str = "") -> Dict:
+        """Query params cho /openProfile"""
         params = {"uuid": uuid}
 
         # Thêm --force-device-scale-factor để scale browser
@@ -224,15 +662,10 @@ class HidemiumAPI:
 
         if proxy:
             params["proxy"] = proxy
-        result = self._get("/openProfile", params=params)
+        return params
 
-        # Auto resize window position if successful
-        if auto_resize and result.get('status') == 'successfully':
-            self._auto_resize_browser_window(result)
-
-        return result
-
-    def _auto_resize_browser_window(self, open_result: Dict):
+    @staticmethod
+    def _auto_resize_browser_window(open_result: Dict):
         """
         Tự động sắp xếp vị trí cửa sổ browser theo grid
         (Scale được xử lý qua --force-device-scale-factor khi mở browser)
@@ -320,7 +753,15 @@ class HidemiumAPI:
     
     def close_browser(self, uuid: str) -> Dict:
         """Đóng browser/profile - GET /closeProfile"""
-        return self._get("/closeProfile", params={"uuid": uuid})
+        result = self._get("/closeProfile", params={"uuid": uuid})
+        self._status_changed()
+        return result
+
+    def _status_changed(self):
+        """Trạng thái running vừa đổi: bỏ cache và báo cho poller kiểm tra sớm"""
+        self.invalidate_cache("status_list")
+        for hook in self.status_change_hooks:
+            hook()
     
     def check_profile(self, uuid: str) -> Dict:
         """Kiểm tra trạng thái profile - GET /authorize"""
@@ -356,13 +797,18 @@ class HidemiumAPI:
     # ============ FOLDER MANAGEMENT ============
     
     def get_folders(self, limit: int = 100, page: int = 1, is_local: bool = True) -> List:
-        """Lấy danh sách folders"""
-        result = self._request(
+        """Lấy danh sách folders (cache CACHE_TTLS["folders"])"""
+        result = self._cached_request(
+            "folders",
             "GET",
             "/v1/folder/list",
             params={"limit": limit, "page": page, "is_local": str(is_local).lower()}
         )
-        # Parse response
+        return self._parse_folders(result)
+
+    @staticmethod
+    def _parse_folders(result: Dict) -> List:
+        """Lấy list folders từ response của /v1/folder/list"""
         if result and 'data' in result:
             data = result['data']
             if isinstance(data, dict) and 'content' in data:
@@ -377,56 +823,73 @@ class HidemiumAPI:
     
     def add_profiles_to_folder(self, folder_uuid: str, profile_uuids: List[str], is_local: bool = True) -> Dict:
         """Thêm profiles vào folder"""
-        return self._request(
+        result = self._request(
             "POST",
             f"/v1/folder/{folder_uuid}/add-browser",
             params={"is_local": str(is_local).lower()},
             data={"uuid_browser": profile_uuids}
         )
+        self.invalidate_cache("folders")
+        return result
     
     # ============ TAGS ============
     
     def get_tags(self) -> Dict:
-        """Lấy danh sách tags"""
-        return self._request("GET", "/v2/tag")
+        """Lấy danh sách tags (cache CACHE_TTLS["tags"])"""
+        return self._cached_request("tags", "GET", "/v2/tag")
     
     def sync_tags(self, uuid: str, tags: List[str]) -> Dict:
         """Đồng bộ tags cho profile"""
-        return self._request(
+        result = self._request(
             "POST",
             "/v1/browser/tags/sync",
             data={"uuid": uuid, "tags": tags}
         )
+        self.invalidate_cache("tags")
+        return result
     
     # ============ STATUS ============
     
     def get_status_list(self, is_local: bool = True) -> Dict:
-        """Lấy danh sách status có thể có"""
-        return self._request(
-            "GET", 
+        """Lấy danh sách status có thể có (cache CACHE_TTLS["status_list"])"""
+        return self._cached_request(
+            "status_list",
+            "GET",
             "/v2/status-profile",
             params={"is_local": str(is_local).lower()}
         )
     
     def get_running_profiles(self, is_local: bool = True) -> List[str]:
         """Lấy danh sách UUIDs của profiles đang thực sự running"""
+        return self.fetch_running_profiles(is_local) or []
+
+    def fetch_running_profiles(self, is_local: bool = True) -> Optional[List[str]]:
+        """Như get_running_profiles() nhưng trả None khi lỗi (phân biệt với "không có profile nào chạy")"""
         result = self._request(
             "GET", 
             "/v2/status-profile",
             params={"is_local": str(is_local).lower()}
         )
+        return self._parse_running(result)
+
+    @staticmethod
+    def _parse_running(result: Dict) -> Optional[List[str]]:
+        """UUIDs đang chạy từ response của /v2/status-profile, None nếu lỗi"""
         # Response: {"content": [{"uuid": "...", ...}, ...]} hoặc {"content": []}
         if result and 'content' in result:
             content = result['content']
             if isinstance(content, list):
                 return [p.get('uuid') for p in content if p.get('uuid')]
+        if isinstance(result, dict) and result.get('type') == 'error':
+            return None
         return []
     
     # ============ DEFAULT CONFIG ============
     
     def get_default_configs(self, page: int = 1, limit: int = 10) -> Dict:
-        """Lấy danh sách config mặc định"""
-        return self._request(
+        """Lấy danh sách config mặc định (cache CACHE_TTLS["default_configs"])"""
+        return self._cached_request(
+            "default_configs",
             "GET",
             "/v2/default-config",
             params={"page": page, "limit": limit}
@@ -435,12 +898,17 @@ class HidemiumAPI:
     # ============ AUTOMATION / SCRIPTS ============
     
     def get_scripts(self, page: int = 1, limit: int = 50) -> List:
-        """Lấy danh sách scripts/flows từ Hidemium"""
-        result = self._request(
+        """Lấy danh sách scripts/flows từ Hidemium (cache CACHE_TTLS["scripts"])"""
+        result = self._cached_request(
+            "scripts",
             "GET",
             "/v2/automation/script",
             params={"page": page, "limit": limit}
         )
+        return self._parse_scripts(result)
+
+    @staticmethod
+    def _parse_scripts(result: Dict) -> List:
         if result and 'data' in result:
             data = result['data']
             if isinstance(data, dict) and 'content' in data:
@@ -495,5 +963,130 @@ class HidemiumAPI:
         )
 
 
+class RunningStatusPoller:
+    """
+    Một thread duy nhất theo dõi profiles đang chạy (/v2/status-profile).
+
+    Mỗi lần poll so với lần trước và chỉ báo phần thay đổi cho subscribers:
+    callback(added, removed, running) - added/removed là set UUID, running là
+    toàn bộ snapshot hiện tại. Callback chạy trên thread của poller.
+
+    Chu kỳ tự điều chỉnh: poll nhanh sau khi có thay đổi (hoặc open/close
+    browser), giãn dần khi trạng thái đứng yên và khi API lỗi.
+    """
+
+    def __init__(self, api_client: "HidemiumAPI", interval: float = 5.0, fast_interval: float = 1.5,
+                 idle_interval: float = 15.0, max_interval: float = 30.0, is_local: bool = True):
+        self.api = api_client
+        self.interval = interval
+        self.fast_interval = fast_interval
+        self.idle_interval = idle_interval  # Trần chu kỳ khi trạng thái đứng yên
+        self.max_interval = max_interval  # Trần chu kỳ khi API lỗi liên tục
+        self.is_local = is_local
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Callable] = {}
+        self._next_token = 0
+        self._running: Optional[Set[str]] = None  # None = chưa poll lần nào
+        self._wake = threading.Event()
+        self._thread = None
+        self._delay = interval
+        self._fast_polls = 0
+        api_client.status_change_hooks.append(self.poke)
+
+    def subscribe(self, callback: Callable[[Set[str], Set[str], Set[str]], None]) -> int:
+        """
+        Đăng ký nhận thay đổi, trả về token để hủy.
+
+        Nếu đã có snapshot, callback được gọi ngay với added = toàn bộ profiles đang chạy.
+        """
+        with self._lock:
+            self._next_token += 1
+            token = self._next_token
+            self._subscribers[token] = callback
+            snapshot = None if self._running is None else set(self._running)
+            self._ensure_thread()
+        if snapshot is not None:
+            callback(set(snapshot), set(), snapshot)
+        return token
+
+    def unsubscribe(self, token: int):
+        """Hủy đăng ký"""
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def running_uuids(self) -> Optional[Set[str]]:
+        """Snapshot profiles đang chạy (None nếu chưa poll được lần nào)"""
+        with self._lock:
+            return None if self._running is None else set(self._running)
+
+    def is_running(self, uuid: str) -> bool:
+        with self._lock:
+            return bool(self._running) and uuid in self._running
+
+    def poke(self):
+        """Poll sớm và giữ chu kỳ nhanh vài lần (vd. ngay sau khi mở/đóng browser)"""
+        with self._lock:
+            self._fast_polls = 3
+        self._wake.set()
+
+    def refresh(self) -> Optional[Set[str]]:
+        """Poll ngay trên thread gọi (subscribers vẫn nhận diff), trả về snapshot hoặc None nếu lỗi"""
+        if not self._poll_once():
+            return None
+        return self.running_uuids()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="status-poller", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+            self._poll_once()
+            self._wake.wait(self._delay)
+            self._wake.clear()
+
+    def _poll_once(self) -> bool:
+        """Poll một lần, publish diff và tính chu kỳ tiếp theo (False nếu API lỗi)"""
+        try:
+            uuids = self.api.fetch_running_profiles(self.is_local)
+        except Exception:
+            uuids = None
+
+        with self._lock:
+            if uuids is None:
+                # Lỗi: giữ snapshot cũ, giãn chu kỳ
+                self._delay = min(max(self._delay, self.interval) * 2, self.max_interval)
+                return False
+
+            current = set(uuids)
+            previous = self._running if self._running is not None else set()
+            added, removed = current - previous, previous - current
+            first_poll = self._running is None
+            self._running = current
+
+            if added or removed or self._fast_polls:
+                self._fast_polls = max(self._fast_polls - 1, 0)
+                self._delay = self.fast_interval
+            elif self._delay < self.interval:
+                self._delay = self.interval
+            else:
+                self._delay = min(self._delay * 1.5, self.idle_interval)
+            subscribers = list(self._subscribers.values())
+
+        if added or removed or first_poll:
+            for callback in subscribers:
+                try:
+                    callback(set(added), set(removed), set(current))
+                except Exception as e:
+                    print(f"[API] Status subscriber error: {e}")
+        return True
+
+
 # Singleton instance
 api = HidemiumAPI()
+status_poller = RunningStatusPoller(api)
@@ -0,0 +1,551 @@
+"""
+Hidemium API Service (asyncio)
+Bản asyncio của HidemiumAPI cho thao tác hàng loạt (mở/đóng hàng trăm browser,
+sync tags...) mà không cần một thread cho mỗi profile.
+
+Trong coroutine:
+    async with AsyncHidemiumAPI() as client:
+        results = await client.open_many(uuids)   # {uuid: response}
+
+Từ UI thread (Tkinter), chạy trên event loop nền dùng chung:
+    future = submit(async_api.close_many(uuids))  # concurrent.futures.Future
+    future.add_done_callback(lambda f: ...)
+"""
+import asyncio
+import copy
+import json
+import math
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional, Dict, List, Any, AsyncIterator, Awaitable, Callable, Iterable
+
+import aiohttp
+
+from config import HIDEMIUM_BASE_URL, HIDEMIUM_TOKEN
+from api_service import (
+    api, HidemiumAPI, ApiMetrics, ResponseCache, CACHE_TTLS, CONNECT_TIMEOUT, DEFAULT_TIMEOUT,
+    ENDPOINT_TIMEOUTS, MAX_RETRIES, NO_READ_RETRY_ENDPOINTS, POOL_SIZE, PROFILE_FETCH_WORKERS, RETRY_BACKOFF
+)
+
+# Số request tới Hidemium chạy cùng lúc tối đa (mỗi client)
+ASYNC_CONCURRENCY = 16
+
+# Method an toàn để gửi lại khi kết nối keep-alive bị server đóng giữa chừng
+_IDEMPOTENT_METHODS = {"GET", "PUT", "DELETE", "HEAD", "OPTIONS"}
+
+
+def _error(title: str) -> Dict:
+    return {"type": "error", "title": title, "content": None}
+
+
+class AsyncHidemiumAPI:
+    """
+    Client asyncio với cùng các method như HidemiumAPI (dạng coroutine).
+
+    Số request chạy đồng thời bị giới hạn bởi semaphore `concurrency`; các hàm
+    *_many chạy song song trên nhiều profile và trả kết quả theo từng UUID.
+    Session aiohttp gắn với event loop tạo ra nó: dùng một loop cố định (vd. submit())
+    hoặc `async with` cho mỗi lần asyncio.run().
+    """
+
+    def __init__(self, base_url: str = HIDEMIUM_BASE_URL, token: str = HIDEMIUM_TOKEN,
+                 concurrency: int = ASYNC_CONCURRENCY, pool_size: int = POOL_SIZE,
+                 max_retries: int = MAX_RETRIES, backoff: float = RETRY_BACKOFF,
+                 metrics: ApiMetrics = None, cache: ResponseCache = None,
+                 status_change_hooks: List[Callable[[], None]] = None):
+        self.base_url = base_url
+        self.token = token
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json, text/plain, */*"
+        }
+        self.concurrency = concurrency
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.metrics = metrics if metrics is not None else ApiMetrics()
+        self._cache = cache if cache is not None else ResponseCache()
+        self.status_change_hooks = status_change_hooks if status_change_hooks is not None else []
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
+    @classmethod
+    def from_client(cls, client: HidemiumAPI, **kwargs) -> "AsyncHidemiumAPI":
+        """Client asyncio dùng chung cấu hình, metrics, cache và status hooks với `client`"""
+        return cls(base_url=client.base_url, token=client.token, pool_size=client.pool_size,
+                   max_retries=client.max_retries, backoff=client.backoff, metrics=client.metrics,
+                   cache=client._cache, status_change_hooks=client.status_change_hooks, **kwargs)
+
+    async def __aenter__(self) -> "AsyncHidemiumAPI":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Session/semaphore của event loop đang chạy (tạo lại nếu loop đổi)"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            self._session = aiohttp.ClientSession(connector=connector)
+            if hasattr(self._session, "_retry_connection"):
+                # aiohttp >= 3.10 tự gửi lại GET một lần khi server ngắt kết nối, kể cả /openProfile:
+                # tắt đi để _retryable() là chỗ duy nhất quyết định retry
+                self._session._retry_connection = False
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+            self._inflight = {}
+        return self._session
+
+    async def close(self):
+        """Đóng các kết nối keep-alive"""
+        if self._session is not None and not self._session.closed and self._loop is asyncio.get_running_loop():
+            await self._session.close()
+        self._session = None
+
+    def _timeout(self, endpoint: str) -> aiohttp.ClientTimeout:
+        return aiohttp.ClientTimeout(
+            total=None,
+            sock_connect=CONNECT_TIMEOUT,
+            sock_read=ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+        )
+
+    def _retryable(self, method: str, endpoint: str, error: Exception) -> bool:
+        """
+        Giống Retry của HidemiumAPI: lỗi kết nối luôn retry, server đóng kết nối chỉ retry
+        method idempotent và không retry open/close (NO_READ_RETRY_ENDPOINTS)
+        """
+        if isinstance(error, aiohttp.ClientConnectorError):
+            return True
+        return (isinstance(error, aiohttp.ServerDisconnectedError) and method.upper() in _IDEMPOTENT_METHODS
+                and endpoint not in NO_READ_RETRY_ENDPOINTS)
+
+    async def _send(self, method: str, endpoint: str, **kwargs) -> Any:
+        """Gửi request (có retry/backoff), ghi metrics, trả JSON đã parse"""
+        session = self._ensure_session()
+        async with self._semaphore:
+            start = time.perf_counter()
+            status, size, error = None, 0, None
+            attempt = 0
+            try:
+                while True:
+                    try:
+                        async with session.request(method, f"{self.base_url}{endpoint}",
+                                                   timeout=self._timeout(endpoint), **kwargs) as response:
+                            body = await response.read()
+                            status, size = response.status, len(body)
+                            break
+                    except aiohttp.ClientError as e:
+                        if attempt >= self.max_retries or not self._retryable(method, endpoint, e):
+                            raise
+                        await asyncio.sleep(self.backoff * (2 ** attempt))
+                        attempt += 1
+                if status >= 400:
+                    error = "http"
+            except asyncio.TimeoutError:
+                error = "timeout"
+                raise
+            except aiohttp.ClientError:
+                error = "connection"
+                raise
+            finally:
+                self.metrics.record(method, endpoint, time.perf_counter() - start, status, size, error)
+
+        try:
+            return json.loads(body)
+        except ValueError:
+            self.metrics.record_error(method, endpoint, "parse")
+            raise
+
+    async def _request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None) -> Dict:
+        """Thực hiện request đến API"""
+        try:
+            return await self._send(method, endpoint, headers=self.headers, params=params, json=data)
+        except asyncio.TimeoutError:
+            return _error(f"Timeout: {method} {endpoint}")
+        except aiohttp.ClientConnectionError:
+            return _error("Không thể kết nối đến Hidemium")
+        except Exception as e:
+            return _error(str(e))
+
+    async def _get(self, endpoint: str, params: Dict = None) -> Dict:
+        """GET request đơn giản (không cần auth)"""
+        try:
+            return await self._send("GET", endpoint, params=params)
+        except asyncio.TimeoutError:
+            return _error(f"Timeout: GET {endpoint}")
+        except aiohttp.ClientConnectionError:
+            return _error("Không thể kết nối đến Hidemium")
+        except Exception as e:
+            return _error(str(e))
+
+    async def _cached_request(self, namespace: str, method: str, endpoint: str, params: Dict = None) -> Dict:
+        """_request() qua cache TTL (dùng chung cache với HidemiumAPI nếu tạo bằng from_client)"""
+        key = HidemiumAPI._cache_key(method, endpoint, params)
+        cached = self._cache.lookup(namespace, key)
+        if cached is not None:
+            return cached
+
+        self._ensure_session()
+        flight = self._inflight.get((namespace,) + key)
+        if flight is not None:
+            return copy.deepcopy(await asyncio.shield(flight))
+
+        flight = self._inflight[(namespace,) + key] = asyncio.get_running_loop().create_future()
+        generation = self._cache.generation(namespace)
+        value = None
+        try:
+            value = await self._request(method, endpoint, params=params)
+            self._cache.store(namespace, key, CACHE_TTLS[namespace], value, generation)
+        finally:
+            self._inflight.pop((namespace,) + key, None)
+            flight.set_result(value)
+        return copy.deepcopy(value)  # Bản trong cache/flight phải giữ nguyên cho lần gọi sau
+
+    def invalidate_cache(self, *namespaces: str):
+        self._cache.invalidate(*namespaces)
+
+    def get_stats(self) -> Dict[str, dict]:
+        return self.metrics.snapshot()
+
+    def reset_stats(self):
+        self.metrics.reset()
+
+    # ============ BULK ============
+
+    async def map_many(self, func: Callable[..., Awaitable[Dict]], uuids: Iterable[str],
+                       *args, **kwargs) -> Dict[str, Dict]:
+        """
+        Gọi func(uuid, *args, **kwargs) cho mọi UUID cùng lúc (giới hạn bởi semaphore).
+
+        Returns:
+            {uuid: response}; exception của từng UUID được đổi thành error dict
+        """
+        uuids = list(dict.fromkeys(uuids))
+        results = await asyncio.gather(*(func(uuid, *args, **kwargs) for uuid in uuids), return_exceptions=True)
+        return {
+            uuid: _error(str(result) or type(result).__name__) if isinstance(result, BaseException) else result
+            for uuid, result in zip(uuids, results)
+        }
+
+    async def open_many(self, uuids: Iterable[str], command: str = "", proxy: str = "",
+                        auto_resize: bool = True) -> Dict[str, Dict]:
+        """Mở nhiều browser cùng lúc, trả {uuid: response của /openProfile}"""
+        return await self.map_many(self.open_browser, uuids, command=command, proxy=proxy,
+                                   auto_resize=auto_resize)
+
+    async def close_many(self, uuids: Iterable[str]) -> Dict[str, Dict]:
+        """Đóng nhiều browser cùng lúc, trả {uuid: response của /closeProfile}"""
+        return await self.map_many(self.close_browser, uuids)
+
+    async def check_many(self, uuids: Iterable[str]) -> Dict[str, Dict]:
+        """Kiểm tra nhiều profile cùng lúc, trả {uuid: response của /authorize}"""
+        return await self.map_many(self.check_profile, uuids)
+
+    async def sync_tags_many(self, tags_by_uuid: Dict[str, List[str]]) -> Dict[str, Dict]:
+        """Đồng bộ tags cho nhiều profile, trả {uuid: response}"""
+        async def sync(uuid):
+            return await self.sync_tags(uuid, tags_by_uuid[uuid])
+        return await self.map_many(sync, tags_by_uuid)
+
+    # ============ CONNECTION CHECK ============
+
+    async def check_connection(self) -> bool:
+        """Kiểm tra kết nối Hidemium"""
+        try:
+            await self._send("GET", "/v2/tag")
+            return True
+        except Exception:
+            return False
+
+    # ============ PROFILE MANAGEMENT ============
+
+    async def _fetch_profiles_page(self, page: int, limit: int, is_local: bool = True, search: str = "",
+                                   folder_id: List = None, status: str = "") -> tuple:
+        result = await self._request(
+            "POST",
+            "/v1/browser/list",
+            params={"is_local": str(is_local).lower()},
+            data=HidemiumAPI._profiles_body(page, limit, search, folder_id, status)
+        )
+        return HidemiumAPI._parse_profiles_page(result)
+
+    async def get_profiles(self, limit: int = 100, page: int = 1, is_local: bool = True,
+                           search: str = "", folder_id: List = None, status: str = "") -> List:
+        profiles, _, _ = await self._fetch_profiles_page(page, limit, is_local, search, folder_id, status)
+        return profiles
+
+    async def iter_profiles(self, page_size: int = 100, max_workers: int = PROFILE_FETCH_WORKERS,
+                            is_local: bool = True, search: str = "", folder_id: List = None,
+                            status: str = "") -> AsyncIterator[List[Dict]]:
+        """
+        Như HidemiumAPI.iter_profiles(): yield từng trang ngay khi tải xong.
+
+        Raises:
+            ConnectionError: Không lấy được một trang (các trang đã yield vẫn hợp lệ,
+                nhưng danh sách chưa đủ)
+        """
+        async def fetch(page):
+            profiles, _, error = await self._fetch_profiles_page(page, page_size, is_local, search, folder_id, status)
+            if error:
+                raise ConnectionError(f"Trang {page}: {error.get('title') or 'Không thể kết nối đến Hidemium'}")
+            return profiles
+
+        first, total, error = await self._fetch_profiles_page(1, page_size, is_local, search, folder_id, status)
+        if error:
+            raise ConnectionError(error.get('title') or "Không thể kết nối đến Hidemium")
+        if first:
+            yield first
+        if len(first) < page_size:
+            return
+
+        tasks = []
+        try:
+            if total is not None:
+                tasks = [asyncio.ensure_future(fetch(page)) for page in range(2, math.ceil(total / page_size) + 1)]
+                for next_done in asyncio.as_completed(tasks):
+                    profiles = await next_done
+                    if profiles:
+                        yield profiles
+                return
+
+            next_page = 2
+            while True:
+                tasks = [asyncio.ensure_future(fetch(page)) for page in range(next_page, next_page + max_workers)]
+                last_page_reached = False
+                for next_done in asyncio.as_completed(tasks):
+                    profiles = await next_done
+                    if profiles:
+                        yield profiles
+                    if len(profiles) < page_size:
+                        last_page_reached = True
+                if last_page_reached:
+                    return
+                next_page += max_workers
+        finally:
+            # Người dùng dừng vòng lặp sớm: hủy các trang chưa tải xong
+            for task in tasks:
+                task.cancel()
+
+    async def get_profile_detail(self, uuid: str, is_local: bool = False) -> Dict:
+        return await self._request("GET", f"/v1/browser/{uuid}", params={"is_local": str(is_local).lower()})
+
+    async def create_profile_default(self, default_config_id: int, is_local: bool = True) -> Dict:
+        result = await self._request(
+            "POST",
+            "/create-profile-by-default",
+            params={"is_local": str(is_local).lower()},
+            data={"defaultConfigId": default_config_id}
+        )
+        self.invalidate_cache("folders", "tags")
+        return result
+
+    async def create_profile_custom(self, config: Dict, is_local: bool = True) -> Dict:
+        result = await self._request(
+            "POST",
+            "/create-profile-custom",
+            params={"is_local": str(is_local).lower()},
+            data=config
+        )
+        self.invalidate_cache("folders", "tags")
+        return result
+
+    async def create_profile(self, profile_data: Dict) -> Dict:
+        return await self.create_profile_custom(HidemiumAPI._build_profile_config(profile_data), is_local=True)
+
+    async def delete_profiles(self, uuids: List[str], is_local: bool = True) -> Dict:
+        result = await self._request(
+            "DELETE",
+            "/v1/browser/destroy",
+            params={"is_local": str(is_local).lower()},
+            data={"uuid_browser": uuids}
+        )
+        self.invalidate_cache("folders", "tags")
+        return result
+
+    async def update_profile_name(self, uuid: str, name: str) -> Dict:
+        return await self._request("PUT", "/v1/browser/name/update", data={"uuid": uuid, "name": name})
+
+    async def update_profile_note(self, uuid: str, note: str) -> Dict:
+        return await self._request("PUT", "/v1/browser/note/update", data={"uuid": uuid, "note": note})
+
+    # ============ BROWSER CONTROL ============
+
+    async def open_browser(self, uuid: str, command: str = "", proxy: str = "",
+                           auto_resize: bool = True) -> Dict:
+        result = await self._get("/openProfile", params=HidemiumAPI._open_params(uuid, command, proxy))
+        self._status_changed()
+
+        # Sắp xếp cửa sổ dùng CDP đồng bộ (websocket-client) -> chạy trong thread pool của loop
+        if auto_resize and result.get('status') == 'successfully':
+            await asyncio.to_thread(HidemiumAPI._auto_resize_browser_window, result)
+        return result
+
+    async def close_browser(self, uuid: str) -> Dict:
+        result = await self._get("/closeProfile", params={"uuid": uuid})
+        self._status_changed()
+        return result
+
+    def _status_changed(self):
+        self.invalidate_cache("status_list")
+        for hook in self.status_change_hooks:
+            hook()
+
+    async def check_profile(self, uuid: str) -> Dict:
+        return await self._get("/authorize", params={"uuid": uuid})
+
+    # ============ PROXY MANAGEMENT ============
+
+    async def update_proxy(self, browser_uuid: str, proxy_type: str, ip: str, port: str,
+                           user: str = "", password: str = "", is_local: bool = True) -> Dict:
+        return await self._request(
+            "PUT",
+            "/v2/proxy/quick-edit",
+            params={"is_local": str(is_local).lower()},
+            data={
+                "browser_uuid": browser_uuid,
+                "type": proxy_type,
+                "ip": ip,
+                "port": port,
+                "user": user,
+                "pass": password
+            }
+        )
+
+    async def remove_proxy(self, uuid: str) -> Dict:
+        return await self._request("PUT", "/v1/browser/proxy/remove", data={"uuid": uuid})
+
+    # ============ FOLDER MANAGEMENT ============
+
+    async def get_folders(self, limit: int = 100, page: int = 1, is_local: bool = True) -> List:
+        result = await self._cached_request(
+            "folders",
+            "GET",
+            "/v1/folder/list",
+            params={"limit": limit, "page": page, "is_local": str(is_local).lower()}
+        )
+        return HidemiumAPI._parse_folders(result)
+
+    async def add_profiles_to_folder(self, folder_uuid: str, profile_uuids: List[str],
+                                     is_local: bool = True) -> Dict:
+        result = await self._request(
+            "POST",
+            f"/v1/folder/{folder_uuid}/add-browser",
+            params={"is_local": str(is_local).lower()},
+            data={"uuid_browser": profile_uuids}
+        )
+        self.invalidate_cache("folders")
+        return result
+
+    # ============ TAGS ============
+
+    async def get_tags(self) -> Dict:
+        return await self._cached_request("tags", "GET", "/v2/tag")
+
+    async def sync_tags(self, uuid: str, tags: List[str]) -> Dict:
+        result = await self._request("POST", "/v1/browser/tags/sync", data={"uuid": uuid, "tags": tags})
+        self.invalidate_cache("tags")
+        return result
+
+    # ============ STATUS ============
+
+    async def get_status_list(self, is_local: bool = True) -> Dict:
+        return await self._cached_request(
+            "status_list",
+            "GET",
+            "/v2/status-profile",
+            params={"is_local": str(is_local).lower()}
+        )
+
+    async def get_running_profiles(self, is_local: bool = True) -> List[str]:
+        return await self.fetch_running_profiles(is_local) or []
+
+    async def fetch_running_profiles(self, is_local: bool = True) -> Optional[List[str]]:
+        result = await self._request("GET", "/v2/status-profile", params={"is_local": str(is_local).lower()})
+        return HidemiumAPI._parse_running(result)
+
+    # ============ DEFAULT CONFIG ============
+
+    async def get_default_configs(self, page: int = 1, limit: int = 10) -> Dict:
+        return await self._cached_request(
+            "default_configs",
+            "GET",
+            "/v2/default-config",
+            params={"page": page, "limit": limit}
+        )
+
+    # ============ AUTOMATION / SCRIPTS ============
+
+    async def get_scripts(self, page: int = 1, limit: int = 50) -> List:
+        result = await self._cached_request(
+            "scripts",
+            "GET",
+            "/v2/automation/script",
+            params={"page": page, "limit": limit}
+        )
+        return HidemiumAPI._parse_scripts(result)
+
+    async def get_campaigns(self, search: str = "", page: int = 1, limit: int = 10) -> Dict:
+        return await self._request(
+            "GET",
+            "/automation/campaign",
+            params={"search": search, "page": page, "limit": limit}
+        )
+
+    async def create_campaign(self, name: str, input_vars: Dict = None) -> Dict:
+        return await self._request(
+            "POST",
+            "/automation/campaign",
+            data={"name": name, "input_vars": input_vars or {}}
+        )
+
+    async def update_campaign_variables(self, campaign_id: int, variables: List[Dict]) -> Dict:
+        return await self._request(
+            "POST",
+            "/automation/campaign/update-variables",
+            data={"campaign_id": campaign_id, "variables": variables}
+        )
+
+    async def delete_all_campaign_profiles(self, campaign_id: str) -> Dict:
+        return await self._request(
+            "DELETE",
+            "/automation/campaign/delete-all-campaign-profile",
+            data={"campaignId": campaign_id}
+        )
+
+    async def run_script(self, script_key: int, profile_uuid: str, variables: Dict = None) -> Dict:
+        return await self._request(
+            "POST",
+            "/automation/run",
+            data={"script_key": script_key, "uuid": profile_uuid, "variables": variables or {}}
+        )
+
+
+class _LoopThread:
+    """Một event loop asyncio chạy trong thread nền, dùng chung cho cả app"""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def submit(self, coro: Awaitable) -> Future:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="hidemium-async", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+
+_loop_thread = _LoopThread()
+
+
+def submit(coro: Awaitable) -> Future:
+    """Chạy coroutine trên event loop nền, trả concurrent.futures.Future (gọi được từ mọi thread)"""
+    return _loop_thread.submit(coro)
+
+
+# Global instance - dùng chung metrics/cache/status hooks với `api`
+async_api = AsyncHidemiumAPI.from_client(api)
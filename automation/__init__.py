@@ -5,31 +5,67 @@ Human-like behavior built-in
 
 CDP MAX: Production-grade CDP implementation with 12 MAX features
 """
-from .engine import AutomationEngine, JobState, StateResult, FailureType
-from .cdp_client import CDPClient, Condition, ConditionType, WaitResult, ActionResult
-from .artifacts import ArtifactCollector, JobArtifact
-from .jobs import Job, JobContext, JobResult
-from .human_behavior import HumanBehavior, AntiDetection, WaitStrategy
+import importlib
 
-# CDP MAX - Production-grade CDP
-from .cdp_max import (
-    CDPClientMAX, CDPClientConfig,
-    CDPSession, SessionState, SessionConfig,
-    Locator, LocatorType, SelectorEngine,
-    WaitEngine, WaitCondition, DOMCondition,
-    ActionExecutor, ActionResult as ActionResultMAX, Precondition, Postcondition,
-    NavigationManager, NavigationResult,
-    RecoveryManager, RecoveryLevel,
-    Watchdog, WatchdogConfig,
-    ObservabilityEngine, ReasonCode, FailureReason,
-    # Stealth (anti-detection)
-    StealthManager,
-    RuntimeDomainManager,
-    WebRTCProtection, WebRTCConfig,
-    ServiceWorkerManager,
-    MemoryMonitor, MemoryMetrics, MemoryThresholds,
-    IsolatedWorldManager
-)
+# Import lười: chỉ nạp submodule (vd. cả stack cdp_max) khi tên được dùng lần đầu,
+# để `from automation.window_manager import ...` lúc khởi động app không kéo theo CDP MAX
+_EXPORTS = {
+    # Engine
+    'AutomationEngine': ('.engine', None),
+    'JobState': ('.engine', None),
+    'StateResult': ('.engine', None),
+    'FailureType': ('.engine', None),
+    # CDP Client (legacy)
+    'CDPClient': ('.cdp_client', None),
+    'Condition': ('.cdp_client', None),
+    'ConditionType': ('.cdp_client', None),
+    'WaitResult': ('.cdp_client', None),
+    'ActionResult': ('.cdp_client', None),
+    # Artifacts / Jobs / Human Behavior
+    'ArtifactCollector': ('.artifacts', None),
+    'JobArtifact': ('.artifacts', None),
+    'Job': ('.jobs', None),
+    'JobContext': ('.jobs', None),
+    'JobResult': ('.jobs', None),
+    'HumanBehavior': ('.human_behavior', None),
+    'AntiDetection': ('.human_behavior', None),
+    'WaitStrategy': ('.human_behavior', None),
+    # CDP MAX - Production-grade CDP
+    'ActionResultMAX': ('.cdp_max', 'ActionResult'),
+    **{name: ('.cdp_max', None) for name in (
+        'CDPClientMAX', 'CDPClientConfig',
+        'CDPSession', 'SessionState', 'SessionConfig',
+        'Locator', 'LocatorType', 'SelectorEngine',
+        'WaitEngine', 'WaitCondition', 'DOMCondition',
+        'ActionExecutor', 'Precondition', 'Postcondition',
+        'NavigationManager', 'NavigationResult',
+        'RecoveryManager', 'RecoveryLevel',
+        'Watchdog', 'WatchdogConfig',
+        'ObservabilityEngine', 'ReasonCode', 'FailureReason',
+        # Stealth (anti-detection)
+        'StealthManager',
+        'RuntimeDomainManager',
+        'WebRTCProtection', 'WebRTCConfig',
+        'ServiceWorkerManager',
+        'MemoryMonitor', 'MemoryMetrics', 'MemoryThresholds',
+        'IsolatedWorldManager',
+    )},
+    # CDP Helper - High-level automation for tabs
+    'CDPHelper': ('.cdp_helper', None),
+    'CDPHelperResult': ('.cdp_helper', None),
+    'create_cdp_helper': ('.cdp_helper', None),
+    'get_remote_port_from_browser': ('.cdp_helper', None),
+    # Window Manager - Window sizing and positioning
+    **{name: ('.window_manager', None) for name in (
+        'WindowManager',
+        'get_window_manager',
+        'acquire_window_slot',
+        'release_window_slot',
+        'get_window_bounds',
+        'configure_window_size',
+        'configure_screen_size',
+    )},
+}
 
 __all__ = [
     # Engine
@@ -86,16 +122,16 @@ __all__ = [
     'configure_screen_size',
 ]
 
-# CDP Helper - High-level automation for tabs
-from .cdp_helper import CDPHelper, CDPHelperResult, create_cdp_helper, get_remote_port_from_browser
 
-# Window Manager - Window sizing and positioning
-from .window_manager import (
-    WindowManager,
-    get_window_manager,
-    acquire_window_slot,
-    release_window_slot,
-    get_window_bounds,
-    configure_window_size,
-    configure_screen_size
-)
+def __getattr__(name: str):
+    try:
+        module_name, attr = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), attr or name)
+    globals()[name] = value  # Lần sau không qua __getattr__ nữa
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
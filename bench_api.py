@@ -0,0 +1,209 @@
+"""Load benchmark cho api_service trên fake Hidemium server, xuất báo cáo JSON
+
+Cách dùng:
+    python bench_api.py                                  # 100, 1k, 10k profiles -> bench_api_report.json
+    python bench_api.py --sizes 1000 --latency 0.02 --error-rate 0.01
+    python bench_api.py --compare bench_api_report_old.json
+
+Đo: tốc độ request (status poll, open/close qua thread pool và open_many/close_many asyncio), thời gian tải danh sách profiles
+(tuần tự vs iter_profiles song song) và thời gian sync qua đúng code của ProfilesTab
+(tabs.profiles_tab.sync_from_hidemium: tải + upsert DB, DB tạm qua FBMANAGER_DATA_DIR).
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# DB tạm, phải đặt trước khi import db
+os.environ.setdefault("FBMANAGER_DATA_DIR", tempfile.mkdtemp(prefix="fbbench_api_"))
+
+import db  # noqa: E402
+from api_service import HidemiumAPI, RunningStatusPoller  # noqa: E402
+from async_api_service import AsyncHidemiumAPI  # noqa: E402
+from fake_hidemium import FakeHidemium  # noqa: E402
+from tabs.profiles_tab import sync_from_hidemium  # noqa: E402
+
+DEFAULT_SIZES = "100,1000,10000"
+PAGE_SIZE = 100
+
+
+def timed(func) -> tuple:
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def request_rate(func, threads: int, total: int) -> dict:
+    """Gọi func() `total` lần trên `threads` thread, trả số request/giây"""
+    errors = [0]
+    lock = threading.Lock()
+
+    def call(_):
+        try:
+            func()
+        except Exception:
+            with lock:
+                errors[0] += 1
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        _, elapsed = timed(lambda: list(pool.map(call, range(total))))
+    return {"calls": total, "threads": threads, "wall_s": round(elapsed, 3),
+            "rps": round(total / elapsed, 1), "exceptions": errors[0]}
+
+
+def fetch_sequential(api: HidemiumAPI) -> int:
+    """Cách cũ: tải từng trang một cho tới trang thiếu"""
+    count, page = 0, 1
+    while True:
+        profiles = api.get_profiles(limit=PAGE_SIZE, page=page)
+        count += len(profiles)
+        if len(profiles) < PAGE_SIZE:
+            return count
+        page += 1
+
+
+def fetch_concurrent(api: HidemiumAPI) -> int:
+    return sum(len(page) for page in api.iter_profiles(page_size=PAGE_SIZE))
+
+
+def sync_profiles_tab(api: HidemiumAPI, poller: RunningStatusPoller) -> int:
+    """Sync như nút đồng bộ của ProfilesTab, trả số profiles đã lưu"""
+    pages = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        sync_from_hidemium(pages.append, client=api, poller=poller, page_size=PAGE_SIZE)
+    return sum(len(page) for page in pages)
+
+
+def run_size(size: int, args) -> dict:
+    """Benchmark với `size` profiles"""
+    server = FakeHidemium(profiles=size, latency=args.latency, jitter=args.jitter,
+                          error_rate=args.error_rate).start()
+    api = HidemiumAPI(base_url=server.url)
+    poller = RunningStatusPoller(api)  # Không subscribe: chỉ dùng refresh(), không chạy thread
+    with db.get_connection() as conn:
+        conn.execute("DELETE FROM profiles")
+
+    try:
+        report = {}
+        count, elapsed = timed(lambda: fetch_sequential(api))
+        report["fetch_sequential"] = {"profiles": count, "wall_s": round(elapsed, 3)}
+        count, elapsed = timed(lambda: fetch_concurrent(api))
+        report["fetch_concurrent"] = {"profiles": count, "wall_s": round(elapsed, 3)}
+
+        count, elapsed = timed(lambda: sync_profiles_tab(api, poller))
+        report["sync_first"] = {"profiles": count, "wall_s": round(elapsed, 3)}
+        count, elapsed = timed(lambda: sync_profiles_tab(api, poller))
+        report["sync_unchanged"] = {"profiles": count, "wall_s": round(elapsed, 3)}
+
+        report["status_poll"] = request_rate(lambda: api.get_running_profiles(), args.threads, args.calls)
+        uuids = [p["uuid"] for p in server.profiles[:args.calls // 2]]
+        burst = iter(uuids * 2)
+        lock = threading.Lock()
+
+        def open_close():
+            with lock:
+                uuid = next(burst)
+            api.open_browser(uuid, auto_resize=False)
+            api.close_browser(uuid)
+
+        report["open_close"] = request_rate(open_close, args.threads, len(uuids))
+
+        async def open_close_many():
+            async with AsyncHidemiumAPI(base_url=server.url, concurrency=args.threads) as client:
+                await client.open_many(uuids, auto_resize=False)
+                await client.close_many(uuids)
+
+        _, elapsed = timed(lambda: asyncio.run(open_close_many()))
+        report["open_close_async"] = {"calls": 2 * len(uuids), "threads": 1, "wall_s": round(elapsed, 3),
+                                      "rps": round(2 * len(uuids) / elapsed, 1), "exceptions": 0}
+
+        server.reset_stats()
+        report["folders_cached"] = request_rate(lambda: api.get_folders(), args.threads, args.calls)
+        report["folders_cached"]["server_requests"] = server.requests["/v1/folder/list"]
+
+        report["server_errors"] = sum(server.errors.values())
+        return report
+    finally:
+        api.close()
+        server.stop()
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list:
+    """So wall_s với báo cáo cũ, trả các case chậm hơn threshold %"""
+    regressions = []
+    for size, cases in report["sizes"].items():
+        old_cases = baseline.get("sizes", {}).get(size, {})
+        for name, result in cases.items():
+            old = old_cases.get(name)
+            if not isinstance(result, dict) or not isinstance(old, dict) or not old.get("wall_s"):
+                continue
+            change = (result["wall_s"] - old["wall_s"]) / old["wall_s"] * 100
+            if change > threshold:
+                regressions.append((size, name, old["wall_s"], result["wall_s"], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load benchmark api_service trên fake Hidemium")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Số profiles, cách nhau bởi dấu phẩy")
+    parser.add_argument("--latency", type=float, default=0.005, help="Độ trễ mỗi request của server (giây)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--threads", type=int, default=16, help="Số thread gọi song song")
+    parser.add_argument("--calls", type=int, default=400, help="Số request mỗi bài đo tốc độ")
+    parser.add_argument("--output", default="bench_api_report.json")
+    parser.add_argument("--compare", help="Báo cáo cũ để so sánh")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Ngưỡng chậm hơn (%%) coi là regression")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "error_rate": args.error_rate,
+            "threads": args.threads,
+            "calls": args.calls,
+        },
+        "sizes": {},
+    }
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        print(f"[Bench API] {size} profiles")
+        result = run_size(size, args)
+        report["sizes"][str(size)] = result
+        for name, value in result.items():
+            if not isinstance(value, dict):
+                print(f"   {name:<20} {value}")
+            elif "rps" in value:
+                print(f"   {name:<20} {value['rps']:>10.1f} req/s  ({value['wall_s']}s)")
+            else:
+                print(f"   {name:<20} {value['wall_s']:>10.3f} s     ({value['profiles']} profiles)")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[Bench API] Report: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for size, name, old, new, change in regressions:
+            print(f"   ⚠️  {size}/{name}: {old:.3f} -> {new:.3f} s (+{change:.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"[Bench API] Không có regression > {args.threshold:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
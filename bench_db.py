@@ -0,0 +1,390 @@
+"""Benchmark db.py trên dữ liệu giả lập, xuất báo cáo JSON để so sánh giữa các lần chạy
+
+Cách dùng:
+    python bench_db.py                                # small + medium -> bench_report.json
+    python bench_db.py --sizes large --repeat 3
+    python bench_db.py --compare bench_report_old.json --threshold 20
+
+Mỗi kích thước chạy trong một process riêng với DB tạm (FBMANAGER_DATA_DIR),
+dữ liệu sinh bằng seed cố định nên các lần chạy so sánh được với nhau.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+SIZES = {
+    "small": {"profiles": 200, "groups": 5_000, "pages": 5_000, "posts": 50_000,
+              "reels": 10_000, "reel_schedules": 2_000, "contents": 500,
+              "categories": 20, "scripts": 50, "boost_posts": 200, "settings": 50, "schedules": 20},
+    "medium": {"profiles": 1_000, "groups": 30_000, "pages": 30_000, "posts": 500_000,
+               "reels": 100_000, "reel_schedules": 20_000, "contents": 2_000,
+               "categories": 50, "scripts": 200, "boost_posts": 1_000, "settings": 100, "schedules": 50},
+    "large": {"profiles": 3_000, "groups": 100_000, "pages": 100_000, "posts": 2_000_000,
+              "reels": 300_000, "reel_schedules": 50_000, "contents": 5_000,
+              "categories": 100, "scripts": 500, "boost_posts": 5_000, "settings": 200, "schedules": 100},
+}
+
+SEED = 20240101
+HISTORY_DAYS = 365
+WORDS = [
+    "Hội", "Cộng đồng", "Mua bán", "Đà Nẵng", "Hà Nội", "Sài Gòn", "Việc làm", "Nhà đất",
+    "Xe cũ", "Ẩm thực", "Du lịch", "Review", "Thời trang", "Điện thoại", "Thú cưng",
+    "Sinh viên", "Mẹ và bé", "Làm đẹp", "Đồ cũ", "Bất động sản", "Cây cảnh", "Nghe nhạc",
+]
+STATUSES = ["success", "success", "success", "failed", "pending"]
+
+
+# ==================== DATA ====================
+
+def _name(rng: random.Random) -> str:
+    return " ".join(rng.sample(WORDS, 3)) + f" {rng.randint(1, 999)}"
+
+
+def generate_data(db, size: dict) -> dict:
+    """Sinh dữ liệu giả lập trực tiếp bằng executemany (trigger thống kê/FTS vẫn chạy)"""
+    rng = random.Random(SEED)
+    now = datetime.now()
+    uuids = [f"{rng.getrandbits(128):032x}" for _ in range(size["profiles"])]
+
+    def timestamp():
+        return (now - timedelta(seconds=rng.randint(0, HISTORY_DAYS * 86400))).isoformat()
+
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO profiles (uuid, name, browser, os, status) VALUES (?, ?, 'chrome', 'win', 'stopped')",
+            [(uuid, f"Profile {i}") for i, uuid in enumerate(uuids)]
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO groups (profile_uuid, group_id, group_name, group_url, member_count) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(rng.choice(uuids), str(1_000_000 + i), _name(rng), f"https://fb.com/groups/{i}",
+              rng.randint(10, 500_000)) for i in range(size["groups"])]
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO pages (profile_uuid, page_id, page_name, page_url, follower_count) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(rng.choice(uuids), str(2_000_000 + i), _name(rng), f"https://fb.com/{i}",
+              rng.randint(0, 100_000)) for i in range(size["pages"])]
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO categories (name, description) VALUES (?, '')",
+            [(f"Category {i}",) for i in range(size["categories"])]
+        )
+        conn.executemany(
+            "INSERT INTO scripts (name, type, content) VALUES (?, ?, ?)",
+            [(_name(rng), rng.choice(["python", "hidemium"]), " ".join(rng.choices(WORDS, k=50)))
+             for _ in range(size["scripts"])]
+        )
+        conn.executemany(
+            "INSERT INTO posts (url, title, target_likes, target_comments, status) VALUES (?, ?, ?, ?, ?)",
+            [(f"https://fb.com/post/{i}", _name(rng), rng.randint(0, 500), rng.randint(0, 100),
+              rng.choice(["pending", "running", "done"])) for i in range(size["boost_posts"])]
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+            [(f"bench_setting_{i}", str(rng.randint(0, 1000))) for i in range(size["settings"])]
+        )
+        conn.executemany(
+            "INSERT INTO schedules (name, time_slots, content_category_id, group_ids, is_active) "
+            "VALUES (?, '08:00,12:00,20:00', 1, ?, ?)",
+            [(_name(rng), ",".join(str(1_000_000 + rng.randrange(size["groups"])) for _ in range(20)),
+              rng.randint(0, 1)) for _ in range(size["schedules"])]
+        )
+        conn.executemany(
+            "INSERT INTO contents (category_id, title, content) VALUES (1, ?, ?)",
+            [(_name(rng), " ".join(rng.choices(WORDS, k=30))) for _ in range(size["contents"])]
+        )
+
+        batch = 50_000
+        for start in range(0, size["posts"], batch):
+            rows = []
+            for i in range(start, min(start + batch, size["posts"])):
+                status = rng.choice(STATUSES)
+                rows.append((rng.choice(uuids), str(1_000_000 + rng.randrange(size["groups"])),
+                             rng.randint(1, size["contents"]),
+                             f"https://fb.com/p/{i}" if status == "success" else "",
+                             status, timestamp()))
+            conn.executemany(
+                "INSERT INTO post_history (profile_uuid, group_id, content_id, post_url, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            conn.commit()
+
+        conn.executemany(
+            "INSERT INTO posted_reels (profile_uuid, page_id, page_name, reel_url, video_path, posted_at) "
+            "VALUES (?, ?, 'Page', ?, 'video.mp4', ?)",
+            [(rng.choice(uuids), str(2_000_000 + rng.randrange(size["pages"])),
+              f"https://fb.com/reel/{i}", timestamp()) for i in range(size["reels"])]
+        )
+        conn.executemany(
+            "INSERT INTO reel_schedules (profile_uuid, page_id, video_path, scheduled_time, status, executed_at) "
+            "VALUES (?, ?, 'video.mp4', ?, ?, ?)",
+            [(rng.choice(uuids), rng.randrange(size["pages"]), timestamp(),
+              rng.choice(["completed", "failed", "pending"]), timestamp())
+             for _ in range(size["reel_schedules"])]
+        )
+
+    # Profile nhiều dữ liệu nhất làm mẫu cho các query theo profile
+    with db.get_connection() as conn:
+        busiest = conn.execute(
+            "SELECT profile_uuid FROM post_history GROUP BY profile_uuid ORDER BY COUNT(*) DESC LIMIT 1"
+        ).fetchone()[0]
+        conn.execute("ANALYZE")
+    return {"uuids": uuids, "busiest": busiest}
+
+
+# ==================== CASES ====================
+
+def build_cases(db, data: dict) -> list:
+    """Danh sách (tên, callable); tên giữ ổn định để so sánh báo cáo"""
+    rng = random.Random(SEED + 1)
+    uuid = data["busiest"]
+    many = data["uuids"][:500]
+    date_from = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+    pages = db.get_pages(uuid)
+    groups = db.get_groups(uuid)
+    first_group = groups[0]["id"] if groups else 0
+    sync_payload = [dict(p) for p in pages] + [
+        {"page_id": str(9_000_000 + i), "page_name": _name(rng)} for i in range(50)
+    ]
+    group_payload = [dict(g) for g in groups] + [
+        {"group_id": str(8_000_000 + i), "group_name": _name(rng)} for i in range(50)
+    ]
+    profiles_payload = [
+        {"uuid": u, "name": f"Profile {i}", "status": "stopped"} for i, u in enumerate(data["uuids"])
+    ]
+
+    def walk_pages(count=5):
+        cursor = None
+        for _ in range(count):
+            _, cursor = db.get_post_history_page(uuid, date_from=None, limit=50, after=cursor)
+            if not cursor:
+                break
+
+    def crud(save, delete, insert: dict, update: dict):
+        """Một vòng tạo -> sửa -> xóa, giữ nguyên kích thước bảng giữa các lần đo"""
+        def run():
+            row = save(dict(insert))
+            save(dict(update, id=row["id"]))
+            delete(row["id"])
+        return run
+
+    def reel_schedule_cycle():
+        row = db.save_reel_schedule({"profile_uuid": uuid, "page_id": 1, "video_path": "video.mp4",
+                                     "scheduled_time": datetime.now().isoformat()})
+        db.update_reel_schedule(row["id"], {"status": "completed", "executed_at": datetime.now().isoformat()})
+        db.delete_reel_schedule(row["id"])
+
+    def deferred_writes(count=200):
+        for i in range(count):
+            db.save_post_history({"profile_uuid": uuid, "group_id": "1", "status": "success",
+                                  "post_url": f"https://fb.com/bench/{i}"}, defer=True)
+        db.flush_writes()
+
+    return [
+        ("get_profiles", lambda: db.get_profiles()),
+        ("get_profile_by_uuid", lambda: db.get_profile_by_uuid(uuid)),
+        ("sync_profiles", lambda: db.sync_profiles([dict(p) for p in profiles_payload])),
+        ("get_pages", lambda: db.get_pages(uuid)),
+        ("get_pages_all", lambda: db.get_pages()),
+        ("get_pages_for_profiles_500", lambda: db.get_pages_for_profiles(many)),
+        ("get_pages_count", lambda: db.get_pages_count(uuid)),
+        ("sync_pages", lambda: db.sync_pages(uuid, [dict(p) for p in sync_payload])),
+        ("get_groups", lambda: db.get_groups(uuid)),
+        ("get_groups_all", lambda: db.get_groups()),
+        ("get_groups_for_profiles_500", lambda: db.get_groups_for_profiles(many)),
+        ("get_groups_count", lambda: db.get_groups_count(uuid)),
+        ("get_selected_groups", lambda: db.get_selected_groups(uuid)),
+        ("update_group_selection", lambda: db.update_group_selection(first_group, 1)),
+        ("sync_groups", lambda: db.sync_groups(uuid, [dict(g) for g in group_payload])),
+        ("get_post_history", lambda: db.get_post_history(uuid)),
+        ("get_post_history_filtered", lambda: db.get_post_history_filtered(uuid, date_from, "success")),
+        ("get_post_history_filtered_offset_500",
+         lambda: db.get_post_history_filtered(uuid, None, None, limit=50, offset=500)),
+        ("get_post_history_page_walk_5", walk_pages),
+        ("get_post_history_count_day", lambda: db.get_post_history_count(uuid, date_from, "success")),
+        ("get_post_history_count_exact",
+         lambda: db.get_post_history_count(uuid, date_from + "T12:00:00", "success")),
+        ("get_post_stats", lambda: db.get_post_stats(uuid)),
+        ("get_post_stats_by_day", lambda: db.get_post_stats_by_day(uuid, date_from)),
+        ("save_post_history", lambda: db.save_post_history(
+            {"profile_uuid": uuid, "group_id": "1", "status": "success", "post_url": "https://fb.com/bench"})),
+        ("save_post_history_deferred_200", deferred_writes),
+        ("get_reel_history", lambda: db.get_reel_history(uuid)),
+        ("get_posted_reels", lambda: db.get_posted_reels(uuid)),
+        ("get_posted_reels_count", lambda: db.get_posted_reels_count(uuid)),
+        ("get_categories", lambda: db.get_categories()),
+        ("category_crud", crud(db.save_category, db.delete_category,
+                               {"name": "Bench category"}, {"name": "Bench category 2"})),
+        ("get_contents", lambda: db.get_contents(1)),
+        ("get_contents_all", lambda: db.get_contents()),
+        ("get_contents_count", lambda: db.get_contents_count(1)),
+        ("content_crud", crud(db.save_content, db.delete_content,
+                              {"title": "Bench", "content": "Du lịch Đà Nẵng"},
+                              {"title": "Bench 2", "content": "Mua bán Hà Nội"})),
+        ("get_scripts", lambda: db.get_scripts()),
+        ("script_crud", crud(db.save_script, db.delete_script,
+                             {"name": "Bench", "content": "print(1)"}, {"name": "Bench 2", "content": "print(2)"})),
+        ("get_posts", lambda: db.get_posts()),
+        ("post_crud", crud(db.save_post, db.delete_post,
+                           {"url": "https://fb.com/bench"}, {"url": "https://fb.com/bench", "status": "done"})),
+        ("update_post_stats", lambda: db.update_post_stats(1, likes=1, comments=1)),
+        ("get_settings", lambda: db.get_settings()),
+        ("get_setting", lambda: db.get_setting("bench_setting_0")),
+        ("save_settings_10", lambda: db.save_settings({f"bench_setting_{i}": i for i in range(10)})),
+        ("get_schedules", lambda: db.get_schedules()),
+        ("get_schedules_active", lambda: db.get_schedules(active_only=True)),
+        ("schedule_crud", crud(db.save_schedule, db.delete_schedule,
+                               {"name": "Bench", "time_slots": "08:00"}, {"name": "Bench 2", "is_active": 0})),
+        ("update_schedule_stats", lambda: db.update_schedule_stats(1, post_count=1, success_count=1)),
+        ("get_reel_schedules", lambda: db.get_reel_schedules(uuid)),
+        ("get_reel_schedules_pending", lambda: db.get_reel_schedules(status="pending")),
+        ("get_pending_reel_schedules", lambda: db.get_pending_reel_schedules()),
+        ("reel_schedule_crud", reel_schedule_cycle),
+        ("search_contents", lambda: db.search_contents("du lich")),
+        ("search_groups", lambda: db.search_groups("da nang", limit=None)),
+        ("search_pages", lambda: db.search_pages("mua ban", many)),
+        ("get_profile_stats", lambda: db.get_profile_stats()),
+    ]
+
+
+def time_case(func, repeat: int) -> dict:
+    """Chạy 1 lần làm nóng rồi đo `repeat` lần (ms)"""
+    func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+def run_worker(size_name: str, repeat: int, result_path: str):
+    """Chạy trong process con: FBMANAGER_DATA_DIR đã trỏ tới thư mục tạm"""
+    import db
+
+    start = time.perf_counter()
+    data = generate_data(db, SIZES[size_name])
+    setup_s = time.perf_counter() - start
+
+    results = {}
+    for name, func in build_cases(db, data):
+        try:
+            results[name] = time_case(func, repeat)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+    db.close_all_connections()
+
+    report = {
+        "rows": SIZES[size_name],
+        "setup_s": round(setup_s, 2),
+        "db_size_mb": round(os.path.getsize(db.DB_PATH) / 1048576, 1),
+        "results": results,
+    }
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump(report, f)
+
+
+# ==================== REPORT ====================
+
+def run_size(size_name: str, repeat: int) -> dict:
+    """Chạy benchmark một kích thước trong process riêng với DB tạm"""
+    with tempfile.TemporaryDirectory(prefix="fbbench_") as tmp:
+        result_path = os.path.join(tmp, "result.json")
+        env = dict(os.environ, FBMANAGER_DATA_DIR=os.path.join(tmp, "data"))
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", size_name,
+             "--repeat", str(repeat), "--result", result_path],
+            env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=subprocess.DEVNULL, check=True
+        )
+        with open(result_path, encoding="utf-8") as f:
+            return json.load(f)
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list:
+    """So median với báo cáo cũ, trả về các case chậm hơn threshold %"""
+    regressions = []
+    for size_name, size_report in report["sizes"].items():
+        old_results = baseline.get("sizes", {}).get(size_name, {}).get("results", {})
+        for name, result in size_report["results"].items():
+            old = old_results.get(name, {})
+            if "median_ms" not in result or not old.get("median_ms"):
+                continue
+            change = (result["median_ms"] - old["median_ms"]) / old["median_ms"] * 100
+            if change > threshold:
+                regressions.append((size_name, name, old["median_ms"], result["median_ms"], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark db.py trên dữ liệu giả lập")
+    parser.add_argument("--sizes", default="small,medium", help=f"Danh sách kích thước: {', '.join(SIZES)}")
+    parser.add_argument("--repeat", type=int, default=5, help="Số lần đo mỗi case")
+    parser.add_argument("--output", default="bench_report.json", help="File JSON báo cáo")
+    parser.add_argument("--compare", help="Báo cáo cũ để so sánh")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Ngưỡng chậm hơn (%%) coi là regression")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.repeat, args.result)
+        return
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": SEED,
+            "repeat": args.repeat,
+        },
+        "sizes": {},
+    }
+    for size_name in [s.strip() for s in args.sizes.split(",") if s.strip()]:
+        if size_name not in SIZES:
+            parser.error(f"Kích thước không hợp lệ: {size_name}")
+        print(f"[Bench] {size_name}: {SIZES[size_name]}")
+        size_report = run_size(size_name, args.repeat)
+        report["sizes"][size_name] = size_report
+        print(f"[Bench]   setup {size_report['setup_s']}s, DB {size_report['db_size_mb']}MB")
+        for name, result in size_report["results"].items():
+            if "error" in result:
+                print(f"   ❌ {name:<40} {result['error']}")
+            else:
+                print(f"   {name:<40} {result['median_ms']:>10.2f} ms  (p95 {result['p95_ms']:.2f})")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n[Bench] Report: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for size_name, name, old, new, change in regressions:
+            print(f"   ⚠️  {size_name}/{name}: {old:.2f} -> {new:.2f} ms (+{change:.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"[Bench] Không có regression > {args.threshold:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
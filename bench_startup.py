@@ -0,0 +1,150 @@
+"""Đo thời gian import lúc khởi động (python -X importtime), xuất báo cáo JSON theo từng module
+
+Cách dùng:
+    python bench_startup.py                              # -> bench_startup_report.json
+    python bench_startup.py --targets main,tabs.groups_tab --top 15
+    python bench_startup.py --compare bench_startup_report_old.json
+
+Mỗi target import trong một process Python mới (cache import sạch, DB tạm qua FBMANAGER_DATA_DIR),
+lấy lần nhanh nhất trong --repeat lần. Báo cáo gồm tổng thời gian import của target và các package
+tốn thời gian nhất (cộng dồn self time theo package cấp cao nhất, vd. bs4, customtkinter, automation).
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from datetime import datetime
+
+# main: phần app nạp trước khi hiện cửa sổ; các tab: chi phí lần mở (hoặc prewarm) đầu tiên
+DEFAULT_TARGETS = ",".join([
+    "main",
+    "tabs.profiles_tab", "tabs.groups_tab", "tabs.pages_tab", "tabs.login_tab",
+    "tabs.content_tab", "tabs.reels_page_tab", "tabs.scripts_tab", "tabs.posts_tab",
+    "automation.cdp_helper",
+])
+# Nạp sẵn trước khi đo tab (main đã import), để số liệu tab chỉ gồm phần tab thêm vào
+BASELINE_IMPORTS = "import main"
+
+
+def import_times(target: str, baseline: str, data_dir: str) -> dict:
+    """
+    Import target trong process mới, trả {module: (self_us, cumulative_us)} và lỗi nếu có.
+
+    Args:
+        target: Tên module cần đo
+        baseline: Câu import chạy trước (không tính vào kết quả), "" = không có
+        data_dir: FBMANAGER_DATA_DIR cho process con
+    """
+    code = f"{baseline}\nimport sys; sys.stderr.write('--start--\\n')\nimport {target}"
+    env = dict(os.environ, FBMANAGER_DATA_DIR=data_dir)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, encoding="utf-8", errors="replace",
+    )
+    modules = {}
+    started = not baseline
+    error = None
+    for line in proc.stderr.splitlines():
+        if line == "--start--":
+            started = True
+            continue
+        if not line.startswith("import time:"):
+            if started and proc.returncode and line.strip():
+                error = line.strip()  # Dòng cuối của traceback
+            continue
+        if not started:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # Dòng tiêu đề
+        modules[parts[2].strip()] = (self_us, cumulative_us)
+    return {"modules": modules, "error": error}
+
+
+def summarize(runs: list, target: str, top: int) -> dict:
+    """Lấy lần nhanh nhất, gộp self time theo package cấp cao nhất"""
+    best = min(runs, key=lambda run: sum(s for s, _ in run["modules"].values()))
+    modules = best["modules"]
+    total_us = sum(s for s, _ in modules.values())
+    packages = defaultdict(int)
+    for name, (self_us, _) in modules.items():
+        packages[name.split(".")[0]] += self_us
+    heaviest = sorted(packages.items(), key=lambda item: -item[1])[:top]
+    return {
+        "total_ms": round(total_us / 1000, 1),
+        "target_ms": round(modules.get(target, (0, 0))[1] / 1000, 1),
+        "modules": len(modules),
+        "packages_ms": {name: round(us / 1000, 1) for name, us in heaviest},
+        "error": best["error"],
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list:
+    """So total_ms với báo cáo cũ, trả các target chậm hơn threshold %"""
+    regressions = []
+    for target, result in report["targets"].items():
+        old = baseline.get("targets", {}).get(target, {})
+        if not old.get("total_ms") or not result.get("total_ms"):
+            continue
+        change = (result["total_ms"] - old["total_ms"]) / old["total_ms"] * 100
+        if change > threshold:
+            regressions.append((target, old["total_ms"], result["total_ms"], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Đo thời gian import lúc khởi động theo module")
+    parser.add_argument("--targets", default=DEFAULT_TARGETS, help="Các module cần đo, cách nhau bởi dấu phẩy")
+    parser.add_argument("--repeat", type=int, default=3, help="Số lần đo mỗi target (lấy lần nhanh nhất)")
+    parser.add_argument("--top", type=int, default=10, help="Số package tốn thời gian nhất mỗi target")
+    parser.add_argument("--output", default="bench_startup_report.json")
+    parser.add_argument("--compare", help="Báo cáo cũ để so sánh")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Ngưỡng chậm hơn (%%) coi là regression")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "targets": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="fbbench_startup_") as data_dir:
+        for target in [t.strip() for t in args.targets.split(",") if t.strip()]:
+            baseline = "" if target == "main" else BASELINE_IMPORTS
+            runs = [import_times(target, baseline, data_dir) for _ in range(max(1, args.repeat))]
+            result = summarize(runs, target, args.top)
+            report["targets"][target] = result
+
+            print(f"[Bench Startup] {target:<24} {result['total_ms']:>8.1f} ms  ({result['modules']} modules)")
+            if result["error"]:
+                print(f"   ⚠️  {result['error']}")
+            for name, ms in result["packages_ms"].items():
+                print(f"   {name:<28} {ms:>8.1f} ms")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[Bench Startup] Report: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline_report = json.load(f)
+        regressions = compare(report, baseline_report, args.threshold)
+        for target, old, new, change in regressions:
+            print(f"   ⚠️  {target}: {old:.1f} -> {new:.1f} ms (+{change:.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"[Bench Startup] Không có regression > {args.threshold:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
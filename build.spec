@@ -4,6 +4,8 @@ PyInstaller spec file for FB Manager Pro
 Build command: pyinstaller build.spec
 """
 
+from PyInstaller.utils.hooks import collect_submodules
+
 block_cipher = None
 
 a = Analysis(
@@ -17,6 +19,9 @@ a = Analysis(
         'customtkinter',
         'PIL',
         'requests',
+        # tabs/automation import submodule lười qua importlib, PyInstaller không tự thấy
+        *collect_submodules('tabs'),
+        *collect_submodules('automation'),
     ],
     hookspath=[],
     hooksconfig={},
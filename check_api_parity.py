@@ -0,0 +1,127 @@
+"""Debug script: HidemiumAPI và AsyncHidemiumAPI phải có cùng method và gửi cùng request
+
+Mỗi method public dùng chung được gọi trên cả hai client với cùng tham số, trên fake
+Hidemium ghi lại request: (method, path, query, body) và kết quả trả về phải giống nhau.
+Thêm method mới vào một client mà quên client kia, hoặc thêm method mà chưa có mẫu
+trong CALLS, script sẽ báo lỗi.
+"""
+import asyncio
+import inspect
+
+from api_service import HidemiumAPI
+from async_api_service import AsyncHidemiumAPI
+from fake_hidemium import FakeHidemium
+
+print("=" * 50)
+print("DEBUG: HidemiumAPI vs AsyncHidemiumAPI")
+print("=" * 50)
+
+UUID = "0" * 32
+# method -> (args, kwargs) mẫu
+CALLS = {
+    "check_connection": ((), {}),
+    "get_profiles": ((), {"limit": 20, "page": 2, "search": "Profile", "folder_id": [1], "status": "1"}),
+    "iter_profiles": ((), {"page_size": 20}),
+    "get_profile_detail": ((UUID,), {"is_local": True}),
+    "create_profile_default": ((3,), {}),
+    "create_profile_custom": (({"name": "x", "os": "win"},), {"is_local": False}),
+    "create_profile": (({"name": "x", "os": "mac", "browserVersion": 130},), {}),
+    "delete_profiles": (([UUID, "1" * 32],), {}),
+    "update_profile_name": ((UUID, "Tên mới"), {}),
+    "update_profile_note": ((UUID, "ghi chú"), {}),
+    "open_browser": ((UUID,), {"command": "--mute-audio", "proxy": "HTTP|1.2.3.4|80", "auto_resize": False}),
+    "close_browser": ((UUID,), {}),
+    "check_profile": ((UUID,), {}),
+    "update_proxy": ((UUID, "HTTP", "1.2.3.4", "80"), {"user": "u", "password": "p"}),
+    "remove_proxy": ((UUID,), {}),
+    "get_folders": ((), {"limit": 10, "page": 2}),
+    "add_profiles_to_folder": (("folder-1", [UUID]), {}),
+    "get_tags": ((), {}),
+    "sync_tags": ((UUID, ["a", "b"]), {}),
+    "get_status_list": ((), {}),
+    "get_running_profiles": ((), {}),
+    "fetch_running_profiles": ((), {"is_local": False}),
+    "get_default_configs": ((), {"page": 2, "limit": 5}),
+    "get_scripts": ((), {"page": 1, "limit": 5}),
+    "get_campaigns": ((), {"search": "c", "page": 2}),
+    "create_campaign": (("Campaign",), {"input_vars": {"a": 1}}),
+    "update_campaign_variables": ((7, [{"uuid": UUID}]), {}),
+    "delete_all_campaign_profiles": (("7",), {}),
+    "run_script": ((1, UUID), {"variables": {"k": "v"}}),
+}
+# Không gửi request: chỉ so chữ ký
+LOCAL_ONLY = {"close", "get_stats", "reset_stats", "invalidate_cache"}
+
+
+def public_methods(cls) -> dict:
+    return {name: func for name, func in inspect.getmembers(cls, inspect.isfunction) if not name.startswith("_")}
+
+
+def parameters(func) -> list:
+    return [(p.name, p.kind, p.default) for p in inspect.signature(func).parameters.values()]
+
+
+def normalize(result):
+    """Kết quả so sánh được: trang profiles của iter_profiles về thứ tự cố định"""
+    if isinstance(result, list) and result and isinstance(result[0], list):
+        return sorted((p["uuid"] for page in result for p in page))
+    return result
+
+
+def call_sync(server, name, args, kwargs):
+    client = HidemiumAPI(base_url=server.url)
+    server.request_log = []
+    result = getattr(client, name)(*args, **kwargs)
+    if inspect.isgenerator(result):
+        result = list(result)
+    client.close()
+    return server.request_log, normalize(result)
+
+
+def call_async(server, name, args, kwargs):
+    async def run():
+        async with AsyncHidemiumAPI(base_url=server.url) as client:
+            server.request_log = []
+            result = getattr(client, name)(*args, **kwargs)
+            if inspect.isasyncgen(result):
+                return [page async for page in result]
+            return await result
+    result = asyncio.run(run())
+    return server.request_log, normalize(result)
+
+
+sync_methods = public_methods(HidemiumAPI)
+async_methods = public_methods(AsyncHidemiumAPI)
+failed = 0
+
+for name in sorted(set(sync_methods) - set(async_methods)):
+    print(f"❌ {name}: chỉ có trong HidemiumAPI")
+    failed += 1
+
+server = FakeHidemium(profiles=50, folders=3, running_ratio=0.2).start()
+try:
+    for name in sorted(set(sync_methods) & set(async_methods)):
+        errors = []
+        if parameters(sync_methods[name]) != parameters(async_methods[name]):
+            errors.append(f"chữ ký khác: {inspect.signature(sync_methods[name])} "
+                          f"vs {inspect.signature(async_methods[name])}")
+        if name not in LOCAL_ONLY:
+            if name not in CALLS:
+                errors.append("chưa có tham số mẫu trong CALLS")
+            else:
+                args, kwargs = CALLS[name]
+                sync_log, sync_result = call_sync(server, name, args, kwargs)
+                async_log, async_result = call_async(server, name, args, kwargs)
+                if sorted(map(repr, sync_log)) != sorted(map(repr, async_log)):
+                    errors.append(f"request khác:\n       sync:  {sync_log}\n       async: {async_log}")
+                if sync_result != async_result:
+                    errors.append(f"kết quả khác: {sync_result!r} vs {async_result!r}")
+        print(f"{'❌' if errors else '✅'} {name}")
+        for error in errors:
+            print(f"     {error}")
+        failed += bool(errors)
+finally:
+    server.stop()
+
+assert failed == 0, f"{failed} method không khớp giữa HidemiumAPI và AsyncHidemiumAPI"
+print("\nHidemiumAPI và AsyncHidemiumAPI khớp nhau")
@@ -0,0 +1,44 @@
+"""Debug script: kiểm tra các query post_history dùng đúng composite index"""
+import db
+
+print("=" * 50)
+print("DEBUG: EXPLAIN QUERY PLAN cho post_history")
+print("=" * 50)
+
+CURSOR = ("2030-01-01T00:00:00", 1)
+# Đúng WHERE mà get_post_history_count chạy (date_from có giờ -> không dùng bảng thống kê)
+COUNT_WHERE, COUNT_PARAMS = db._post_history_page_where("uuid", date_from="2024-01-01T12:00:00", status="success")
+
+# (tên, query, params, index bắt buộc)
+CHECKS = [
+    ("page (status + date)",
+     *db._post_history_page_query("uuid", date_from="2024-01-01", status="success"),
+     "idx_post_history_status_seek"),
+    ("page (status + date + cursor)",
+     *db._post_history_page_query("uuid", date_from="2024-01-01", status="success", after=CURSOR),
+     "idx_post_history_status_seek"),
+    ("page (date range, no status)",
+     *db._post_history_page_query("uuid", date_from="2024-01-01", date_to="2024-01-31", after=CURSOR),
+     "idx_post_history_profile_seek"),
+    ("count (status + date)",
+     db._post_history_count_query(COUNT_WHERE), COUNT_PARAMS,
+     "idx_post_history_status_seek"),
+    ("groups for many profiles (json_each)",
+     "SELECT * FROM groups WHERE profile_uuid IN (SELECT value FROM json_each(?)) ORDER BY profile_uuid, group_name",
+     ['["a", "b"]'],
+     "idx_groups_profile_name"),
+]
+
+failed = 0
+for name, query, params, index in CHECKS:
+    plan = db.explain_query_plan(query, params)
+    ok = any(f"INDEX {index}" in line for line in plan)
+    ok = ok and not any("TEMP B-TREE" in line for line in plan)
+    print(f"{'✅' if ok else '❌'} {name}")
+    for line in plan:
+        print(f"     {line}")
+    if not ok:
+        failed += 1
+
+assert failed == 0, f"{failed} query plan(s) không dùng index mong đợi"
+print("\nTất cả query plans OK")
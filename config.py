@@ -15,6 +15,7 @@ COLORS = {
     "bg_card_hover": "#30363d",      # Card hover
     "bg_input": "#0d1117",           # Input fields
     "bg_header": "#161b22",          # Header bar
+    "bg_elevated": "#1c2128",        # Panel nổi (editor, dialog)
 
     # Legacy aliases
     "bg_dark": "#0d1117",
@@ -40,6 +41,7 @@ COLORS = {
 
     # Status
     "success": "#00d97e",
+    "success_hover": "#2ee89a",
     "warning": "#f0b429",
     "error": "#f85149",
     "danger": "#f85149",
@@ -51,11 +53,13 @@ COLORS = {
     "text_primary": "#f0f6fc",
     "text_secondary": "#8b949e",
     "text_muted": "#6e7681",
+    "text_tertiary": "#6e7681",
     "text_link": "#58a6ff",
 
     # Borders
     "border": "#30363d",
     "border_light": "#3d444d",
+    "border_hover": "#484f58",
     "border_focus": "#00d97e",
     "divider": "#21262d",
 
@@ -74,6 +78,8 @@ SPACING = {
     "lg": 16,
     "xl": 24,
     "xxl": 32,
+    "2xl": 32,
+    "4xl": 64,
 }
 
 # Border radius
@@ -85,6 +91,41 @@ RADIUS = {
     "full": 9999,
 }
 
+# Fonts - tạo CTkFont qua widgets.font() (cache theo size/weight/family), không gọi ctk.CTkFont trực tiếp
+FONTS = {
+    "family": "Segoe UI",
+    "family_mono": "Consolas",
+    "size_xs": 10,
+    "size_sm": 11,
+    "size_base": 12,
+    "size_md": 13,
+    "size_lg": 15,
+    "size_xl": 18,
+    "size_2xl": 22,
+}
+
+# Style chữ dựng sẵn cho row/card: (size, weight, family, màu chữ trong COLORS) -> widgets.text_style(name)
+TEXT_STYLES = {
+    "row_title": (12, "bold", None, "text_primary"),
+    "row_text": (11, "normal", None, "text_primary"),
+    "row_muted": (11, "normal", None, "text_secondary"),
+    "row_link": (11, "normal", None, "accent"),
+    "row_small": (10, "normal", None, "text_primary"),
+    "row_small_muted": (10, "normal", None, "text_secondary"),
+    "row_tiny_muted": (9, "normal", None, "text_secondary"),
+    "row_tiny_link": (9, "normal", None, "accent"),
+    "row_mono": (9, "normal", FONTS["family_mono"], "text_muted"),
+}
+
+# Chiều cao control
+HEIGHTS = {
+    "input": 34,
+    "button": 34,
+    "button_sm": 26,
+    "row": 40,
+    "status_bar": 26,
+}
+
 # Window settings
 WINDOW_WIDTH = 1400
 WINDOW_HEIGHT = 850
@@ -92,3 +133,15 @@ WINDOW_HEIGHT = 850
 # Sidebar width
 SIDEBAR_WIDTH = 64  # Icon-only mode
 SIDEBAR_EXPANDED = 200  # Expanded mode
+
+# Tabs được tạo khi mở lần đầu; prewarm tạo dần các tab còn lại lúc app rảnh
+TAB_PREWARM = True
+TAB_PREWARM_DELAY_MS = 2000  # Chờ sau khi cửa sổ hiện rồi mới bắt đầu
+
+# Log panel: rút log từ buffer mỗi LOG_FLUSH_MS, giữ tối đa LOG_MAX_LINES dòng trên panel
+LOG_FLUSH_MS = 100
+LOG_BUFFER_SIZE = 20000  # Dòng chờ tối đa giữa hai lần rút (đầy thì bỏ dòng cũ nhất)
+LOG_MAX_LINES = 3000
+LOG_FILE_ENABLED = False  # Ghi thêm ra data/logs/app.log (xoay vòng)
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUPS = 3
@@ -4,13 +4,48 @@ Quản lý dữ liệu với SQLite thay vì JSON files
 """
 import sqlite3
 import os
-from datetime import datetime
-from typing import List, Dict, Optional
+import json
+import re
+import atexit
+import queue
+import threading
+import time
+import unicodedata
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
 from contextlib import contextmanager
 
-# Database path
-DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+# Database path (FBMANAGER_DATA_DIR cho phép trỏ sang thư mục khác, vd. khi benchmark)
+DATA_DIR = os.environ.get("FBMANAGER_DATA_DIR") or os.path.join(os.path.dirname(__file__), "data")
 DB_PATH = os.path.join(DATA_DIR, "fbmanager.db")
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+
+# Rows cũ hơn số ngày này được chuyển sang archive theo tháng (setting: archive_horizon_days)
+ARCHIVE_HORIZON_DAYS = 180
+# Bảng được archive -> cột thời gian
+ARCHIVE_TABLES = {
+    'post_history': 'created_at',
+    'posted_reels': 'posted_at',
+}
+
+# PRAGMA áp dụng cho mỗi kết nối mới (WAL cho phép đọc song song khi đang ghi)
+CONNECTION_PRAGMAS = {
+    # Chỉ có hiệu lực với file DB mới (đặt trước WAL và trước khi có bảng); DB cũ: enable_incremental_vacuum()
+    "auto_vacuum": "INCREMENTAL",
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",       # An toàn với WAL, ít fsync hơn FULL
+    "cache_size": -16000,          # ~16MB page cache mỗi kết nối
+    "mmap_size": 268435456,        # 256MB memory-mapped I/O
+    "temp_store": "MEMORY",
+    "busy_timeout": 10000,         # Chờ lock thay vì lỗi "database is locked"
+}
+
+# Mỗi thread giữ một kết nối sống lâu, tái sử dụng giữa các lần gọi
+_local = threading.local()
+_connections: Dict[int, tuple] = {}  # thread ident -> (thread, conn)
+_connections_lock = threading.Lock()
+_generation = 0  # Tăng mỗi khi close_all_connections() để các thread mở lại kết nối
 
 
 def ensure_data_dir():
@@ -19,253 +54,964 @@ def ensure_data_dir():
         os.makedirs(DATA_DIR)
 
 
-@contextmanager
-def get_connection():
-    """Context manager để quản lý kết nối database"""
+def _open_connection() -> sqlite3.Connection:
+    """Mở kết nối mới và áp dụng PRAGMA tối ưu"""
     ensure_data_dir()
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, timeout=30, check_same_thread=False)
     conn.row_factory = sqlite3.Row  # Trả về dict-like rows
+    for name, value in CONNECTION_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+
+def _prune_dead_connections():
+    """Đóng kết nối của các thread đã kết thúc (gọi khi đang giữ lock)"""
+    for ident, (thread, conn) in list(_connections.items()):
+        if not thread.is_alive():
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            del _connections[ident]
+
+
+def _thread_connection() -> sqlite3.Connection:
+    """Lấy kết nối của thread hiện tại, tạo mới nếu chưa có hoặc DB_PATH đã đổi"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.path == DB_PATH and _local.generation == _generation:
+        return conn
+    if conn is not None and _local.generation == _generation:
+        close_connection()
+
+    conn = _open_connection()
+    _local.conn = conn
+    _local.path = DB_PATH
+    _local.generation = _generation
+    _local.depth = 0
+    with _connections_lock:
+        _prune_dead_connections()
+        _connections[threading.get_ident()] = (threading.current_thread(), conn)
+    return conn
+
+
+@contextmanager
+def get_connection():
+    """
+    Context manager để quản lý kết nối database.
+
+    Dùng lại kết nối của thread hiện tại. Có thể lồng nhau: khối ngoài cùng
+    commit/rollback transaction, khối lồng bên trong chạy trong SAVEPOINT -
+    lỗi trong khối lồng chỉ hoàn tác phần ghi của khối đó, kể cả khi
+    caller bắt lỗi rồi để khối ngoài commit tiếp.
+    """
+    conn = _thread_connection()
+    _local.depth += 1
+    savepoint = None
     try:
+        if _local.depth > 1:
+            # SAVEPOINT ngoài transaction sẽ tự commit khi RELEASE: mở transaction trước
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            savepoint = f"nested_{_local.depth}"
+            conn.execute(f"SAVEPOINT {savepoint}")
         yield conn
-        conn.commit()
+        if savepoint is None:
+            conn.commit()
+        elif conn.in_transaction:
+            conn.execute(f"RELEASE {savepoint}")
     except Exception as e:
-        conn.rollback()
+        if savepoint is None:
+            conn.rollback()
+        elif conn.in_transaction:
+            conn.execute(f"ROLLBACK TO {savepoint}")
+            conn.execute(f"RELEASE {savepoint}")
         raise e
     finally:
+        _local.depth -= 1
+
+
+def close_connection():
+    """Đóng kết nối của thread hiện tại"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        return
+    _local.conn = None
+    _local.depth = 0
+    with _connections_lock:
+        _connections.pop(threading.get_ident(), None)
+    try:
         conn.close()
+    except sqlite3.Error:
+        pass
+
+
+def close_all_connections():
+    """Đóng toàn bộ kết nối (gọi khi thoát ứng dụng)"""
+    global _generation
+    with _connections_lock:
+        items = list(_connections.values())
+        _connections.clear()
+        _generation += 1
+    for _, conn in items:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    _local.conn = None
 
 
-def init_database():
-    """Khởi tạo database và tạo các bảng"""
-    with get_connection() as conn:
-        cursor = conn.cursor()
+atexit.register(close_all_connections)
 
-        # ============ CATEGORIES TABLE ============
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS categories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL UNIQUE,
-                description TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
 
-        # ============ CONTENTS TABLE ============
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS contents (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                category_id INTEGER NOT NULL,
-                title TEXT NOT NULL,
-                content TEXT,
-                image_path TEXT,
-                stickers TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE CASCADE
-            )
-        """)
+class WriteBehindJournal:
+    """
+    Ghi trễ (write-behind) cho các INSERT tần suất cao từ worker threads.
 
-        # ============ PROFILES TABLE ============
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS profiles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                uuid TEXT UNIQUE,
-                name TEXT,
-                browser TEXT,
-                os TEXT,
-                status TEXT DEFAULT 'stopped',
-                proxy TEXT,
-                note TEXT,
-                tags TEXT,
-                local_notes TEXT,
-                fb_uid TEXT,
-                fb_name TEXT,
-                check_open INTEGER DEFAULT 0,
-                last_sync TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+    Worker chỉ đẩy (sql, params) vào hàng đợi có giới hạn; một thread nền
+    gom thành lô theo kích thước hoặc thời gian và ghi trong một transaction.
+    """
 
-        # ============ SCRIPTS TABLE ============
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS scripts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                description TEXT,
-                type TEXT DEFAULT 'python',
-                content TEXT,
-                hidemium_key TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+    def __init__(self, max_queue: int = 10000, batch_size: int = 200, flush_interval: float = 0.5):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """Số thao tác đã nhận nhưng chưa ghi xuống DB"""
+        return self._pending
+
+    def submit(self, sql: str, params: tuple):
+        """Đưa một thao tác ghi vào hàng đợi (chờ nếu hàng đợi đầy)"""
+        if self._closed:
+            # Đã shutdown -> ghi trực tiếp
+            with get_connection() as conn:
+                conn.execute(sql, params)
+            return
+        self._ensure_started()
+        with self._lock:
+            self._pending += 1
+        self._queue.put(('write', sql, params))
+
+    def flush(self, timeout: float = None) -> bool:
+        """Barrier: chờ mọi thao tác đã submit trước đó được ghi xong"""
+        if self._pending == 0 or self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(('flush', done, None))
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10):
+        """Ghi nốt hàng đợi và dừng thread nền"""
+        self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(('stop', None, None))
+            self._thread.join(timeout)
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="db-journal", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            kind, payload, params = self._queue.get()
+            batch = []
+            waiters = []
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+
+            # Gom lô: dừng khi đủ batch_size, hết flush_interval, hoặc gặp barrier/stop
+            while True:
+                if kind == 'write':
+                    batch.append((payload, params))
+                elif kind == 'flush':
+                    waiters.append(payload)
+                    break
+                else:
+                    stop = True
+                    break
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    kind, payload, params = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write_batch(batch)
+            for event in waiters:
+                event.set()
+            if stop:
+                # Ghi nốt những gì còn lại trước khi thoát
+                rest = []
+                while True:
+                    try:
+                        kind, payload, params = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if kind == 'write':
+                        rest.append((payload, params))
+                    elif kind == 'flush':
+                        waiters.append(payload)
+                if rest:
+                    self._write_batch(rest)
+                for event in waiters:
+                    event.set()
+                close_connection()
+                return
+
+    def _write_batch(self, batch: List[tuple]):
+        """Ghi một lô trong một transaction, gộp các câu lệnh giống nhau thành executemany"""
+        try:
+            with get_connection() as conn:
+                start = 0
+                while start < len(batch):
+                    sql = batch[start][0]
+                    end = start
+                    while end < len(batch) and batch[end][0] == sql:
+                        end += 1
+                    conn.executemany(sql, [params for _, params in batch[start:end]])
+                    start = end
+        except Exception as e:
+            # Lô lỗi -> ghi từng dòng để không mất các dòng hợp lệ
+            print(f"[DB] Journal batch failed ({len(batch)} rows): {e}")
+            for sql, params in batch:
+                try:
+                    with get_connection() as conn:
+                        conn.execute(sql, params)
+                except Exception as row_error:
+                    print(f"[DB] ERROR journal write dropped: {row_error}")
+        finally:
+            with self._lock:
+                self._pending -= len(batch)
 
-        # ============ POSTS TABLE ============
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS posts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                url TEXT NOT NULL,
-                title TEXT,
-                target_likes INTEGER DEFAULT 0,
-                target_comments INTEGER DEFAULT 0,
-                like_count INTEGER DEFAULT 0,
-                comment_count INTEGER DEFAULT 0,
-                status TEXT DEFAULT 'pending',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
 
-        # ============ SETTINGS TABLE ============
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS settings (
-                key TEXT PRIMARY KEY,
-                value TEXT,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+_journal = WriteBehindJournal()
+atexit.register(_journal.close)
 
-        # ============ PAGES TABLE ============
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS pages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                profile_uuid TEXT NOT NULL,
-                page_id TEXT NOT NULL,
-                page_name TEXT,
-                page_url TEXT,
-                category TEXT,
-                follower_count INTEGER DEFAULT 0,
-                role TEXT DEFAULT 'admin',
-                note TEXT,
-                is_selected INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(profile_uuid, page_id)
-            )
-        """)
 
-        # ============ GROUPS TABLE ============
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS groups (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                profile_uuid TEXT NOT NULL,
-                group_id TEXT NOT NULL,
-                group_name TEXT,
-                group_url TEXT,
-                member_count INTEGER DEFAULT 0,
-                is_selected INTEGER DEFAULT 0,
-                last_post_at TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(profile_uuid, group_id)
-            )
-        """)
+def flush_writes(timeout: float = None) -> bool:
+    """Chờ các ghi trễ (save_*(..., defer=True)) được ghi xuống DB"""
+    return _journal.flush(timeout)
 
-        # ============ POST HISTORY TABLE ============
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS post_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                profile_uuid TEXT NOT NULL,
-                group_id TEXT,
-                content_id INTEGER,
-                post_url TEXT,
-                status TEXT DEFAULT 'pending',
-                error_message TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
 
-        # ============ SCHEDULES TABLE ============
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS schedules (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                folder_id TEXT,
-                folder_name TEXT,
-                time_slots TEXT,
-                content_category_id INTEGER,
-                image_folder TEXT,
-                group_ids TEXT,
-                delay_min INTEGER DEFAULT 30,
-                delay_max INTEGER DEFAULT 60,
-                is_active INTEGER DEFAULT 1,
-                post_count INTEGER DEFAULT 0,
-                success_count INTEGER DEFAULT 0,
-                error_count INTEGER DEFAULT 0,
-                last_run_at TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+READ_FLUSH_TIMEOUT = 2.0  # Giây tối đa một lần đọc/xóa chờ journal
+
+
+def _flush_pending_writes() -> bool:
+    """
+    Barrier trước khi đọc/xóa bảng có ghi trễ, chờ tối đa READ_FLUSH_TIMEOUT.
+
+    Bỏ qua khi thread đang giữ transaction ghi: journal thread cần chính write lock
+    đó, chờ ở đây sẽ treo cả hai. Trả False nếu không flush được (đọc có thể thiếu ghi mới nhất).
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None and conn.in_transaction:
+        return False
+    return _journal.flush(READ_FLUSH_TIMEOUT)
+
+
+class SelectionStore:
+    """
+    Trạng thái chọn (is_selected) của groups/pages giữ trong bộ nhớ.
+
+    UI đổi trạng thái tức thì; các thay đổi được gom lại và ghi bằng một
+    transaction sau `flush_delay` giây không có thao tác mới, hoặc khi flush().
+    """
+
+    def __init__(self, table: str, flush_delay: float = 1.0):
+        self.table = table
+        self.flush_delay = flush_delay
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()  # Giữ thứ tự ghi giữa các lần flush
+        self._selected = set()
+        self._owner: Dict[int, str] = {}  # id -> profile_uuid
+        self._loaded = set()  # Profiles đã biết đầy đủ trạng thái
+        self._pending: Dict[int, int] = {}  # id -> 0/1 chưa ghi
+        self._timer = None
+
+    def prime(self, rows: List[Dict]):
+        """Nạp trạng thái từ rows vừa đọc (id, profile_uuid, is_selected), không query thêm"""
+        with self._lock:
+            for row in rows:
+                item_id = row['id']
+                self._owner[item_id] = row.get('profile_uuid')
+                self._loaded.add(row.get('profile_uuid'))
+                if item_id in self._pending:
+                    continue  # Thay đổi chưa ghi mới hơn dữ liệu vừa đọc
+                if row.get('is_selected'):
+                    self._selected.add(item_id)
+                else:
+                    self._selected.discard(item_id)
+
+    def set(self, item_id: int, selected: bool):
+        """Chọn/bỏ chọn một item"""
+        self.set_many([item_id], selected)
+
+    def set_many(self, item_ids: List[int], selected: bool):
+        """Chọn/bỏ chọn nhiều items (vd. "chọn tất cả") - một lần ghi"""
+        value = 1 if selected else 0
+        with self._lock:
+            for item_id in item_ids:
+                self._pending[item_id] = value
+                if value:
+                    self._selected.add(item_id)
+                else:
+                    self._selected.discard(item_id)
+            self._schedule_flush()
+
+    def is_selected(self, item_id: int) -> bool:
+        """Item có đang được chọn không"""
+        with self._lock:
+            return item_id in self._selected
+
+    def selected_ids(self, profile_uuid: str = None) -> List[int]:
+        """
+        IDs đang được chọn, không query nếu profile đã được nạp.
+
+        Args:
+            profile_uuid: Chỉ lấy của profile này (None = mọi item đã nạp)
+        """
+        with self._lock:
+            unresolved = any(item_id not in self._owner for item_id in self._pending)
+        if unresolved:
+            self.flush()  # Xác định profile của các item chưa biết
+        if profile_uuid is not None and profile_uuid not in self._loaded:
+            self._load(profile_uuid)
+
+        with self._lock:
+            if profile_uuid is None:
+                return sorted(self._selected)
+            return sorted(i for i in self._selected if self._owner.get(i) == profile_uuid)
+
+    def discard(self, item_ids: List[int]):
+        """Bỏ các items đã bị xóa khỏi DB"""
+        with self._lock:
+            for item_id in item_ids:
+                self._selected.discard(item_id)
+                self._owner.pop(item_id, None)
+                self._pending.pop(item_id, None)
+
+    def discard_profile(self, profile_uuid: str):
+        """Bỏ mọi items của profile (sau clear_*)"""
+        with self._lock:
+            self.discard([i for i, owner in self._owner.items() if owner == profile_uuid])
+            self._loaded.discard(profile_uuid)
+
+    def flush(self) -> int:
+        """Ghi các thay đổi đang chờ, trả về số items đã ghi"""
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            now = datetime.now().isoformat()
+            try:
+                with get_connection() as conn:
+                    conn.executemany(
+                        f"UPDATE {self.table} SET is_selected = ?, updated_at = ? WHERE id = ?",
+                        [(value, now, item_id) for item_id, value in pending.items()]
+                    )
+                    unknown = [item_id for item_id in pending if item_id not in self._owner]
+                    owners = []
+                    for start in range(0, len(unknown), IN_LIST_CHUNK):
+                        chunk = unknown[start:start + IN_LIST_CHUNK]
+                        placeholders = ','.join('?' * len(chunk))
+                        owners.extend(conn.execute(
+                            f"SELECT id, profile_uuid FROM {self.table} WHERE id IN ({placeholders})", chunk
+                        ).fetchall())
+            except Exception:
+                with self._lock:
+                    for item_id, value in pending.items():
+                        self._pending.setdefault(item_id, value)  # Không đè thay đổi mới hơn
+                raise
+
+            with self._lock:
+                for row in owners:
+                    self._owner[row['id']] = row['profile_uuid']
+            return len(pending)
+
+    def _schedule_flush(self):
+        """Debounce: hẹn flush sau flush_delay giây kể từ thao tác cuối"""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.flush_delay, self._flush_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"[DB] Selection flush error ({self.table}): {e}")
+        finally:
+            close_connection()
+
+    def _load(self, profile_uuid: str):
+        """Đọc trạng thái chọn của một profile từ DB"""
+        with get_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT id, profile_uuid, is_selected FROM {self.table} WHERE profile_uuid = ?",
+                (profile_uuid,)
             )
+            rows = rows_to_list(cursor.fetchall())
+        self.prime(rows)
+        with self._lock:
+            self._loaded.add(profile_uuid)
+
+
+group_selection = SelectionStore('groups')
+page_selection = SelectionStore('pages')
+
+
+def flush_selections():
+    """Ghi ngay trạng thái chọn đang chờ (gọi khi chuyển tab / thoát app)"""
+    group_selection.flush()
+    page_selection.flush()
+
+
+atexit.register(flush_selections)
+
+
+def _migration_001_baseline(cursor):
+    """Schema gốc (an toàn với DB cũ chưa có user_version nhờ IF NOT EXISTS)"""
+    # ============ CATEGORIES TABLE ============
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            description TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # ============ CONTENTS TABLE ============
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS contents (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            category_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            content TEXT,
+            image_path TEXT,
+            stickers TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE CASCADE
+        )
+    """)
+
+    # ============ PROFILES TABLE ============
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS profiles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            uuid TEXT UNIQUE,
+            name TEXT,
+            browser TEXT,
+            os TEXT,
+            status TEXT DEFAULT 'stopped',
+            proxy TEXT,
+            note TEXT,
+            tags TEXT,
+            local_notes TEXT,
+            fb_uid TEXT,
+            fb_name TEXT,
+            check_open INTEGER DEFAULT 0,
+            last_sync TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # ============ SCRIPTS TABLE ============
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scripts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            description TEXT,
+            type TEXT DEFAULT 'python',
+            content TEXT,
+            hidemium_key TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # ============ POSTS TABLE ============
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL,
+            title TEXT,
+            target_likes INTEGER DEFAULT 0,
+            target_comments INTEGER DEFAULT 0,
+            like_count INTEGER DEFAULT 0,
+            comment_count INTEGER DEFAULT 0,
+            status TEXT DEFAULT 'pending',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # ============ SETTINGS TABLE ============
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS settings (
+            key TEXT PRIMARY KEY,
+            value TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # ============ PAGES TABLE ============
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS pages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            profile_uuid TEXT NOT NULL,
+            page_id TEXT NOT NULL,
+            page_name TEXT,
+            page_url TEXT,
+            category TEXT,
+            follower_count INTEGER DEFAULT 0,
+            role TEXT DEFAULT 'admin',
+            note TEXT,
+            is_selected INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(profile_uuid, page_id)
+        )
+    """)
+
+    # ============ GROUPS TABLE ============
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS groups (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            profile_uuid TEXT NOT NULL,
+            group_id TEXT NOT NULL,
+            group_name TEXT,
+            group_url TEXT,
+            member_count INTEGER DEFAULT 0,
+            is_selected INTEGER DEFAULT 0,
+            last_post_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(profile_uuid, group_id)
+        )
+    """)
+
+    # ============ POST HISTORY TABLE ============
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS post_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            profile_uuid TEXT NOT NULL,
+            group_id TEXT,
+            content_id INTEGER,
+            post_url TEXT,
+            status TEXT DEFAULT 'pending',
+            error_message TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # ============ SCHEDULES TABLE ============
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schedules (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            folder_id TEXT,
+            folder_name TEXT,
+            time_slots TEXT,
+            content_category_id INTEGER,
+            image_folder TEXT,
+            group_ids TEXT,
+            delay_min INTEGER DEFAULT 30,
+            delay_max INTEGER DEFAULT 60,
+            is_active INTEGER DEFAULT 1,
+            post_count INTEGER DEFAULT 0,
+            success_count INTEGER DEFAULT 0,
+            error_count INTEGER DEFAULT 0,
+            last_run_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # ============ REEL SCHEDULES TABLE ============
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS reel_schedules (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            profile_uuid TEXT NOT NULL,
+            page_id INTEGER,
+            page_name TEXT,
+            video_path TEXT NOT NULL,
+            cover_path TEXT,
+            caption TEXT,
+            hashtags TEXT,
+            scheduled_time TIMESTAMP NOT NULL,
+            delay_min INTEGER DEFAULT 30,
+            delay_max INTEGER DEFAULT 60,
+            status TEXT DEFAULT 'pending',
+            reel_url TEXT,
+            error_message TEXT,
+            executed_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Tạo category mặc định nếu chưa có
+    cursor.execute("SELECT COUNT(*) FROM categories")
+    if cursor.fetchone()[0] == 0:
+        cursor.execute(
+            "INSERT INTO categories (name, description) VALUES (?, ?)",
+            ("Mặc định", "Category mặc định")
+        )
+
+    # Tạo indexes để tăng tốc query
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_contents_category ON contents(category_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_profiles_uuid ON profiles(uuid)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_scripts_type ON scripts(type)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_pages_profile ON pages(profile_uuid)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_groups_profile ON groups(profile_uuid)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_history_profile ON post_history(profile_uuid)")
+    # Performance indexes for post_history filtering
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_history_created ON post_history(created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_history_status ON post_history(status)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_history_profile_date ON post_history(profile_uuid, created_at DESC)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_history_composite ON post_history(profile_uuid, status, created_at DESC)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reel_schedules_profile ON reel_schedules(profile_uuid)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reel_schedules_status ON reel_schedules(status)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reel_schedules_time ON reel_schedules(scheduled_time)")
+
+    # ============ POSTED REELS TABLE (Lịch sử đăng Reels) ============
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS posted_reels (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            profile_uuid TEXT NOT NULL,
+            page_id TEXT,
+            page_name TEXT,
+            reel_url TEXT,
+            caption TEXT,
+            hashtags TEXT,
+            video_path TEXT,
+            status TEXT DEFAULT 'success',
+            error_message TEXT,
+            posted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_posted_reels_profile ON posted_reels(profile_uuid)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_posted_reels_page ON posted_reels(page_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_posted_reels_date ON posted_reels(posted_at DESC)")
+
+
+def _migration_002_seek_indexes(cursor):
+    """Seek indexes: (created_at, id) DESC khớp ORDER BY của keyset pagination, không cần sort tạm"""
+    cursor.execute("DROP INDEX IF EXISTS idx_post_history_profile_date")
+    cursor.execute("DROP INDEX IF EXISTS idx_post_history_composite")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_history_profile_seek ON post_history(profile_uuid, created_at DESC, id DESC)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_history_status_seek ON post_history(profile_uuid, status, created_at DESC, id DESC)")
+
+
+def _migration_005_sorted_profile_indexes(cursor):
+    """
+    Index (profile_uuid, name) phục vụ cả filter lẫn ORDER BY của
+    get_groups/get_pages; bỏ index đơn cột và index trùng UNIQUE(uuid)
+    """
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_groups_profile_name ON groups(profile_uuid, group_name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_pages_profile_name ON pages(profile_uuid, page_name)")
+    cursor.execute("DROP INDEX IF EXISTS idx_groups_profile")
+    cursor.execute("DROP INDEX IF EXISTS idx_pages_profile")
+    cursor.execute("DROP INDEX IF EXISTS idx_profiles_uuid")
+
+
+def _migration_006_archive_catalog(cursor):
+    """Danh mục các file archive theo tháng (đường dẫn tương đối với ARCHIVE_DIR)"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS archive_months (
+            table_name TEXT NOT NULL,
+            month TEXT NOT NULL,
+            filename TEXT NOT NULL,
+            row_count INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (table_name, month)
+        )
+    """)
+
+
+def _create_stats_schema(cursor):
+    """
+    Tạo bảng thống kê + triggers giữ counter luôn khớp với dữ liệu gốc.
+
+    Nhờ đó các hàm đếm đọc O(1) thay vì COUNT(*) trên bảng lớn.
+    """
+    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'profile_stats'")
+    needs_backfill = cursor.fetchone()[0] == 0
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS profile_stats (
+            profile_uuid TEXT PRIMARY KEY,
+            pages_count INTEGER NOT NULL DEFAULT 0,
+            groups_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    # post_count: mọi bài; url_count: bài có post_url (khớp filter của get_post_history_count)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS post_history_daily (
+            profile_uuid TEXT NOT NULL,
+            status TEXT NOT NULL,
+            day TEXT NOT NULL,
+            post_count INTEGER NOT NULL DEFAULT 0,
+            url_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (profile_uuid, status, day)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS posted_reels_stats (
+            profile_uuid TEXT NOT NULL,
+            page_id TEXT NOT NULL,
+            reel_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (profile_uuid, page_id)
+        )
+    """)
+
+    # pages / groups -> profile_stats
+    for table, column in (('pages', 'pages_count'), ('groups', 'groups_count')):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_stats_insert AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO profile_stats (profile_uuid, {column}) VALUES (NEW.profile_uuid, 1)
+                ON CONFLICT(profile_uuid) DO UPDATE SET {column} = {column} + 1;
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_stats_delete AFTER DELETE ON {table}
+            BEGIN
+                UPDATE profile_stats SET {column} = {column} - 1 WHERE profile_uuid = OLD.profile_uuid;
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_stats_move AFTER UPDATE OF profile_uuid ON {table}
+            WHEN OLD.profile_uuid IS NOT NEW.profile_uuid
+            BEGIN
+                UPDATE profile_stats SET {column} = {column} - 1 WHERE profile_uuid = OLD.profile_uuid;
+                INSERT INTO profile_stats (profile_uuid, {column}) VALUES (NEW.profile_uuid, 1)
+                ON CONFLICT(profile_uuid) DO UPDATE SET {column} = {column} + 1;
+            END
         """)
 
-        # ============ REEL SCHEDULES TABLE ============
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS reel_schedules (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                profile_uuid TEXT NOT NULL,
-                page_id INTEGER,
-                page_name TEXT,
-                video_path TEXT NOT NULL,
-                cover_path TEXT,
-                caption TEXT,
-                hashtags TEXT,
-                scheduled_time TIMESTAMP NOT NULL,
-                delay_min INTEGER DEFAULT 30,
-                delay_max INTEGER DEFAULT 60,
-                status TEXT DEFAULT 'pending',
-                reel_url TEXT,
-                error_message TEXT,
-                executed_at TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
+    # post_history -> post_history_daily
+    add_new = """
+        INSERT INTO post_history_daily (profile_uuid, status, day, post_count, url_count)
+        VALUES (NEW.profile_uuid, COALESCE(NEW.status, ''), substr(NEW.created_at, 1, 10), 1,
+                COALESCE(NEW.post_url, '') != '')
+        ON CONFLICT(profile_uuid, status, day) DO UPDATE SET
+            post_count = post_count + 1,
+            url_count = url_count + excluded.url_count;
+    """
+    remove_old = """
+        UPDATE post_history_daily SET
+            post_count = post_count - 1,
+            url_count = url_count - (COALESCE(OLD.post_url, '') != '')
+        WHERE profile_uuid = OLD.profile_uuid AND status = COALESCE(OLD.status, '')
+            AND day = substr(OLD.created_at, 1, 10);
+    """
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_post_history_stats_insert AFTER INSERT ON post_history
+        BEGIN {add_new} END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_post_history_stats_delete AFTER DELETE ON post_history
+        BEGIN {remove_old} END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_post_history_stats_update
+        AFTER UPDATE OF profile_uuid, status, post_url, created_at ON post_history
+        BEGIN {remove_old} {add_new} END
+    """)
+
+    # posted_reels -> posted_reels_stats
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_posted_reels_stats_insert AFTER INSERT ON posted_reels
+        BEGIN
+            INSERT INTO posted_reels_stats (profile_uuid, page_id, reel_count)
+            VALUES (NEW.profile_uuid, COALESCE(NEW.page_id, ''), 1)
+            ON CONFLICT(profile_uuid, page_id) DO UPDATE SET reel_count = reel_count + 1;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_posted_reels_stats_delete AFTER DELETE ON posted_reels
+        BEGIN
+            UPDATE posted_reels_stats SET reel_count = reel_count - 1
+            WHERE profile_uuid = OLD.profile_uuid AND page_id = COALESCE(OLD.page_id, '');
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_posted_reels_stats_move
+        AFTER UPDATE OF profile_uuid, page_id ON posted_reels
+        BEGIN
+            UPDATE posted_reels_stats SET reel_count = reel_count - 1
+            WHERE profile_uuid = OLD.profile_uuid AND page_id = COALESCE(OLD.page_id, '');
+            INSERT INTO posted_reels_stats (profile_uuid, page_id, reel_count)
+            VALUES (NEW.profile_uuid, COALESCE(NEW.page_id, ''), 1)
+            ON CONFLICT(profile_uuid, page_id) DO UPDATE SET reel_count = reel_count + 1;
+        END
+    """)
+
+    if needs_backfill:
+        _rebuild_stats(cursor)
+
+
+# Bảng FTS5 cho từng bảng nguồn: bảng gốc -> (bảng fts, các cột được index)
+SEARCH_INDEXES = {
+    'contents': ('contents_fts', ('title', 'content')),
+    'groups': ('groups_fts', ('group_name',)),
+    'pages': ('pages_fts', ('page_name',)),
+}
+
+# unicode61 + remove_diacritics 2 bỏ dấu tiếng Việt (kể cả dấu chồng như "ệ"),
+# riêng đ/Đ không phải ký tự tổ hợp nên được thay bằng d trong trigger
+FTS_TOKENIZER = "unicode61 remove_diacritics 2"
+FTS_AVAILABLE = True
+
+
+def _fold_sql(expr: str) -> str:
+    """Biểu thức SQL đổi đ/Đ -> d/D trước khi đưa vào FTS"""
+    return f"replace(replace(COALESCE({expr}, ''), 'đ', 'd'), 'Đ', 'D')"
+
+
+def _create_search_schema(cursor):
+    """Tạo bảng FTS5 + triggers đồng bộ cho contents/groups/pages"""
+    global FTS_AVAILABLE
+    for table, (fts_table, columns) in SEARCH_INDEXES.items():
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = ?", (fts_table,))
+        needs_backfill = cursor.fetchone()[0] == 0
+        try:
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table}
+                USING fts5({', '.join(columns)}, tokenize = '{FTS_TOKENIZER}')
+            """)
+        except sqlite3.OperationalError as e:
+            # SQLite build không có FTS5 -> search_* dùng fallback trong Python
+            print(f"[DB] FTS5 unavailable, using fallback search: {e}")
+            FTS_AVAILABLE = False
+            return
+
+        col_list = ', '.join(columns)
+        new_values = ', '.join(_fold_sql(f"NEW.{col}") for col in columns)
+        assignments = ', '.join(f"{col} = {_fold_sql(f'NEW.{col}')}" for col in columns)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{fts_table}_insert AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO {fts_table} (rowid, {col_list}) VALUES (NEW.id, {new_values});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{fts_table}_delete AFTER DELETE ON {table}
+            BEGIN
+                DELETE FROM {fts_table} WHERE rowid = OLD.id;
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{fts_table}_update AFTER UPDATE OF {col_list} ON {table}
+            BEGIN
+                UPDATE {fts_table} SET {assignments} WHERE rowid = NEW.id;
+            END
         """)
 
-        # Tạo category mặc định nếu chưa có
-        cursor.execute("SELECT COUNT(*) FROM categories")
-        if cursor.fetchone()[0] == 0:
-            cursor.execute(
-                "INSERT INTO categories (name, description) VALUES (?, ?)",
-                ("Mặc định", "Category mặc định")
-            )
+        if needs_backfill:
+            select_values = ', '.join(_fold_sql(col) for col in columns)
+            cursor.execute(f"""
+                INSERT INTO {fts_table} (rowid, {col_list})
+                SELECT id, {select_values} FROM {table}
+            """)
+
+
+def _rebuild_stats(cursor):
+    """Tính lại toàn bộ bảng thống kê từ dữ liệu gốc"""
+    cursor.execute("DELETE FROM profile_stats")
+    cursor.execute("DELETE FROM post_history_daily")
+    cursor.execute("DELETE FROM posted_reels_stats")
+    cursor.execute("""
+        INSERT INTO profile_stats (profile_uuid, pages_count, groups_count)
+        SELECT profile_uuid, SUM(is_page), SUM(1 - is_page) FROM (
+            SELECT profile_uuid, 1 AS is_page FROM pages
+            UNION ALL
+            SELECT profile_uuid, 0 AS is_page FROM groups
+        ) GROUP BY profile_uuid
+    """)
+    cursor.execute("""
+        INSERT INTO post_history_daily (profile_uuid, status, day, post_count, url_count)
+        SELECT profile_uuid, COALESCE(status, ''), substr(created_at, 1, 10), COUNT(*),
+               SUM(COALESCE(post_url, '') != '')
+        FROM post_history
+        GROUP BY 1, 2, 3
+    """)
+    cursor.execute("""
+        INSERT INTO posted_reels_stats (profile_uuid, page_id, reel_count)
+        SELECT profile_uuid, COALESCE(page_id, ''), COUNT(*)
+        FROM posted_reels
+        GROUP BY 1, 2
+    """)
+
+
+# Migrations theo thứ tự: (version, mô tả, hàm). Chỉ thêm mới ở cuối, không sửa migration cũ.
+MIGRATIONS = [
+    (1, "baseline schema", _migration_001_baseline),
+    (2, "post_history seek indexes", _migration_002_seek_indexes),
+    (3, "trigger-maintained stats tables", _create_stats_schema),
+    (4, "FTS5 search indexes", _create_search_schema),
+    (5, "sorted per-profile indexes", _migration_005_sorted_profile_indexes),
+    (6, "archive catalog", _migration_006_archive_catalog),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version() -> int:
+    """Version schema đã cài (PRAGMA user_version)"""
+    with get_connection() as conn:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
 
-        # Tạo indexes để tăng tốc query
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_contents_category ON contents(category_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_profiles_uuid ON profiles(uuid)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_scripts_type ON scripts(type)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_pages_profile ON pages(profile_uuid)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_groups_profile ON groups(profile_uuid)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_history_profile ON post_history(profile_uuid)")
-        # Performance indexes for post_history filtering
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_history_created ON post_history(created_at)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_history_status ON post_history(status)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_history_profile_date ON post_history(profile_uuid, created_at DESC)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_post_history_composite ON post_history(profile_uuid, status, created_at DESC)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_reel_schedules_profile ON reel_schedules(profile_uuid)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_reel_schedules_status ON reel_schedules(status)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_reel_schedules_time ON reel_schedules(scheduled_time)")
-
-        # ============ POSTED REELS TABLE (Lịch sử đăng Reels) ============
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS posted_reels (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                profile_uuid TEXT NOT NULL,
-                page_id TEXT,
-                page_name TEXT,
-                reel_url TEXT,
-                caption TEXT,
-                hashtags TEXT,
-                video_path TEXT,
-                status TEXT DEFAULT 'success',
-                error_message TEXT,
-                posted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_posted_reels_profile ON posted_reels(profile_uuid)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_posted_reels_page ON posted_reels(page_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_posted_reels_date ON posted_reels(posted_at DESC)")
+
+def init_database():
+    """
+    Khởi tạo/nâng cấp database theo PRAGMA user_version.
+
+    DB đã mới nhất chỉ tốn một lần đọc pragma. Mỗi migration chạy trong
+    transaction riêng và cập nhật user_version cùng transaction đó.
+    """
+    if get_schema_version() >= SCHEMA_VERSION:
+        return
+
+    with get_connection() as conn:
+        conn.commit()
+        for version, description, migrate in MIGRATIONS:
+            # BEGIN IMMEDIATE giữ write lock -> process khác không chạy trùng migration
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                    conn.rollback()
+                    continue
+                migrate(conn.cursor())
+                conn.execute(f"PRAGMA user_version = {version}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            print(f"[DB] Applied migration {version}: {description}")
 
 
 def row_to_dict(row) -> Dict:
@@ -280,6 +1026,151 @@ def rows_to_list(rows) -> List[Dict]:
     return [dict(row) for row in rows]
 
 
+# Số UUID mỗi lô khi SQLite không có json_each (giữ dưới giới hạn biến 999 của bản cũ)
+IN_LIST_CHUNK = 500
+
+
+def _rows_by_profile(table: str, order_column: str, profile_uuids: List[str]) -> Dict[str, List[Dict]]:
+    """
+    Lấy rows của nhiều profiles, nhóm sẵn theo profile (giữ thứ tự profile_uuids).
+
+    Cả danh sách UUID được bind thành một tham số JSON và lọc qua json_each, nên
+    không vướng giới hạn biến của SQLite và vẫn seek theo index (profile_uuid, name).
+    """
+    grouped = {uuid: [] for uuid in profile_uuids}
+    if not grouped:
+        return grouped
+    (group_selection if table == 'groups' else page_selection).flush()
+
+    order_by = f"ORDER BY profile_uuid, {order_column}"
+    with get_connection() as conn:
+        try:
+            rows = conn.execute(
+                f"SELECT * FROM {table} WHERE profile_uuid IN (SELECT value FROM json_each(?)) {order_by}",
+                (json.dumps(list(grouped)),)
+            ).fetchall()
+        except sqlite3.OperationalError:
+            # SQLite không có JSON1: chia IN-list thành từng lô
+            uuids = list(grouped)
+            rows = []
+            for start in range(0, len(uuids), IN_LIST_CHUNK):
+                chunk = uuids[start:start + IN_LIST_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows.extend(conn.execute(
+                    f"SELECT * FROM {table} WHERE profile_uuid IN ({placeholders}) {order_by}", chunk
+                ).fetchall())
+
+    for row in rows:
+        grouped[row['profile_uuid']].append(dict(row))
+    return grouped
+
+
+def _fetch_existing(conn, table: str, key_columns: tuple, columns: tuple,
+                    scope: Dict = None, keys: List = None) -> Dict[tuple, Dict]:
+    """
+    Đọc các rows hiện có, trả về map key -> row.
+
+    `keys` (chỉ với khóa một cột) giới hạn việc đọc vào các khóa cần so sánh,
+    tránh quét cả bảng khi sync theo từng trang nhỏ.
+    """
+    select_cols = ', '.join(('id',) + key_columns + columns)
+    query = f"SELECT {select_cols} FROM {table}"
+    params = []
+    if scope:
+        query += " WHERE " + " AND ".join(f"{col} = ?" for col in scope)
+        params = list(scope.values())
+
+    if keys is None:
+        rows = conn.execute(query, params).fetchall()
+    else:
+        rows = []
+        keys = list(keys)
+        for start in range(0, len(keys), IN_LIST_CHUNK):
+            chunk = keys[start:start + IN_LIST_CHUNK]
+            condition = f"{key_columns[0]} IN ({','.join('?' * len(chunk))})"
+            rows.extend(conn.execute(
+                f"{query} {'AND' if scope else 'WHERE'} {condition}", params + chunk
+            ).fetchall())
+    return {tuple(row[col] for col in key_columns): dict(row) for row in rows}
+
+
+def _bulk_upsert(conn, table: str, key_columns: tuple, columns: Dict, rows: List[Dict],
+                 existing: Dict[tuple, Dict], insert_only: Dict = None,
+                 extra_values: Dict = None, touch_values: Dict = None,
+                 prune_scope: Dict = None) -> Dict[str, int]:
+    """
+    Upsert nhiều rows trong transaction hiện tại.
+
+    Args:
+        columns: {cột: giá trị mặc định} được so sánh và cập nhật.
+            Cột không có trong row giữ nguyên giá trị hiện có.
+        existing: Kết quả _fetch_existing() để diff
+        insert_only: {cột: mặc định} chỉ ghi khi INSERT (dữ liệu local)
+        extra_values: {cột: giá trị} ghi cho mọi row thay đổi (updated_at, ...)
+        touch_values: {cột: giá trị} ghi cho mọi row trong input, kể cả row không đổi (last_sync)
+        prune_scope: Nếu có, xóa các rows trong scope không còn trong input
+
+    Returns:
+        Dict: {'inserted', 'updated', 'unchanged', 'deleted'}
+    """
+    insert_only = insert_only or {}
+    touch_values = touch_values or {}
+    extra_values = {**(extra_values or {}), **touch_values}
+    summary = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0}
+
+    # Gộp trùng key - row sau ghi đè row trước
+    incoming = {}
+    for row in rows:
+        incoming[tuple(row.get(col) for col in key_columns)] = row
+
+    update_cols = tuple(columns) + tuple(extra_values)
+    all_cols = key_columns + update_cols + tuple(insert_only) + ('created_at',)
+    params = []
+    unchanged = []
+    for key, row in incoming.items():
+        current = existing.get(key)
+        if current is None:
+            values = [row.get(col, default) for col, default in columns.items()]
+            values += list(extra_values.values())
+            values += [row.get(col, default) for col, default in insert_only.items()]
+            params.append(list(key) + values + [extra_values.get('updated_at')])
+            summary['inserted'] += 1
+            continue
+
+        values = [row.get(col, current[col]) for col in columns]
+        if all(value == current[col] for value, col in zip(values, columns)):
+            summary['unchanged'] += 1
+            unchanged.append(list(touch_values.values()) + list(key))
+            continue
+        values += list(extra_values.values())
+        values += [current.get(col, default) for col, default in insert_only.items()]
+        params.append(list(key) + values + [extra_values.get('updated_at')])
+        summary['updated'] += 1
+
+    if params:
+        placeholders = ', '.join('?' for _ in all_cols)
+        assignments = ', '.join(f"{col} = excluded.{col}" for col in update_cols)
+        conn.executemany(f"""
+            INSERT INTO {table} ({', '.join(all_cols)})
+            VALUES ({placeholders})
+            ON CONFLICT({', '.join(key_columns)}) DO UPDATE SET {assignments}
+        """, params)
+
+    if touch_values and unchanged:
+        assignments = ', '.join(f"{col} = ?" for col in touch_values)
+        conditions = " AND ".join(f"{col} = ?" for col in key_columns)
+        conn.executemany(f"UPDATE {table} SET {assignments} WHERE {conditions}", unchanged)
+
+    if prune_scope is not None:
+        stale = [list(key) for key in existing if key not in incoming]
+        if stale:
+            conditions = " AND ".join(f"{col} = ?" for col in key_columns)
+            conn.executemany(f"DELETE FROM {table} WHERE {conditions}", stale)
+            summary['deleted'] = len(stale)
+
+    return summary
+
+
 # ==================== CATEGORIES ====================
 
 def get_categories() -> List[Dict]:
@@ -508,22 +1399,60 @@ def delete_profile(uuid: str) -> bool:
         return cursor.rowcount > 0
 
 
-def sync_profiles(profiles_from_api: List[Dict]):
-    """Đồng bộ profiles từ API vào database, giữ lại thông tin local"""
+def sync_profiles(profiles_from_api: List[Dict], prune: bool = False) -> Dict[str, int]:
+    """
+    Đồng bộ profiles từ API vào database, giữ lại thông tin local.
+
+    Toàn bộ được ghi trong một transaction bằng upsert theo lô.
+
+    Args:
+        profiles_from_api: Danh sách profiles từ Hidemium
+        prune: Xóa các profiles không còn trong danh sách API
+
+    Returns:
+        Dict: {'inserted', 'updated', 'unchanged', 'deleted'}
+    """
+    import json as json_module
+
+    columns = {
+        'name': '', 'browser': '', 'os': '', 'status': 'stopped',
+        'proxy': '', 'note': '', 'tags': '',
+    }
+    local_columns = {'local_notes': '', 'fb_uid': '', 'fb_name': '', 'check_open': 0}
+    now = datetime.now().isoformat()
+
+    rows = []
     for profile in profiles_from_api:
-        uuid = profile.get('uuid')
-        existing = get_profile_by_uuid(uuid)
+        if not profile.get('uuid'):
+            continue
+        row = {col: profile[col] for col in columns if col in profile}
+        if isinstance(row.get('tags'), list):
+            row['tags'] = json_module.dumps(row['tags'], ensure_ascii=False)
+        row['uuid'] = profile['uuid']
+        rows.append(row)
 
-        if existing:
-            # Giữ lại thông tin local
-            profile['local_notes'] = existing.get('local_notes', '')
-            profile['fb_uid'] = existing.get('fb_uid', '')
-            profile['fb_name'] = existing.get('fb_name', '')
-            profile['check_open'] = existing.get('check_open', 0)
-        else:
-            profile['check_open'] = 0
+    with get_connection() as conn:
+        # Không prune thì chỉ cần các profiles có trong lô này
+        existing = _fetch_existing(conn, 'profiles', ('uuid',),
+                                   tuple(columns) + tuple(local_columns),
+                                   keys=None if prune else [row['uuid'] for row in rows])
+        summary = _bulk_upsert(
+            conn, 'profiles', ('uuid',), columns, rows, existing,
+            insert_only=local_columns,
+            extra_values={'updated_at': now},
+            touch_values={'last_sync': now},
+            prune_scope={} if prune else None
+        )
+
+    # Giữ lại thông tin local trên dict của caller
+    for profile in profiles_from_api:
+        current = existing.get((profile.get('uuid'),))
+        for col, default in local_columns.items():
+            profile[col] = current[col] if current else default
 
-        save_profile(profile)
+    print(f"[DB] sync_profiles: {summary['inserted']} inserted, {summary['updated']} updated, "
+          f"{summary['unchanged']} unchanged, {summary['deleted']} deleted")
+    return summary
 
 
 def update_profile_local(uuid: str, data: Dict) -> bool:
@@ -785,6 +1714,7 @@ def migrate_from_json():
 
 def get_pages(profile_uuid: str = None) -> List[Dict]:
     """Lấy danh sách pages, có thể lọc theo profile"""
+    page_selection.flush()  # is_selected phản ánh cả thay đổi chưa ghi
     with get_connection() as conn:
         cursor = conn.cursor()
         if profile_uuid:
@@ -797,25 +1727,14 @@ def get_pages(profile_uuid: str = None) -> List[Dict]:
         return rows_to_list(cursor.fetchall())
 
 
+def get_pages_by_profile(profile_uuids: List[str]) -> Dict[str, List[Dict]]:
+    """Lấy pages của nhiều profiles, nhóm theo profile: {uuid: [pages theo tên]}"""
+    return _rows_by_profile('pages', 'page_name', profile_uuids)
+
+
 def get_pages_for_profiles(profile_uuids: List[str]) -> List[Dict]:
     """Lấy danh sách pages từ nhiều profiles"""
-    print(f"[DB] get_pages_for_profiles called with: {profile_uuids}")
-    if not profile_uuids:
-        print(f"[DB] No profile_uuids provided, returning empty list")
-        return []
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        placeholders = ','.join(['?' for _ in profile_uuids])
-        query = f"SELECT * FROM pages WHERE profile_uuid IN ({placeholders}) ORDER BY profile_uuid, page_name"
-        print(f"[DB] Query: {query}")
-        print(f"[DB] Params: {profile_uuids}")
-        cursor.execute(query, profile_uuids)
-        rows = cursor.fetchall()
-        result = rows_to_list(rows)
-        print(f"[DB] Found {len(result)} pages")
-        for p in result:
-            print(f"[DB]   - {p.get('page_name')} (profile_uuid={p.get('profile_uuid')})")
-        return result
+    return [page for pages in get_pages_by_profile(profile_uuids).values() for page in pages]
 
 
 def get_page_by_id(page_id: int) -> Optional[Dict]:
@@ -888,6 +1807,7 @@ def save_page(data: Dict) -> Dict:
 
 def delete_page(page_id: int) -> bool:
     """Xóa page"""
+    page_selection.discard([page_id])
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("DELETE FROM pages WHERE id = ?", (page_id,))
@@ -898,6 +1818,7 @@ def delete_pages_bulk(page_ids: List[int]) -> int:
     """Xóa nhiều pages"""
     if not page_ids:
         return 0
+    page_selection.discard(page_ids)
     with get_connection() as conn:
         cursor = conn.cursor()
         placeholders = ','.join(['?' for _ in page_ids])
@@ -906,64 +1827,52 @@ def delete_pages_bulk(page_ids: List[int]) -> int:
 
 
 def update_page_selection(page_id: int, is_selected: int) -> bool:
-    """Cập nhật trạng thái chọn page"""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        now = datetime.now().isoformat()
-        cursor.execute("""
-            UPDATE pages SET is_selected = ?, updated_at = ? WHERE id = ?
-        """, (is_selected, now, page_id))
-        return cursor.rowcount > 0
+    """Cập nhật trạng thái chọn page (ghi trễ qua page_selection)"""
+    page_selection.set(page_id, bool(is_selected))
+    return True
 
 
-def sync_pages(profile_uuid: str, pages_from_scan: List[Dict]):
-    """Đồng bộ pages từ scan vào database"""
-    saved_count = 0
-    print(f"[DB] sync_pages starting for profile {profile_uuid[:8]}...")
-    print(f"[DB] Pages to sync: {len(pages_from_scan)}")
+def sync_pages(profile_uuid: str, pages_from_scan: List[Dict], prune: bool = False) -> Dict[str, int]:
+    """
+    Đồng bộ pages từ scan vào database (một transaction, upsert theo lô).
 
-    # Debug: show all page_ids
-    for i, p in enumerate(pages_from_scan):
-        print(f"[DB]   [{i+1}] page_id={p.get('page_id')} | name={p.get('page_name')}")
+    Args:
+        profile_uuid: UUID của profile đã scan
+        pages_from_scan: Danh sách pages tìm được
+        prune: Xóa các pages của profile không còn trong kết quả scan
 
+    Returns:
+        Dict: {'inserted', 'updated', 'unchanged', 'deleted'}
+    """
+    columns = {
+        'page_name': '', 'page_url': '', 'category': '', 'follower_count': 0,
+        'role': 'admin', 'note': '', 'is_selected': 0,
+    }
+    scope = {'profile_uuid': profile_uuid}
     for page in pages_from_scan:
-        try:
-            page['profile_uuid'] = profile_uuid
-            page_id = page.get('page_id')
-            page_name = page.get('page_name')
-
-            result = save_page(page)
-            if result.get('id'):
-                saved_count += 1
-                is_new = result.get('_is_new', False)
-                action = "INSERTED" if is_new else "UPDATED"
-                print(f"[DB] {action} page: {page_name} (db_id={result.get('id')}, page_id={page_id})")
-        except Exception as e:
-            print(f"[DB] ERROR saving page {page.get('page_name')}: {e}")
-            import traceback
-            traceback.print_exc()
-
-    print(f"[DB] sync_pages completed: {saved_count}/{len(pages_from_scan)} pages saved")
-    print(f"[DB] Profile UUID used: {profile_uuid}")  # Show FULL UUID
+        page['profile_uuid'] = profile_uuid
 
-    # Verify: đếm lại số pages trong DB
-    actual_count = get_pages_count(profile_uuid)
-    print(f"[DB] VERIFY: {actual_count} pages in database for profile {profile_uuid}")
+    page_selection.flush()  # Upsert giữ is_selected hiện có
+    with get_connection() as conn:
+        existing = _fetch_existing(conn, 'pages', ('profile_uuid', 'page_id'), tuple(columns), scope)
+        summary = _bulk_upsert(
+            conn, 'pages', ('profile_uuid', 'page_id'), columns,
+            [p for p in pages_from_scan if p.get('page_id')], existing,
+            extra_values={'updated_at': datetime.now().isoformat()},
+            prune_scope=scope if prune else None
+        )
 
-    # List all pages in DB for this profile
-    all_pages = get_pages(profile_uuid)
-    for i, p in enumerate(all_pages):
-        print(f"[DB]   DB[{i+1}] id={p.get('id')} | page_id={p.get('page_id')} | name={p.get('page_name')}")
+    if summary['deleted']:
+        page_selection.discard_profile(profile_uuid)
 
-    # DEBUG: List ALL pages in database (no filter)
-    print(f"[DB] === ALL PAGES IN DATABASE ===")
-    all_in_db = get_pages()  # No profile filter
-    for i, p in enumerate(all_in_db):
-        print(f"[DB]   ALL[{i+1}] profile_uuid={p.get('profile_uuid')} | page_id={p.get('page_id')} | name={p.get('page_name')}")
+    print(f"[DB] sync_pages {profile_uuid[:8]}: {summary['inserted']} inserted, "
+          f"{summary['updated']} updated, {summary['unchanged']} unchanged, {summary['deleted']} deleted")
+    return summary
 
 
 def clear_pages(profile_uuid: str) -> bool:
     """Xóa tất cả pages của profile"""
+    page_selection.discard_profile(profile_uuid)
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("DELETE FROM pages WHERE profile_uuid = ?", (profile_uuid,))
@@ -971,13 +1880,14 @@ def clear_pages(profile_uuid: str) -> bool:
 
 
 def get_pages_count(profile_uuid: str = None) -> int:
-    """Đếm số pages"""
+    """Đếm số pages (đọc counter trong profile_stats)"""
     with get_connection() as conn:
         cursor = conn.cursor()
         if profile_uuid:
-            cursor.execute("SELECT COUNT(*) FROM pages WHERE profile_uuid = ?", (profile_uuid,))
-        else:
-            cursor.execute("SELECT COUNT(*) FROM pages")
+            cursor.execute("SELECT pages_count FROM profile_stats WHERE profile_uuid = ?", (profile_uuid,))
+            row = cursor.fetchone()
+            return row[0] if row else 0
+        cursor.execute("SELECT COALESCE(SUM(pages_count), 0) FROM profile_stats")
         return cursor.fetchone()[0]
 
 
@@ -985,6 +1895,7 @@ def get_pages_count(profile_uuid: str = None) -> int:
 
 def get_groups(profile_uuid: str = None) -> List[Dict]:
     """Lấy danh sách groups, có thể lọc theo profile"""
+    group_selection.flush()  # is_selected phản ánh cả thay đổi chưa ghi
     with get_connection() as conn:
         cursor = conn.cursor()
         if profile_uuid:
@@ -997,18 +1908,14 @@ def get_groups(profile_uuid: str = None) -> List[Dict]:
         return rows_to_list(cursor.fetchall())
 
 
+def get_groups_by_profile(profile_uuids: List[str]) -> Dict[str, List[Dict]]:
+    """Lấy groups của nhiều profiles, nhóm theo profile: {uuid: [groups theo tên]}"""
+    return _rows_by_profile('groups', 'group_name', profile_uuids)
+
+
 def get_groups_for_profiles(profile_uuids: List[str]) -> List[Dict]:
     """Lấy danh sách groups từ nhiều profiles"""
-    if not profile_uuids:
-        return []
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        placeholders = ','.join(['?' for _ in profile_uuids])
-        cursor.execute(
-            f"SELECT * FROM groups WHERE profile_uuid IN ({placeholders}) ORDER BY profile_uuid, group_name",
-            profile_uuids
-        )
-        return rows_to_list(cursor.fetchall())
+    return [group for groups in get_groups_by_profile(profile_uuids).values() for group in groups]
 
 
 def get_group_by_id(group_id: int) -> Optional[Dict]:
@@ -1070,6 +1977,7 @@ def save_group(data: Dict) -> Dict:
 
 def delete_group(group_id: int) -> bool:
     """Xóa group"""
+    group_selection.discard([group_id])
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("DELETE FROM groups WHERE id = ?", (group_id,))
@@ -1077,18 +1985,14 @@ def delete_group(group_id: int) -> bool:
 
 
 def update_group_selection(group_id: int, is_selected: int) -> bool:
-    """Cập nhật trạng thái chọn group"""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        now = datetime.now().isoformat()
-        cursor.execute("""
-            UPDATE groups SET is_selected = ?, updated_at = ? WHERE id = ?
-        """, (is_selected, now, group_id))
-        return cursor.rowcount > 0
+    """Cập nhật trạng thái chọn group (ghi trễ qua group_selection)"""
+    group_selection.set(group_id, bool(is_selected))
+    return True
 
 
 def get_selected_groups(profile_uuid: str) -> List[Dict]:
     """Lấy danh sách groups đã chọn của profile"""
+    group_selection.flush()
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
@@ -1098,15 +2002,56 @@ def get_selected_groups(profile_uuid: str) -> List[Dict]:
         return rows_to_list(cursor.fetchall())
 
 
-def sync_groups(profile_uuid: str, groups_from_scan: List[Dict]):
-    """Đồng bộ groups từ scan vào database"""
+def sync_groups(profile_uuid: str, groups_from_scan: List[Dict], prune: bool = False) -> Dict[str, int]:
+    """
+    Đồng bộ groups từ scan vào database (một transaction, upsert theo lô).
+
+    Args:
+        profile_uuid: UUID của profile đã scan
+        groups_from_scan: Danh sách groups tìm được
+        prune: Xóa các groups của profile không còn trong kết quả scan
+
+    Returns:
+        Dict: {'inserted', 'updated', 'unchanged', 'deleted'}
+    """
+    columns = {'group_name': '', 'group_url': '', 'member_count': 0, 'is_selected': 0}
+    scope = {'profile_uuid': profile_uuid}
     for group in groups_from_scan:
         group['profile_uuid'] = profile_uuid
-        save_group(group)
+
+    group_selection.flush()  # Upsert giữ is_selected hiện có
+    with get_connection() as conn:
+        existing = _fetch_existing(conn, 'groups', ('profile_uuid', 'group_id'), tuple(columns), scope)
+        summary = _bulk_upsert(
+            conn, 'groups', ('profile_uuid', 'group_id'), columns,
+            [g for g in groups_from_scan if g.get('group_id')], existing,
+            extra_values={'updated_at': datetime.now().isoformat()},
+            prune_scope=scope if prune else None
+        )
+
+    if summary['deleted']:
+        group_selection.discard_profile(profile_uuid)
+
+    print(f"[DB] sync_groups {profile_uuid[:8]}: {summary['inserted']} inserted, "
+          f"{summary['updated']} updated, {summary['unchanged']} unchanged, {summary['deleted']} deleted")
+    return summary
+
+
+def get_groups_count(profile_uuid: str = None) -> int:
+    """Đếm số groups (đọc counter trong profile_stats)"""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        if profile_uuid:
+            cursor.execute("SELECT groups_count FROM profile_stats WHERE profile_uuid = ?", (profile_uuid,))
+            row = cursor.fetchone()
+            return row[0] if row else 0
+        cursor.execute("SELECT COALESCE(SUM(groups_count), 0) FROM profile_stats")
+        return cursor.fetchone()[0]
 
 
 def clear_groups(profile_uuid: str) -> bool:
     """Xóa tất cả groups của profile"""
+    group_selection.discard_profile(profile_uuid)
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("DELETE FROM groups WHERE profile_uuid = ?", (profile_uuid,))
@@ -1117,97 +2062,178 @@ def clear_groups(profile_uuid: str) -> bool:
 
 def get_post_history(profile_uuid: str = None, limit: int = 100) -> List[Dict]:
     """Lấy lịch sử đăng bài"""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        if profile_uuid:
-            cursor.execute(
-                "SELECT * FROM post_history WHERE profile_uuid = ? ORDER BY created_at DESC LIMIT ?",
-                (profile_uuid, limit)
-            )
-        else:
-            cursor.execute("SELECT * FROM post_history ORDER BY created_at DESC LIMIT ?", (limit,))
-        return rows_to_list(cursor.fetchall())
+    _flush_pending_writes()  # Đọc được cả các ghi trễ chưa xuống DB
+    if profile_uuid:
+        return _select_with_archive(
+            'post_history', "*", "profile_uuid = ?", [profile_uuid], "created_at DESC", limit
+        )
+    return _select_with_archive('post_history', "*", "1=1", [], "created_at DESC", limit)
 
 
-def save_post_history(data: Dict) -> Dict:
-    """Lưu lịch sử đăng bài"""
+def save_post_history(data: Dict, defer: bool = False) -> Dict:
+    """
+    Lưu lịch sử đăng bài.
+
+    Args:
+        data: Dữ liệu bài đăng
+        defer: Ghi trễ qua journal nền (không chờ fsync, data không có 'id')
+    """
+    sql = """
+        INSERT INTO post_history (profile_uuid, group_id, content_id, post_url, status, error_message, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+    params = (
+        data.get('profile_uuid', ''),
+        data.get('group_id', ''),
+        data.get('content_id'),
+        data.get('post_url', ''),
+        data.get('status', 'pending'),
+        data.get('error_message', ''),
+        datetime.now().isoformat()
+    )
+    if defer:
+        _journal.submit(sql, params)
+        return data
+
     with get_connection() as conn:
         cursor = conn.cursor()
-        now = datetime.now().isoformat()
-
-        cursor.execute("""
-            INSERT INTO post_history (profile_uuid, group_id, content_id, post_url, status, error_message, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            data.get('profile_uuid', ''),
-            data.get('group_id', ''),
-            data.get('content_id'),
-            data.get('post_url', ''),
-            data.get('status', 'pending'),
-            data.get('error_message', ''),
-            now
-        ))
+        cursor.execute(sql, params)
         data['id'] = cursor.lastrowid
         return data
 
 
+def _post_history_conditions(profile_uuid: str, date_from: str = None,
+                             date_to: str = None, status: str = None) -> tuple:
+    """
+    Build WHERE cho post_history với predicate dạng range trên cột gốc.
+
+    Không bọc created_at trong DATE() để SQLite dùng được index
+    (created_at lưu dạng ISO nên so sánh chuỗi tương đương so sánh ngày).
+    """
+    conditions = ["profile_uuid = ?"]
+    params = [profile_uuid]
+
+    if date_from:
+        conditions.append("created_at >= ?")
+        params.append(date_from)
+
+    if date_to:
+        # date_to tính trọn ngày -> chặn trên là đầu ngày hôm sau
+        from datetime import date, timedelta
+        next_day = date.fromisoformat(date_to[:10]) + timedelta(days=1)
+        conditions.append("created_at < ?")
+        params.append(next_day.isoformat())
+
+    if status:
+        conditions.append("status = ?")
+        params.append(status)
+
+    # Only include posts with URLs
+    conditions.append("post_url IS NOT NULL AND post_url != ''")
+    return conditions, params
+
+
 def get_post_history_filtered(
     profile_uuid: str,
     date_from: str = None,
     status: str = None,
     limit: int = 50,
-    offset: int = 0
+    offset: int = 0,
+    date_to: str = None
 ) -> List[Dict]:
     """
     Lấy lịch sử đăng bài với filtering tại SQL level (tối ưu hiệu suất).
 
+    Trang sâu nên dùng get_post_history_page() (keyset) thay vì offset.
+
     Args:
         profile_uuid: UUID của profile
         date_from: Ngày bắt đầu (format: 'YYYY-MM-DD'), None = không lọc ngày
         status: Status filter ('success', 'failed', 'pending'), None = tất cả
         limit: Số records tối đa trả về
         offset: Số records bỏ qua (cho pagination)
+        date_to: Ngày kết thúc (bao gồm), None = không giới hạn
 
     Returns:
         List[Dict]: Danh sách post history đã lọc
     """
-    with get_connection() as conn:
-        cursor = conn.cursor()
-
-        # Build query dynamically based on filters
-        conditions = ["profile_uuid = ?"]
-        params = [profile_uuid]
+    _flush_pending_writes()  # Đọc được cả các ghi trễ chưa xuống DB
+    conditions, params = _post_history_conditions(profile_uuid, date_from, date_to, status)
+    return _select_with_archive(
+        'post_history', POST_HISTORY_COLUMNS, " AND ".join(conditions), params,
+        "created_at DESC, id DESC", limit, offset, since=date_from
+    )
+
+
+POST_HISTORY_COLUMNS = "id, profile_uuid, group_id, content_id, post_url, status, error_message, created_at"
+
+
+def _post_history_page_where(profile_uuid: str, date_from: str = None, status: str = None,
+                             after: tuple = None, date_to: str = None) -> tuple:
+    """Build (where, params) cho get_post_history_page()"""
+    conditions, params = _post_history_conditions(profile_uuid, date_from, date_to, status)
+    if after:
+        conditions.append("(created_at, id) < (?, ?)")
+        params.extend(after)
+    return " AND ".join(conditions), params
+
+
+def _post_history_page_query(profile_uuid: str, date_from: str = None, status: str = None,
+                             limit: int = 50, after: tuple = None, date_to: str = None) -> tuple:
+    """Build (query, params) của bảng chính cho get_post_history_page()"""
+    where_clause, params = _post_history_page_where(profile_uuid, date_from, status, after, date_to)
+    query = f"""
+        SELECT {POST_HISTORY_COLUMNS}
+        FROM post_history
+        WHERE {where_clause}
+        ORDER BY created_at DESC, id DESC
+        LIMIT ?
+    """
+    return query, params + [limit]
 
-        if date_from:
-            conditions.append("DATE(created_at) >= ?")
-            params.append(date_from)
 
-        if status:
-            conditions.append("status = ?")
-            params.append(status)
+def get_post_history_page(
+    profile_uuid: str,
+    date_from: str = None,
+    status: str = None,
+    limit: int = 50,
+    after: tuple = None,
+    date_to: str = None
+) -> tuple:
+    """
+    Lấy một trang lịch sử đăng bài bằng keyset (seek) pagination.
 
-        # Only include posts with URLs
-        conditions.append("post_url IS NOT NULL AND post_url != ''")
+    Chi phí mỗi trang không phụ thuộc độ sâu, khác với LIMIT/OFFSET.
 
-        where_clause = " AND ".join(conditions)
+    Args:
+        profile_uuid: UUID của profile
+        date_from: Ngày bắt đầu (format: 'YYYY-MM-DD')
+        status: Status filter
+        limit: Số records mỗi trang
+        after: Cursor (created_at, id) của row cuối trang trước, None = trang đầu
+        date_to: Ngày kết thúc (bao gồm)
 
-        query = f"""
-            SELECT id, profile_uuid, group_id, content_id, post_url, status, error_message, created_at
-            FROM post_history
-            WHERE {where_clause}
-            ORDER BY created_at DESC
-            LIMIT ? OFFSET ?
-        """
-        params.extend([limit, offset])
+    Returns:
+        tuple: (rows, next_cursor) - next_cursor là None khi hết dữ liệu
+    """
+    _flush_pending_writes()  # Đọc được cả các ghi trễ chưa xuống DB
+    where_clause, params = _post_history_page_where(profile_uuid, date_from, status, after, date_to)
+    rows = _select_with_archive(
+        'post_history', POST_HISTORY_COLUMNS, where_clause, params,
+        "created_at DESC, id DESC", limit, since=date_from
+    )
 
-        cursor.execute(query, params)
-        return rows_to_list(cursor.fetchall())
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = (rows[-1]['created_at'], rows[-1]['id'])
+    return rows, next_cursor
 
 
 def get_post_history_count(
     profile_uuid: str,
     date_from: str = None,
-    status: str = None
+    status: str = None,
+    date_to: str = None
 ) -> int:
     """
     Đếm số lượng post history với filtering (cho pagination).
@@ -1216,30 +2242,32 @@ def get_post_history_count(
         profile_uuid: UUID của profile
         date_from: Ngày bắt đầu (format: 'YYYY-MM-DD')
         status: Status filter
+        date_to: Ngày kết thúc (bao gồm)
 
     Returns:
         int: Tổng số records
     """
-    with get_connection() as conn:
-        cursor = conn.cursor()
+    _flush_pending_writes()  # Đọc được cả các ghi trễ chưa xuống DB
+    # Filter theo ngày -> đọc bảng tổng hợp, không COUNT(*) trên post_history
+    if (not date_from or len(date_from) <= 10) and (not date_to or len(date_to) <= 10):
+        return get_post_stats(profile_uuid, date_from=date_from, date_to=date_to, status=status)
 
-        conditions = ["profile_uuid = ?"]
-        params = [profile_uuid]
-
-        if date_from:
-            conditions.append("DATE(created_at) >= ?")
-            params.append(date_from)
+    where_clause, params = _post_history_page_where(profile_uuid, date_from, status, date_to=date_to)
+    with get_connection() as conn:
+        count = conn.execute(_post_history_count_query(where_clause), params).fetchone()[0]
+    return count + _count_archives('post_history', where_clause, params, since=date_from)
 
-        if status:
-            conditions.append("status = ?")
-            params.append(status)
 
-        conditions.append("post_url IS NOT NULL AND post_url != ''")
+def _post_history_count_query(where_clause: str) -> str:
+    """Query COUNT(*) của bảng chính cho get_post_history_count()"""
+    return f"SELECT COUNT(*) FROM post_history WHERE {where_clause}"
 
-        where_clause = " AND ".join(conditions)
 
-        cursor.execute(f"SELECT COUNT(*) FROM post_history WHERE {where_clause}", params)
-        return cursor.fetchone()[0]
+def explain_query_plan(query: str, params: tuple = ()) -> List[str]:
+    """Trả về các dòng EXPLAIN QUERY PLAN của query (dùng để kiểm tra index)"""
+    with get_connection() as conn:
+        cursor = conn.execute(f"EXPLAIN QUERY PLAN {query}", params)
+        return [row['detail'] for row in cursor.fetchall()]
 
 
 # ==================== SCHEDULES ====================
@@ -1463,28 +2491,38 @@ def get_reel_history(profile_uuid: str = None, limit: int = 50, offset: int = 0)
 
 # ==================== POSTED REELS (Lịch sử Reels đã đăng) ====================
 
-def save_posted_reel(data: Dict) -> Dict:
-    """Lưu Reel đã đăng vào lịch sử"""
+def save_posted_reel(data: Dict, defer: bool = False) -> Dict:
+    """
+    Lưu Reel đã đăng vào lịch sử.
+
+    Args:
+        data: Dữ liệu reel
+        defer: Ghi trễ qua journal nền (không chờ fsync, data không có 'id')
+    """
+    sql = """
+        INSERT INTO posted_reels (profile_uuid, page_id, page_name, reel_url,
+            caption, hashtags, video_path, status, error_message, posted_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    params = (
+        data.get('profile_uuid', ''),
+        data.get('page_id', ''),
+        data.get('page_name', ''),
+        data.get('reel_url', ''),
+        data.get('caption', ''),
+        data.get('hashtags', ''),
+        data.get('video_path', ''),
+        data.get('status', 'success'),
+        data.get('error_message', ''),
+        datetime.now().isoformat()
+    )
+    if defer:
+        _journal.submit(sql, params)
+        return data
+
     with get_connection() as conn:
         cursor = conn.cursor()
-        now = datetime.now().isoformat()
-
-        cursor.execute("""
-            INSERT INTO posted_reels (profile_uuid, page_id, page_name, reel_url,
-                caption, hashtags, video_path, status, error_message, posted_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            data.get('profile_uuid', ''),
-            data.get('page_id', ''),
-            data.get('page_name', ''),
-            data.get('reel_url', ''),
-            data.get('caption', ''),
-            data.get('hashtags', ''),
-            data.get('video_path', ''),
-            data.get('status', 'success'),
-            data.get('error_message', ''),
-            now
-        ))
+        cursor.execute(sql, params)
         data['id'] = cursor.lastrowid
         print(f"[DB] Saved posted reel: {data.get('page_name')} - {data.get('reel_url')}")
         return data
@@ -1492,33 +2530,28 @@ def save_posted_reel(data: Dict) -> Dict:
 
 def get_posted_reels(profile_uuid: str = None, page_id: str = None, limit: int = 100, offset: int = 0) -> List[Dict]:
     """Lấy danh sách Reels đã đăng"""
-    with get_connection() as conn:
-        cursor = conn.cursor()
+    _flush_pending_writes()  # Đọc được cả các ghi trễ chưa xuống DB
+    where_clause = "1=1"
+    params = []
 
-        query = "SELECT * FROM posted_reels WHERE 1=1"
-        params = []
+    if profile_uuid:
+        where_clause += " AND profile_uuid = ?"
+        params.append(profile_uuid)
 
-        if profile_uuid:
-            query += " AND profile_uuid = ?"
-            params.append(profile_uuid)
-
-        if page_id:
-            query += " AND page_id = ?"
-            params.append(page_id)
-
-        query += " ORDER BY posted_at DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
+    if page_id:
+        where_clause += " AND page_id = ?"
+        params.append(page_id)
 
-        cursor.execute(query, params)
-        return rows_to_list(cursor.fetchall())
+    return _select_with_archive('posted_reels', "*", where_clause, params, "posted_at DESC", limit, offset)
 
 
 def get_posted_reels_count(profile_uuid: str = None, page_id: str = None) -> int:
-    """Đếm số Reels đã đăng"""
+    """Đếm số Reels đã đăng (đọc counter trong posted_reels_stats)"""
+    _flush_pending_writes()  # Đọc được cả các ghi trễ chưa xuống DB
     with get_connection() as conn:
         cursor = conn.cursor()
 
-        query = "SELECT COUNT(*) FROM posted_reels WHERE 1=1"
+        query = "SELECT COALESCE(SUM(reel_count), 0) FROM posted_reels_stats WHERE 1=1"
         params = []
 
         if profile_uuid:
@@ -1534,22 +2567,545 @@ def get_posted_reels_count(profile_uuid: str = None, page_id: str = None) -> int
 
 
 def delete_posted_reel(reel_id: int) -> bool:
-    """Xóa một Reel khỏi lịch sử"""
+    """Xóa một Reel khỏi lịch sử (kể cả bản đã archive)"""
+    _flush_pending_writes()  # Insert còn trong hàng đợi không được tạo lại row sau khi xóa
     with get_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("DELETE FROM posted_reels WHERE id = ?", (reel_id,))
-        return cursor.rowcount > 0
+        deleted = cursor.rowcount
+        if not deleted:
+            deleted = _delete_from_archives(conn, 'posted_reels', "id = ?", [reel_id])
+        return deleted > 0
 
 
 def clear_posted_reels(profile_uuid: str = None) -> int:
-    """Xóa lịch sử Reels đã đăng"""
+    """Xóa lịch sử Reels đã đăng (kể cả bản đã archive)"""
+    _flush_pending_writes()  # Insert còn trong hàng đợi không được tạo lại row sau khi xóa
     with get_connection() as conn:
         cursor = conn.cursor()
         if profile_uuid:
-            cursor.execute("DELETE FROM posted_reels WHERE profile_uuid = ?", (profile_uuid,))
+            where_clause, params = "profile_uuid = ?", [profile_uuid]
         else:
-            cursor.execute("DELETE FROM posted_reels")
-        return cursor.rowcount
+            where_clause, params = "1=1", []
+        cursor.execute(f"DELETE FROM posted_reels WHERE {where_clause}", params)
+        return cursor.rowcount + _delete_from_archives(conn, 'posted_reels', where_clause, params)
+
+
+# ==================== ARCHIVE & MAINTENANCE ====================
+
+def _archive_files(conn, table: str, since: str = None) -> List[tuple]:
+    """Các file archive của bảng (tháng mới -> cũ), chỉ lấy tháng >= since nếu có"""
+    query = "SELECT month, filename FROM archive_months WHERE table_name = ? AND row_count > 0"
+    params = [table]
+    if since:
+        query += " AND month >= ?"
+        params.append(since[:7])
+    cursor = conn.execute(query + " ORDER BY month DESC", params)
+    return [(row['month'], os.path.join(ARCHIVE_DIR, row['filename'])) for row in cursor.fetchall()]
+
+
+@contextmanager
+def _open_archive(path: str):
+    """Mở file archive chỉ đọc"""
+    conn = sqlite3.connect(Path(path).as_uri() + "?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _select_with_archive(table: str, columns: str, where_clause: str, params: List,
+                         order_by: str, limit: int, offset: int = 0, since: str = None) -> List[Dict]:
+    """
+    SELECT trên bảng chính, đọc tiếp archive (tháng mới -> cũ) khi trang chưa đủ.
+
+    Rows đã archive luôn cũ hơn mọi row còn trong bảng chính, nên với thứ tự
+    thời gian giảm dần chỉ cần chạm tới archive khi bảng chính đã hết kết quả.
+    """
+    with get_connection() as conn:
+        cursor = conn.execute(
+            f"SELECT {columns} FROM {table} WHERE {where_clause} ORDER BY {order_by} LIMIT ? OFFSET ?",
+            list(params) + [limit, offset]
+        )
+        rows = rows_to_list(cursor.fetchall())
+        if len(rows) >= limit:
+            return rows
+        archives = _archive_files(conn, table, since)
+        if not archives:
+            return rows
+        if rows:
+            offset = 0
+        elif offset:
+            cursor = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where_clause}", params)
+            offset = max(0, offset - cursor.fetchone()[0])
+
+    remaining = limit - len(rows)
+    for _, path in archives:
+        if remaining <= 0:
+            break
+        with _open_archive(path) as archive:
+            if offset:
+                count = archive.execute(f"SELECT COUNT(*) FROM {table} WHERE {where_clause}", params).fetchone()[0]
+                if count <= offset:
+                    offset -= count
+                    continue
+            cursor = archive.execute(
+                f"SELECT {columns} FROM {table} WHERE {where_clause} ORDER BY {order_by} LIMIT ? OFFSET ?",
+                list(params) + [remaining, offset]
+            )
+            batch = rows_to_list(cursor.fetchall())
+        offset = 0
+        rows.extend(batch)
+        remaining -= len(batch)
+    return rows
+
+
+def _count_archives(table: str, where_clause: str, params: List, since: str = None) -> int:
+    """Đếm rows khớp điều kiện trong các archive liên quan"""
+    with get_connection() as conn:
+        archives = _archive_files(conn, table, since)
+    total = 0
+    for _, path in archives:
+        with _open_archive(path) as archive:
+            total += archive.execute(f"SELECT COUNT(*) FROM {table} WHERE {where_clause}", params).fetchone()[0]
+    return total
+
+
+def _rollup(conn, table: str, where_clause: str, params: List, schema: str = "main") -> List[tuple]:
+    """Tổng hợp rows theo khóa của bảng thống kê tương ứng"""
+    if table == 'post_history':
+        query = f"""
+            SELECT profile_uuid, COALESCE(status, ''), substr(created_at, 1, 10), COUNT(*),
+                   SUM(COALESCE(post_url, '') != '')
+            FROM {schema}.post_history WHERE {where_clause} GROUP BY 1, 2, 3
+        """
+    else:
+        query = f"""
+            SELECT profile_uuid, COALESCE(page_id, ''), COUNT(*)
+            FROM {schema}.posted_reels WHERE {where_clause} GROUP BY 1, 2
+        """
+    return conn.execute(query, params).fetchall()
+
+
+def _add_rollup(conn, table: str, rollup: List[tuple], sign: int = 1):
+    """Cộng dồn (sign=-1: trừ đi) số liệu đã tổng hợp vào bảng thống kê"""
+    counts = 2 if table == 'post_history' else 1
+    rows = [tuple(row[:-counts]) + tuple(sign * value for value in row[-counts:]) for row in rollup]
+    if table == 'post_history':
+        conn.executemany("""
+            INSERT INTO post_history_daily (profile_uuid, status, day, post_count, url_count)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(profile_uuid, status, day) DO UPDATE SET
+                post_count = post_count + excluded.post_count,
+                url_count = url_count + excluded.url_count
+        """, rows)
+    else:
+        conn.executemany("""
+            INSERT INTO posted_reels_stats (profile_uuid, page_id, reel_count) VALUES (?, ?, ?)
+            ON CONFLICT(profile_uuid, page_id) DO UPDATE SET reel_count = reel_count + excluded.reel_count
+        """, rows)
+
+
+def _delete_from_archives(conn, table: str, where_clause: str, params: List) -> int:
+    """
+    Xóa rows khớp điều kiện trong các file archive của bảng, trừ số liệu tổng hợp
+    và row_count trong catalog tương ứng (trong transaction hiện tại của conn).
+    """
+    deleted = 0
+    for month, path in _archive_files(conn, table):
+        if not os.path.exists(path):
+            continue
+        archive = sqlite3.connect(path, timeout=30)
+        try:
+            rollup = _rollup(archive, table, where_clause, params)
+            count = archive.execute(f"DELETE FROM {table} WHERE {where_clause}", params).rowcount
+            archive.commit()
+        finally:
+            archive.close()
+        if not count:
+            continue
+        # Trigger chỉ trừ counter khi xóa ở DB chính: phần của archive trừ qua rollup
+        _add_rollup(conn, table, rollup, sign=-1)
+        conn.execute("""
+            UPDATE archive_months SET row_count = MAX(0, row_count - ?), updated_at = ?
+            WHERE table_name = ? AND month = ?
+        """, (count, datetime.now().isoformat(), table, month))
+        deleted += count
+    return deleted
+
+
+def _archive_month(conn, table: str, time_col: str, month: str, cutoff: str) -> int:
+    """Chuyển rows của một tháng (trước cutoff) sang file archive tháng đó"""
+    year, mon = int(month[:4]), int(month[5:7])
+    next_month = f"{year + mon // 12:04d}-{mon % 12 + 1:02d}-01"
+    bounds = [f"{month}-01", min(cutoff, next_month)]
+    where_clause = f"{time_col} >= ? AND {time_col} < ?"
+    filename = f"archive_{month.replace('-', '_')}.db"
+
+    # ATTACH không chạy được trong transaction
+    conn.commit()
+    conn.execute("ATTACH DATABASE ? AS archive", (os.path.join(ARCHIVE_DIR, filename),))
+    try:
+        conn.execute(f"CREATE TABLE IF NOT EXISTS archive.{table} AS SELECT * FROM main.{table} WHERE 0")
+        conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS archive.idx_{table}_id ON {table}(id)")
+        conn.execute(f"""
+            CREATE INDEX IF NOT EXISTS archive.idx_{table}_profile_time
+            ON {table}(profile_uuid, {time_col} DESC, id DESC)
+        """)
+        # WAL: transaction ghi nhiều file ATTACH chỉ atomic theo từng file. Bước 1 chỉ ghi archive
+        # (INSERT OR IGNORE -> chạy lại an toàn), bước 2 chỉ ghi DB chính và chỉ xóa rows đã có trong
+        # archive: crash giữa hai bước để lại bản sao chưa vào catalog, không mất dữ liệu.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(f"INSERT OR IGNORE INTO archive.{table} SELECT * FROM main.{table} WHERE {where_clause}", bounds)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        copied = f"{where_clause} AND id IN (SELECT id FROM archive.{table})"
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Giữ lại số liệu tổng hợp: trigger trừ counter khi DELETE, cộng lại sau đó
+            rollup = _rollup(conn, table, copied, bounds)
+            moved = conn.execute(f"DELETE FROM main.{table} WHERE {copied}", bounds).rowcount
+            _add_rollup(conn, table, rollup)
+            conn.execute("""
+                INSERT INTO archive_months (table_name, month, filename, row_count, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(table_name, month) DO UPDATE SET
+                    row_count = row_count + excluded.row_count, updated_at = excluded.updated_at
+            """, (table, month, filename, moved, datetime.now().isoformat()))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    finally:
+        conn.execute("DETACH DATABASE archive")
+    return moved
+
+
+def archive_old_rows(horizon_days: int = None) -> Dict[str, int]:
+    """
+    Chuyển post_history/posted_reels cũ hơn horizon sang file archive theo tháng.
+
+    Số liệu thống kê theo ngày vẫn giữ trong DB chính; các hàm đọc lịch sử
+    tự đọc thêm archive khi khoảng thời gian yêu cầu chạm tới.
+
+    Returns:
+        Dict: {tên bảng: số rows đã chuyển}
+    """
+    if horizon_days is None:
+        horizon_days = int(get_setting('archive_horizon_days', ARCHIVE_HORIZON_DAYS))
+    cutoff = (datetime.now() - timedelta(days=horizon_days)).strftime('%Y-%m-%d')
+    flush_writes()
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+
+    summary = {}
+    with get_connection() as conn:
+        for table, time_col in ARCHIVE_TABLES.items():
+            cursor = conn.execute(
+                f"SELECT DISTINCT substr({time_col}, 1, 7) FROM {table} WHERE {time_col} < ?", (cutoff,)
+            )
+            months = [row[0] for row in cursor.fetchall() if row[0]]
+            summary[table] = sum(_archive_month(conn, table, time_col, month, cutoff) for month in months)
+    if any(summary.values()):
+        print(f"[DB] Archived rows older than {cutoff}: {summary}")
+    return summary
+
+
+def incremental_vacuum(pages: int = 2000) -> int:
+    """
+    Trả lại tối đa `pages` trang trống cho hệ điều hành.
+
+    Chỉ chạy khi DB đã ở chế độ auto_vacuum=INCREMENTAL (DB mới tạo, hoặc sau
+    enable_incremental_vacuum()); không tự VACUUM đầy đủ trong thread nền.
+
+    Returns:
+        int: Số trang đã giải phóng
+    """
+    with get_connection() as conn:
+        conn.commit()
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return 0
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+        return min(free_pages, pages)
+
+
+def enable_incremental_vacuum() -> bool:
+    """
+    Chuyển DB cũ sang auto_vacuum=INCREMENTAL (thao tác do người dùng chủ động chạy).
+
+    Cần một lần VACUUM đầy đủ: chặn mọi thao tác ghi cho tới khi xong, lâu với DB lớn.
+
+    Returns:
+        bool: True nếu đã chuyển, False nếu DB đã ở chế độ INCREMENTAL
+    """
+    flush_writes()
+    with get_connection() as conn:
+        conn.commit()
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        started = time.perf_counter()
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    print(f"[DB] Converted to incremental auto_vacuum in {time.perf_counter() - started:.1f}s")
+    return True
+
+
+def run_maintenance(horizon_days: int = None, vacuum_pages: int = 2000) -> Dict:
+    """Archive dữ liệu cũ rồi giải phóng dung lượng"""
+    archived = archive_old_rows(horizon_days)
+    freed = incremental_vacuum(vacuum_pages)
+    return {'archived': archived, 'freed_pages': freed}
+
+
+_maintenance_thread = None
+
+
+def start_maintenance(interval: float = 6 * 3600, initial_delay: float = 300):
+    """Chạy run_maintenance() định kỳ trong thread nền (gọi một lần khi app khởi động)"""
+    global _maintenance_thread
+    if _maintenance_thread is not None and _maintenance_thread.is_alive():
+        return
+
+    def loop():
+        time.sleep(initial_delay)
+        while True:
+            try:
+                run_maintenance()
+            except Exception as e:
+                print(f"[DB] Maintenance error: {e}")
+            finally:
+                close_connection()
+            time.sleep(interval)
+
+    _maintenance_thread = threading.Thread(target=loop, name="db-maintenance", daemon=True)
+    _maintenance_thread.start()
+
+
+# ==================== SEARCH (FTS5) ====================
+
+def fold_vietnamese(text: str) -> str:
+    """Chuẩn hóa text tiếng Việt để tìm kiếm - bỏ dấu, lowercase, đ -> d"""
+    if not text:
+        return ""
+    text = unicodedata.normalize('NFD', text.lower())
+    text = ''.join(c for c in text if unicodedata.category(c) != 'Mn')
+    return unicodedata.normalize('NFC', text).replace('đ', 'd')
+
+
+class SearchIndex:
+    """
+    Index tìm kiếm trong bộ nhớ cho danh sách đã load (groups, profiles...) - lọc khi gõ
+    không cần query DB. Key bỏ dấu được tính một lần lúc dựng index, query mở rộng query
+    trước (gõ thêm ký tự) chỉ lọc tiếp trên kết quả trước.
+
+    Args:
+        records: List dict, thứ tự kết quả giữ theo thứ tự này
+        fields: Các field được tìm (substring, không phân biệt dấu/hoa thường)
+        key: Field id cho get()
+    """
+
+    HISTORY = 16  # Số query gần nhất giữ kết quả (xóa ký tự vẫn dùng lại được)
+
+    def __init__(self, records: List[Dict], fields: Tuple[str, ...], key: str = 'id'):
+        self.records = list(records)
+        self.by_id = {record.get(key): record for record in self.records}
+        self._keys = [
+            fold_vietnamese(' '.join(str(record.get(field) or '') for field in fields))
+            for record in self.records
+        ]
+        self._history: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, record_id) -> Optional[Dict]:
+        return self.by_id.get(record_id)
+
+    def search(self, query: str) -> List[Dict]:
+        """Các record chứa mọi từ trong query, query rỗng = tất cả"""
+        terms = fold_vietnamese(query).split()
+        if not terms:
+            return list(self.records)
+        folded = ' '.join(terms)
+
+        positions = self._history.get(folded)
+        if positions is None:
+            # Query dài nhất trong history là tiền tố của query mới: kết quả mới là tập con
+            base = max((q for q in self._history if folded.startswith(q)), key=len, default=None)
+            candidates = self._history[base] if base is not None else range(len(self._keys))
+            keys = self._keys
+            positions = [i for i in candidates if all(term in keys[i] for term in terms)]
+            if len(self._history) >= self.HISTORY:
+                self._history.pop(next(iter(self._history)))
+            self._history[folded] = positions
+
+        records = self.records
+        return [records[i] for i in positions]
+
+
+def _fts_query(text: str) -> str:
+    """Chuyển input người dùng thành FTS5 query: mỗi từ là một prefix, AND với nhau"""
+    tokens = re.findall(r'\w+', fold_vietnamese(text))
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def _search_ids(table: str, query: str, filters: Dict = None, limit: int = 500) -> List[int]:
+    """
+    Tìm ids trong bảng nguồn qua FTS5, xếp theo độ liên quan (bm25).
+
+    Khớp theo đầu từ, không phải chuỗi con: mỗi từ trong query phải là tiền tố của một từ
+    trong text ("book" khớp "Cook book club" nhưng không khớp "Facebook"). Gõ thêm ký tự
+    chỉ thu hẹp kết quả. SQLite không có FTS5 thì tìm trong Python với cùng quy tắc.
+
+    Args:
+        table: Bảng nguồn trong SEARCH_INDEXES
+        query: Chuỗi tìm kiếm (có dấu hoặc không dấu)
+        filters: {cột: giá trị hoặc list giá trị} lọc trên bảng nguồn
+        limit: Số kết quả tối đa, None = không giới hạn
+    """
+    fts_table, columns = SEARCH_INDEXES[table]
+    match = _fts_query(query)
+    if not match:
+        return []  # Không có từ nào (chỉ dấu câu/khoảng trắng)
+
+    conditions = []
+    params = []
+    for col, value in (filters or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = list(value)
+            if not value:
+                return []
+            conditions.append(f"t.{col} IN ({','.join('?' for _ in value)})")
+            params.extend(value)
+        else:
+            conditions.append(f"t.{col} = ?")
+            params.append(value)
+
+    global FTS_AVAILABLE
+    with get_connection() as conn:
+        if FTS_AVAILABLE:
+            extra = f" AND {' AND '.join(conditions)}" if conditions else ""
+            try:
+                cursor = conn.execute(f"""
+                    SELECT f.rowid AS id FROM {fts_table} f
+                    JOIN {table} t ON t.id = f.rowid
+                    WHERE {fts_table} MATCH ?{extra}
+                    ORDER BY f.rank
+                    LIMIT ?
+                """, [match] + params + [limit if limit else -1])
+                return [row['id'] for row in cursor.fetchall()]
+            except sqlite3.OperationalError as e:
+                # Bảng FTS không tồn tại (SQLite build không có FTS5)
+                print(f"[DB] FTS5 search unavailable, using fallback: {e}")
+                FTS_AVAILABLE = False
+
+        # Fallback khi không có FTS5: cùng quy tắc tiền tố từ, trên text đã bỏ dấu
+        prefixes = [token.strip('"*') for token in match.split()]
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        cursor = conn.execute(f"SELECT t.id, {', '.join(columns)} FROM {table} t {where}", params)
+        ids = []
+        for row in cursor.fetchall():
+            words = re.findall(r'\w+', ' '.join(fold_vietnamese(row[col] or '') for col in columns))
+            if all(any(word.startswith(prefix) for word in words) for prefix in prefixes):
+                ids.append(row['id'])
+        return ids[:limit] if limit else ids
+
+
+def search_contents(query: str, category_id: int = None, limit: int = 500) -> List[int]:
+    """Tìm contents theo title/content, trả về ids xếp theo độ liên quan"""
+    return _search_ids('contents', query, {'category_id': category_id}, limit)
+
+
+def search_groups(query: str, profile_uuids: List[str] = None, limit: int = 500) -> List[int]:
+    """Tìm groups theo tên (không phân biệt dấu), trả về ids xếp theo độ liên quan"""
+    return _search_ids('groups', query, {'profile_uuid': profile_uuids}, limit)
+
+
+def search_pages(query: str, profile_uuids: List[str] = None, limit: int = 500) -> List[int]:
+    """Tìm pages theo tên (không phân biệt dấu), trả về ids xếp theo độ liên quan"""
+    return _search_ids('pages', query, {'profile_uuid': profile_uuids}, limit)
+
+
+# ==================== STATS (counter do trigger duy trì) ====================
+
+def rebuild_stats():
+    """Tính lại bảng thống kê (dùng khi nghi ngờ counter bị lệch), gồm cả dữ liệu đã archive"""
+    with get_connection() as conn:
+        _rebuild_stats(conn.cursor())
+        for table in ARCHIVE_TABLES:
+            for _, path in _archive_files(conn, table):
+                with _open_archive(path) as archive:
+                    _add_rollup(conn, table, _rollup(archive, table, "1=1", []))
+
+
+def get_profile_stats(profile_uuid: str = None) -> Dict[str, int]:
+    """
+    Lấy số pages/groups/reels đã đăng của profile (hoặc tổng tất cả).
+
+    Returns:
+        Dict: {'pages_count', 'groups_count', 'posted_reels_count'}
+    """
+    return {
+        'pages_count': get_pages_count(profile_uuid),
+        'groups_count': get_groups_count(profile_uuid),
+        'posted_reels_count': get_posted_reels_count(profile_uuid),
+    }
+
+
+def get_post_stats(profile_uuid: str, date_from: str = None, date_to: str = None,
+                   status: str = None, with_url_only: bool = True) -> int:
+    """
+    Đếm bài đăng từ bảng tổng hợp theo ngày (không quét post_history).
+
+    Args:
+        profile_uuid: UUID của profile
+        date_from: Ngày bắt đầu 'YYYY-MM-DD'
+        date_to: Ngày kết thúc 'YYYY-MM-DD' (bao gồm)
+        status: Status filter, None = tất cả
+        with_url_only: Chỉ đếm bài có post_url (giống get_post_history_count)
+    """
+    _flush_pending_writes()  # Đọc được cả các ghi trễ chưa xuống DB
+    conditions = ["profile_uuid = ?"]
+    params = [profile_uuid]
+    if date_from:
+        conditions.append("day >= ?")
+        params.append(date_from[:10])
+    if date_to:
+        conditions.append("day <= ?")
+        params.append(date_to[:10])
+    if status:
+        conditions.append("status = ?")
+        params.append(status)
+
+    column = "url_count" if with_url_only else "post_count"
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT COALESCE(SUM({column}), 0) FROM post_history_daily WHERE {' AND '.join(conditions)}",
+            params
+        )
+        return cursor.fetchone()[0]
+
+
+def get_post_stats_by_day(profile_uuid: str, date_from: str = None) -> List[Dict]:
+    """Số bài theo ngày và status của profile (cho biểu đồ/thống kê)"""
+    _flush_pending_writes()  # Đọc được cả các ghi trễ chưa xuống DB
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        query = "SELECT day, status, post_count, url_count FROM post_history_daily WHERE profile_uuid = ?"
+        params = [profile_uuid]
+        if date_from:
+            query += " AND day >= ?"
+            params.append(date_from[:10])
+        cursor.execute(query + " ORDER BY day DESC, status", params)
+        return rows_to_list(cursor.fetchall())
 
 
 # Khởi tạo database khi import module
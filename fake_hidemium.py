@@ -0,0 +1,245 @@
+"""Fake Hidemium server (local) để benchmark / kiểm thử api_service mà không cần cài Hidemium
+
+Cách dùng:
+    python fake_hidemium.py --profiles 1000 --latency 0.02 --error-rate 0.01 --port 2222
+
+Hoặc trong code:
+    server = FakeHidemium(profiles=1000).start()
+    api = HidemiumAPI(base_url=server.url)
+    ...
+    server.stop()
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeHidemium:
+    """
+    Giả lập các endpoint HidemiumAPI đang dùng.
+
+    Args:
+        profiles: Số profiles có sẵn
+        folders: Số folders (profiles chia đều vào các folders)
+        latency: Độ trễ mỗi request (giây)
+        jitter: Độ trễ ngẫu nhiên thêm tối đa (giây)
+        error_rate: Tỉ lệ request trả HTTP 500 (0..1)
+        running_ratio: Tỉ lệ profiles đang chạy lúc khởi tạo
+        include_total: Trả tổng số profiles trong response của /v1/browser/list
+    """
+
+    def __init__(self, profiles: int = 100, folders: int = 10, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, running_ratio: float = 0.1, include_total: bool = True,
+                 host: str = "127.0.0.1", port: int = 0, seed: int = 1):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.include_total = include_total
+        self.host = host
+        self.port = port
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = Counter()  # endpoint -> số request
+        self.errors = Counter()
+        self.request_log = None  # Gán [] để ghi lại (method, path, query, body) của mỗi request
+
+        self.folders = [{"id": i + 1, "name": f"Folder {i + 1}"} for i in range(folders)]
+        self.tags = [{"id": i + 1, "name": f"tag{i + 1}"} for i in range(5)]
+        self.profiles = [
+            {
+                "uuid": f"{self.rng.getrandbits(128):032x}",
+                "name": f"Profile {i + 1}",
+                "browser": "chrome",
+                "os": "win",
+                "folder_id": self.folders[i % len(self.folders)]["id"] if self.folders else None,
+                "note": "",
+                "tags": [],
+            }
+            for i in range(profiles)
+        ]
+        self.running = {p["uuid"] for p in self.profiles if self.rng.random() < running_ratio}
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "FakeHidemium":
+        """Chạy server trong thread nền"""
+        handler = type("Handler", (_FakeHidemiumHandler,), {"fake": self})
+        self._server = _FakeHidemiumServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-hidemium", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests.clear()
+            self.errors.clear()
+
+    # ============ ENDPOINTS ============
+
+    def handle(self, method: str, path: str, query: dict, body: dict) -> tuple:
+        """Trả (status code, response dict)"""
+        route = path
+        if path.startswith("/v1/folder/") and path.endswith("/add-browser"):
+            route = "/v1/folder/{id}/add-browser"
+        with self.lock:
+            self.requests[route] += 1
+            if self.request_log is not None:
+                self.request_log.append((method, path, query, body))
+
+        delay = self.latency + (self.rng.random() * self.jitter if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            with self.lock:
+                self.errors[route] += 1
+            return 500, {"type": "error", "title": "Fake server error", "content": None}
+
+        handler = self.ROUTES.get((method, route))
+        if handler is None:
+            return 404, {"type": "error", "title": f"Not found: {method} {path}", "content": None}
+        return 200, handler(self, query, body)
+
+    def _browser_list(self, query, body):
+        page, limit = int(body.get("page", 1)), int(body.get("limit", 100))
+        profiles = self.profiles
+        if body.get("folder_id"):
+            folder_ids = set(body["folder_id"])
+            profiles = [p for p in profiles if p["folder_id"] in folder_ids]
+        if body.get("search"):
+            profiles = [p for p in profiles if body["search"].lower() in p["name"].lower()]
+        data = {"content": profiles[(page - 1) * limit:page * limit]}
+        if self.include_total:
+            data["total"] = len(profiles)
+        return {"type": "success", "data": data}
+
+    def _status_profile(self, query, body):
+        with self.lock:
+            running = sorted(self.running)
+        return {"type": "success", "content": [{"uuid": uuid, "status": "running"} for uuid in running]}
+
+    def _open_profile(self, query, body):
+        uuid = query.get("uuid", "")
+        with self.lock:
+            self.running.add(uuid)
+        return {"status": "successfully", "data": {"uuid": uuid}}
+
+    def _close_profile(self, query, body):
+        with self.lock:
+            self.running.discard(query.get("uuid", ""))
+        return {"status": "successfully"}
+
+    def _authorize(self, query, body):
+        return {"status": "successfully", "uuid": query.get("uuid", "")}
+
+    def _folder_list(self, query, body):
+        return {"type": "success", "data": {"content": self.folders}}
+
+    def _add_to_folder(self, query, body):
+        return {"type": "success", "title": "Add successfully"}
+
+    def _tags(self, query, body):
+        return {"type": "success", "content": self.tags}
+
+    def _sync_tags(self, query, body):
+        return {"type": "success", "title": "Sync successfully"}
+
+    ROUTES = {
+        ("POST", "/v1/browser/list"): _browser_list,
+        ("GET", "/v2/status-profile"): _status_profile,
+        ("GET", "/openProfile"): _open_profile,
+        ("GET", "/closeProfile"): _close_profile,
+        ("GET", "/authorize"): _authorize,
+        ("GET", "/v1/folder/list"): _folder_list,
+        ("POST", "/v1/folder/{id}/add-browser"): _add_to_folder,
+        ("GET", "/v2/tag"): _tags,
+        ("POST", "/v1/browser/tags/sync"): _sync_tags,
+    }
+
+
+class _FakeHidemiumServer(ThreadingHTTPServer):
+    # Mặc định socketserver chỉ cho 5 kết nối chờ accept: bench với >= 16 client bị SYN
+    # drop và chờ ~1s mới kết nối lại, kết quả dao động cả chục lần giữa các lần chạy
+    request_queue_size = 256
+
+
+class _FakeHidemiumHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive như Hidemium thật
+    disable_nagle_algorithm = True  # Header và body gửi riêng: tránh trễ 40ms do Nagle + delayed ACK
+    fake: FakeHidemium = None
+
+    def log_message(self, *args):
+        pass
+
+    def _dispatch(self, method: str):
+        parsed = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = {}
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                body = {}
+        status, payload = self.fake.handle(method, parsed.path, query, body)
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Hidemium server")
+    parser.add_argument("--profiles", type=int, default=1000)
+    parser.add_argument("--folders", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="Độ trễ mỗi request (giây)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Độ trễ ngẫu nhiên thêm (giây)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Tỉ lệ lỗi HTTP 500 (0..1)")
+    parser.add_argument("--no-total", action="store_true", help="Không trả tổng số profiles")
+    parser.add_argument("--port", type=int, default=2222)
+    args = parser.parse_args()
+
+    server = FakeHidemium(
+        profiles=args.profiles, folders=args.folders, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, include_total=not args.no_total, port=args.port
+    ).start()
+    print(f"[Fake Hidemium] {server.url} - {args.profiles} profiles, {len(server.running)} running")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Log pipeline cho log panel: thread nào cũng ghi vào ring buffer (lock rất ngắn),
+UI thread rút theo nhịp cố định và chèn một lần cả lô, file log xoay vòng (tùy chọn).
+"""
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from typing import List, NamedTuple, Optional, Tuple
+
+LOG_LEVELS = ("DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR")
+
+# Mức tối thiểu để hiển thị -> các level được hiện
+LEVEL_FILTERS = {
+    "ALL": set(LOG_LEVELS),
+    "INFO": {"INFO", "SUCCESS", "WARNING", "ERROR"},
+    "WARNING": {"WARNING", "ERROR"},
+    "ERROR": {"ERROR"},
+}
+
+
+def classify_level(text: str) -> str:
+    """Đoán level từ nội dung dòng print"""
+    upper = text.upper()
+    if "ERROR" in upper:
+        return "ERROR"
+    if "WARNING" in upper or "WARN" in upper:
+        return "WARNING"
+    if "SUCCESS" in upper or "✓" in text or "[OK]" in text:
+        return "SUCCESS"
+    if "DEBUG" in upper:
+        return "DEBUG"
+    return "INFO"
+
+
+class LogEntry(NamedTuple):
+    seq: int
+    timestamp: float
+    level: str
+    text: str
+
+    @property
+    def clock(self) -> str:
+        return f"[{time.strftime('%H:%M:%S', time.localtime(self.timestamp))}] "
+
+    def format(self) -> str:
+        return f"{self.clock}{self.text}"
+
+
+class LogBuffer:
+    """
+    Ring buffer nhiều thread ghi, một thread đọc; khi đầy, dòng cũ nhất bị bỏ và được đếm.
+
+    Lấy seq, đếm dòng bị bỏ và append nằm trong cùng một lock ngắn: seq luôn tăng theo
+    thứ tự trong buffer và số dòng bị bỏ được đếm đúng lúc bỏ (không suy ra từ khoảng
+    trống seq, vốn báo sai khi thread ghi lấy seq rồi append chậm hơn thread khác).
+
+    Args:
+        capacity: Số dòng tối đa chờ UI rút
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self._entries = deque(maxlen=capacity)
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        self._pending_dropped = 0  # Bỏ kể từ lần rút trước
+        self.dropped = 0
+
+    def append(self, text: str, level: Optional[str] = None):
+        """Ghi một dòng (gọi từ bất kỳ thread nào)"""
+        level = level or classify_level(text)
+        timestamp = time.time()
+        with self._lock:
+            if len(self._entries) == self._entries.maxlen:
+                self._pending_dropped += 1
+            self._entries.append(LogEntry(next(self._seq), timestamp, level, text))
+
+    def drain(self, limit: Optional[int] = None) -> Tuple[List[LogEntry], int]:
+        """
+        Lấy các dòng đang chờ (chỉ gọi từ một thread).
+
+        Returns:
+            (entries, số dòng bị bỏ do buffer đầy kể từ lần rút trước)
+        """
+        with self._lock:
+            if limit is None or limit >= len(self._entries):
+                entries = list(self._entries)
+                self._entries.clear()
+            else:
+                popleft = self._entries.popleft
+                entries = [popleft() for _ in range(limit)]
+            dropped, self._pending_dropped = self._pending_dropped, 0
+        self.dropped += dropped
+        return entries, dropped
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RotatingLogFile:
+    """
+    File log xoay vòng: app.log -> app.log.1 -> ... -> app.log.{backups}, ghi theo lô.
+
+    Args:
+        path: Đường dẫn file log
+        max_bytes: Dung lượng tối đa trước khi xoay
+        backups: Số file cũ giữ lại
+    """
+
+    def __init__(self, path: str, max_bytes: int = 5 * 1024 * 1024, backups: int = 3):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        self._file = None
+        self.error: Optional[str] = None  # Lỗi ghi file gần nhất
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def write(self, entries: List[LogEntry]):
+        if not entries:
+            return
+        data = "".join(f"{entry.format()} [{entry.level}]\n" for entry in entries)
+        with self._lock:
+            try:
+                if self._file is None:
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(data)
+                self._file.flush()
+                if self._file.tell() >= self.max_bytes:
+                    self._rotate()
+            except OSError as e:
+                # Không ghi log ra stdout ở đây (sẽ vòng lại log panel)
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self.error = str(e)
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        for i in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -2,25 +2,52 @@
 SonCuto FB - Professional Facebook Manager
 Modern UI inspired by GoLogin/Multilogin
 """
-import customtkinter as ctk
-import sys
-import io
-from datetime import datetime
-from config import COLORS, WINDOW_WIDTH, WINDOW_HEIGHT, APP_NAME, APP_VERSION
-from widgets import StatusBar
-from tabs import ProfilesTab, ScriptsTab, PostsTab, ContentTab, GroupsTab, LoginTab, PagesTab, ReelsPageTab
+import time
+
+_START_TIME = time.perf_counter()
+
+import customtkinter as ctk  # noqa: E402
+import sys  # noqa: E402
+import io  # noqa: E402
+import os  # noqa: E402
+from collections import deque  # noqa: E402
+from datetime import datetime  # noqa: E402
+from config import (  # noqa: E402
+    COLORS, WINDOW_WIDTH, WINDOW_HEIGHT, APP_NAME, APP_VERSION, TAB_PREWARM, TAB_PREWARM_DELAY_MS,
+    LOG_FLUSH_MS, LOG_BUFFER_SIZE, LOG_MAX_LINES, LOG_FILE_ENABLED, LOG_FILE_MAX_BYTES, LOG_FILE_BACKUPS
+)
+from widgets import StatusBar, ui_updates  # noqa: E402
+from db import start_maintenance, flush_selections, DATA_DIR  # noqa: E402
+from log_service import LogBuffer, LogEntry, RotatingLogFile, LEVEL_FILTERS  # noqa: E402
+from task_service import task_executor  # noqa: E402
+import tabs  # noqa: E402  (import lười: module của tab chỉ nạp khi tab được tạo)
+
+_IMPORT_TIME = time.perf_counter() - _START_TIME
+
+# Tab id -> tên class trong package tabs, theo thứ tự prewarm
+TAB_CLASSES = {
+    "profiles": "ProfilesTab",
+    "groups": "GroupsTab",
+    "pages": "PagesTab",
+    "login": "LoginTab",
+    "content": "ContentTab",
+    "reels_page": "ReelsPageTab",
+    "scripts": "ScriptsTab",
+    "posts": "PostsTab",
+}
 
 
 class LogRedirector(io.StringIO):
-    """Redirect stdout/stderr to a callback function"""
+    """Redirect stdout/stderr to a callback function (mỗi dòng một lần gọi)"""
     def __init__(self, callback, original_stream):
         super().__init__()
         self.callback = callback
         self.original_stream = original_stream
 
     def write(self, text):
-        if text.strip():
-            self.callback(text)
+        for line in text.splitlines():
+            if line.strip():
+                self.callback(line)
         if self.original_stream:
             self.original_stream.write(text)
             self.original_stream.flush()
@@ -49,6 +76,7 @@ class FBManagerApp(ctk.CTk):
         # State
         self.current_tab = "profiles"
         self.status_bar = None
+        ui_updates.attach(self)  # Cập nhật UI từ worker thread gom theo frame
 
         # Build UI
         self._create_sidebar()
@@ -60,6 +88,10 @@ class FBManagerApp(ctk.CTk):
         # Show default
         self._show_tab("profiles")
         self._add_log("[App] SonCuto FB started", "SUCCESS")
+        self.after_idle(self._report_startup)
+
+        # Archive lịch sử cũ + dọn dung lượng DB trong nền
+        start_maintenance()
 
     def _create_sidebar(self):
         """Modern icon-based sidebar"""
@@ -113,7 +145,7 @@ class FBManagerApp(ctk.CTk):
             self.nav_buttons[tab_id] = btn
 
         # Bottom section - Settings & Status
-        bottom_frame = ctk.CTkFrame(self.sidebar, fg_color="transparent", height=100)
+        bottom_frame = ctk.CTkFrame(self.sidebar, fg_color="transparent", height=150)
         bottom_frame.pack(side="bottom", fill="x", pady=10)
         bottom_frame.pack_propagate(False)
 
@@ -131,6 +163,20 @@ class FBManagerApp(ctk.CTk):
         )
         settings_btn.pack(pady=4)
 
+        # API diagnostics icon
+        diagnostics_btn = ctk.CTkButton(
+            bottom_frame,
+            text="📈",
+            width=44,
+            height=44,
+            corner_radius=8,
+            fg_color="transparent",
+            hover_color=COLORS["bg_card"],
+            font=ctk.CTkFont(size=18),
+            command=self._open_diagnostics
+        )
+        diagnostics_btn.pack(pady=4)
+
         # Connection indicator
         self.connection_indicator = ctk.CTkLabel(
             bottom_frame,
@@ -251,6 +297,21 @@ class FBManagerApp(ctk.CTk):
             command=self._clear_logs
         ).pack(side="right", padx=16)
 
+        # Lọc theo level tối thiểu
+        self.log_level_menu = ctk.CTkOptionMenu(
+            header,
+            values=list(LEVEL_FILTERS),
+            width=90,
+            height=28,
+            corner_radius=6,
+            fg_color=COLORS["bg_card"],
+            button_color=COLORS["bg_card_hover"],
+            button_hover_color=COLORS["border_light"],
+            font=ctk.CTkFont(size=11),
+            command=self._set_log_filter
+        )
+        self.log_level_menu.pack(side="right")
+
         # Log content
         log_container = ctk.CTkFrame(self.log_panel, fg_color="transparent")
         log_container.pack(fill="both", expand=True, padx=8, pady=8)
@@ -273,23 +334,65 @@ class FBManagerApp(ctk.CTk):
         self.log_text._textbox.tag_config("DEBUG", foreground=COLORS["text_muted"])
         self.log_text._textbox.tag_config("TIMESTAMP", foreground=COLORS["text_muted"])
 
+        # Pipeline: print/_add_log từ mọi thread -> log_buffer -> _drain_logs mỗi LOG_FLUSH_MS
+        self.log_buffer = LogBuffer(LOG_BUFFER_SIZE)
+        self._log_history = deque(maxlen=LOG_MAX_LINES)  # Dòng gần nhất (mọi level) để lọc lại
+        self._log_levels = LEVEL_FILTERS["ALL"]
+        self._log_file = None
+        if LOG_FILE_ENABLED:
+            self._log_file = RotatingLogFile(os.path.join(DATA_DIR, "logs", "app.log"),
+                                             LOG_FILE_MAX_BYTES, LOG_FILE_BACKUPS)
+        self._log_job = self.after(LOG_FLUSH_MS, self._drain_logs)
+
     def _create_tabs(self):
-        """Initialize all tabs"""
+        """Tabs được tạo khi mở lần đầu (_get_tab), các tab còn lại prewarm khi app rảnh"""
         self.tabs = {}
-        self.tabs["profiles"] = ProfilesTab(self.main_frame, status_callback=self._update_status)
-        self.tabs["login"] = LoginTab(self.main_frame, status_callback=self._update_status)
-        self.tabs["pages"] = PagesTab(self.main_frame, status_callback=self._update_status)
-        self.tabs["reels_page"] = ReelsPageTab(self.main_frame, status_callback=self._update_status)
-        self.tabs["content"] = ContentTab(self.main_frame, status_callback=self._update_status)
-        self.tabs["groups"] = GroupsTab(self.main_frame, status_callback=self._update_status)
-        self.tabs["scripts"] = ScriptsTab(self.main_frame, status_callback=self._update_status)
-        self.tabs["posts"] = PostsTab(self.main_frame, status_callback=self._update_status)
+        self._tab_build_times = {}  # tab_id -> giây (import module + dựng UI)
+        if TAB_PREWARM:
+            self.after(TAB_PREWARM_DELAY_MS, self._prewarm_tabs)
+
+    def _get_tab(self, tab_id: str):
+        """Tab theo id, tạo (và import module của tab) nếu chưa có"""
+        tab = self.tabs.get(tab_id)
+        if tab is None and tab_id in TAB_CLASSES:
+            start = time.perf_counter()
+            tab_class = getattr(tabs, TAB_CLASSES[tab_id])
+            tab = tab_class(self.main_frame, status_callback=self._update_status)
+            self.tabs[tab_id] = tab
+            self._tab_build_times[tab_id] = time.perf_counter() - start
+            print(f"[Startup] {TAB_CLASSES[tab_id]}: {self._tab_build_times[tab_id] * 1000:.0f} ms")
+        return tab
+
+    def _prewarm_tabs(self):
+        """Tạo một tab chưa có mỗi lần app rảnh, để lần mở đầu không phải chờ"""
+        pending = [tab_id for tab_id in TAB_CLASSES if tab_id not in self.tabs]
+        if not pending:
+            return
+        try:
+            self._get_tab(pending[0])
+        except Exception as e:
+            # Lỗi sẽ hiện lại khi người dùng mở tab, không chặn prewarm các tab khác
+            print(f"[Startup] Prewarm {pending[0]} failed: {e}")
+            self.tabs[pending[0]] = None
+        if len(pending) > 1:
+            self.after(100, lambda: self.after_idle(self._prewarm_tabs))
+
+    def _report_startup(self):
+        """Log thời gian khởi động: import module, dựng cửa sổ + tab đầu tiên"""
+        total = time.perf_counter() - _START_TIME
+        first_tabs = ", ".join(f"{TAB_CLASSES[t]} {s * 1000:.0f} ms" for t, s in self._tab_build_times.items())
+        print(f"[Startup] Window ready in {total * 1000:.0f} ms "
+              f"(imports {_IMPORT_TIME * 1000:.0f} ms; {first_tabs})")
 
     def _show_tab(self, tab_id: str):
         """Switch to selected tab"""
+        # Ghi trạng thái chọn groups/pages còn chờ trước khi rời tab
+        flush_selections()
+
         # Hide all
         for tab in self.tabs.values():
-            tab.pack_forget()
+            if tab is not None:
+                tab.pack_forget()
 
         # Update nav buttons
         titles = {
@@ -320,11 +423,12 @@ class FBManagerApp(ctk.CTk):
         # Update header title
         self.page_title.configure(text=titles.get(tab_id, tab_id))
 
-        # Show tab
-        if tab_id in self.tabs:
-            self.tabs[tab_id].pack(fill="both", expand=True)
-            if tab_id == "posts" and hasattr(self.tabs[tab_id], '_load_data'):
-                self.tabs[tab_id]._load_data()
+        # Show tab (tạo lần đầu nếu chưa prewarm)
+        tab = self._get_tab(tab_id)
+        if tab is not None:
+            tab.pack(fill="both", expand=True)
+            if tab_id == "posts" and hasattr(tab, '_load_data'):
+                tab._load_data()
 
         self.current_tab = tab_id
 
@@ -336,32 +440,66 @@ class FBManagerApp(ctk.CTk):
         sys.stderr = LogRedirector(self._on_log_output, self._original_stderr)
 
     def _on_log_output(self, text):
-        """Handle log output"""
-        level = "INFO"
-        if "ERROR" in text.upper():
-            level = "ERROR"
-        elif "WARNING" in text.upper() or "WARN" in text.upper():
-            level = "WARNING"
-        elif "SUCCESS" in text.upper() or "✓" in text or "[OK]" in text:
-            level = "SUCCESS"
-        elif "DEBUG" in text.upper():
-            level = "DEBUG"
-        self.after(0, lambda: self._add_log(text.strip(), level))
+        """Handle log output (bất kỳ thread nào) - level đoán theo nội dung"""
+        self.log_buffer.append(text.strip())
 
     def _add_log(self, text: str, level: str = "INFO"):
-        """Add log entry"""
-        if not hasattr(self, 'log_text') or not self.log_text:
+        """Add log entry (thread-safe, hiện ở lần rút kế tiếp)"""
+        self.log_buffer.append(text, level)
+
+    def _drain_logs(self):
+        """Rút log đang chờ, chèn một lần cả lô và cắt bớt dòng cũ"""
+        entries, dropped = self.log_buffer.drain()
+        if dropped:
+            entries.insert(0, LogEntry(0, time.time(), "WARNING", f"[App] Bỏ qua {dropped} dòng log (quá nhiều)"))
+        if entries:
+            if self._log_file:
+                self._log_file.write(entries)
+            self._log_history.extend(entries)
+            self._insert_log_entries(entries)
+        self._log_job = self.after(LOG_FLUSH_MS, self._drain_logs)
+
+    def _insert_log_entries(self, entries):
+        textbox = self.log_text._textbox
+        chunks = []
+        for entry in entries:
+            if entry.level in self._log_levels:
+                chunks.extend((entry.clock, "TIMESTAMP", f"{entry.text}\n", entry.level))
+        if not chunks:
             return
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text._textbox.insert("end", f"[{timestamp}] ", "TIMESTAMP")
-        self.log_text._textbox.insert("end", f"{text}\n", level)
+
+        at_bottom = textbox.yview()[1] >= 0.999
+        textbox.insert("end", *chunks)
+        lines = int(textbox.index("end-1c").split(".")[0]) - 1
+        if lines > LOG_MAX_LINES:
+            textbox.delete("1.0", f"{lines - LOG_MAX_LINES + 1}.0")
+        if at_bottom:
+            textbox.see("end")
+
+    def _set_log_filter(self, level: str):
+        """Hiện lại các dòng gần nhất theo level tối thiểu mới"""
+        self._log_levels = LEVEL_FILTERS.get(level, LEVEL_FILTERS["ALL"])
+        self.log_text._textbox.delete("1.0", "end")
+        self._insert_log_entries(self._log_history)
         self.log_text._textbox.see("end")
 
     def _clear_logs(self):
         """Clear log panel"""
-        if hasattr(self, 'log_text') and self.log_text:
-            self.log_text._textbox.delete("1.0", "end")
-            self._add_log("[App] Logs cleared", "INFO")
+        self.log_text._textbox.delete("1.0", "end")
+        self._log_history.clear()
+        self._add_log("[App] Logs cleared", "INFO")
+
+    def destroy(self):
+        if getattr(self, '_log_job', None):
+            self.after_cancel(self._log_job)
+            self._log_job = None
+        if hasattr(self, '_original_stdout'):
+            sys.stdout, sys.stderr = self._original_stdout, self._original_stderr
+        if getattr(self, '_log_file', None):
+            self._log_file.write(self.log_buffer.drain()[0])
+            self._log_file.close()
+        task_executor.shutdown()
+        super().destroy()
 
     def _update_status(self, text: str, status_type: str = "info"):
         """Update status bar"""
@@ -391,6 +529,14 @@ class FBManagerApp(ctk.CTk):
         settings = SettingsDialog(self)
         settings.grab_set()
 
+    def _open_diagnostics(self):
+        """Open API diagnostics panel (chỉ một cửa sổ)"""
+        dialog = getattr(self, '_diagnostics_dialog', None)
+        if dialog is not None and dialog.winfo_exists():
+            dialog.focus()
+            return
+        self._diagnostics_dialog = DiagnosticsDialog(self)
+
 
 class SettingsDialog(ctk.CTkToplevel):
     """Settings Dialog - Modern style"""
@@ -485,6 +631,165 @@ class SettingsDialog(ctk.CTkToplevel):
         self.destroy()
 
 
+class DiagnosticsDialog(ctk.CTkToplevel):
+    """API diagnostics - latency/lỗi theo endpoint của Hidemium API, hàng đợi task nền"""
+
+    REFRESH_MS = 2000
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("📈 API Diagnostics")
+        self.geometry("860x420")
+        self.configure(fg_color=COLORS["bg_main"])
+        self.transient(parent)
+        self._refresh_job = None
+        self._create_ui()
+        self._refresh()
+
+    def _create_ui(self):
+        from api_service import api
+
+        # Header
+        header = ctk.CTkFrame(self, fg_color=COLORS["bg_header"], height=56, corner_radius=0)
+        header.pack(fill="x")
+        header.pack_propagate(False)
+
+        ctk.CTkLabel(
+            header,
+            text="📈  API Diagnostics",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=COLORS["text_primary"]
+        ).pack(side="left", padx=20, pady=16)
+
+        ctk.CTkButton(
+            header,
+            text="Reset",
+            width=70,
+            height=30,
+            corner_radius=6,
+            fg_color=COLORS["bg_card"],
+            hover_color=COLORS["bg_card_hover"],
+            command=self._reset
+        ).pack(side="right", padx=(0, 20))
+
+        # Chuyển DB cũ sang incremental vacuum: VACUUM đầy đủ một lần, chặn ghi tới khi xong
+        self.compact_btn = ctk.CTkButton(
+            header,
+            text="Compact DB",
+            width=100,
+            height=30,
+            corner_radius=6,
+            fg_color=COLORS["bg_card"],
+            hover_color=COLORS["bg_card_hover"],
+            command=self._compact_db
+        )
+        self.compact_btn.pack(side="right", padx=(0, 8))
+
+        # Slow call threshold (ms, trống = tắt)
+        self.slow_entry = ctk.CTkEntry(
+            header, width=70, height=30, fg_color=COLORS["bg_input"], border_color=COLORS["border"]
+        )
+        self.slow_entry.pack(side="right", padx=(0, 12))
+        if api.metrics.slow_threshold is not None:
+            self.slow_entry.insert(0, str(int(api.metrics.slow_threshold * 1000)))
+        self.slow_entry.bind("<Return>", lambda e: self._apply_slow_threshold())
+        self.slow_entry.bind("<FocusOut>", lambda e: self._apply_slow_threshold())
+        ctk.CTkLabel(
+            header, text="Log slow (ms):", text_color=COLORS["text_secondary"]
+        ).pack(side="right", padx=(0, 6))
+
+        # Stats table
+        self.stats_text = ctk.CTkTextbox(
+            self,
+            fg_color=COLORS["bg_card"],
+            text_color=COLORS["text_primary"],
+            font=ctk.CTkFont(family="Consolas", size=12),
+            corner_radius=8,
+            wrap="none"
+        )
+        self.stats_text.pack(fill="both", expand=True, padx=20, pady=20)
+
+    def _refresh(self):
+        from api_service import api
+
+        stats = api.get_stats()
+        lines = [
+            f"{'Endpoint':<38}{'Calls':>7}{'Err':>6}{'Err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'Max':>9}{'KB':>9}{'Last':>6}",
+            "-" * 109,
+        ]
+        for route, s in sorted(stats.items(), key=lambda item: -item[1]['calls']):
+            lines.append(
+                f"{route[:37]:<38}{s['calls']:>7}{s['errors']:>6}{s['error_rate'] * 100:>6.1f}%"
+                f"{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}{s['p99_ms']:>9.1f}{s['max_ms']:>9.1f}"
+                f"{s['bytes'] / 1024:>9.1f}{s['last_status'] or '-':>6}"
+            )
+            kinds = ", ".join(f"{kind}={count}" for kind, count in s['error_kinds'].items() if count)
+            if kinds:
+                lines.append(f"{'':<4}↳ {kinds}")
+        if not stats:
+            lines.append("Chưa có request nào")
+        lines.append("")
+        lines.append(f"Thời gian tính bằng ms · từ {datetime.fromtimestamp(api.metrics.since):%H:%M:%S}")
+
+        lines.append("")
+        lines.append(
+            f"{'Task pool':<12}{'Workers':>8}{'Queue':>7}{'Run':>5}{'Done':>7}{'Fail':>6}{'Cancel':>8}"
+            f"{'Wait p50':>10}{'Wait p95':>10}{'Run p50':>10}{'Run p95':>10}"
+        )
+        lines.append("-" * 93)
+        for category, s in task_executor.stats().items():
+            lines.append(
+                f"{category:<12}{s['workers']:>8}{s['queued']:>7}{s['running']:>5}{s['completed']:>7}"
+                f"{s['failed']:>6}{s['cancelled']:>8}{s['wait_p50_ms']:>10.1f}{s['wait_p95_ms']:>10.1f}"
+                f"{s['run_p50_ms']:>10.1f}{s['run_p95_ms']:>10.1f}"
+            )
+
+        self.stats_text.configure(state="normal")
+        self.stats_text.delete("1.0", "end")
+        self.stats_text.insert("1.0", "\n".join(lines))
+        self.stats_text.configure(state="disabled")
+        self._refresh_job = self.after(self.REFRESH_MS, self._refresh)
+
+    def _apply_slow_threshold(self):
+        from api_service import api
+
+        value = self.slow_entry.get().strip()
+        try:
+            api.metrics.slow_threshold = float(value) / 1000 if value else None
+        except ValueError:
+            pass
+
+    def _reset(self):
+        from api_service import api
+
+        api.reset_stats()
+        if self._refresh_job:
+            self.after_cancel(self._refresh_job)
+        self._refresh()
+
+    def _compact_db(self):
+        from db import enable_incremental_vacuum, incremental_vacuum
+
+        self.compact_btn.configure(state="disabled", text="Compacting...")
+
+        def work():
+            try:
+                if not enable_incremental_vacuum():
+                    print(f"[DB] Compact: freed {incremental_vacuum()} pages")
+            except Exception as e:
+                print(f"[DB] ERROR compact failed: {e}")
+            if self.winfo_exists():
+                self.after(0, lambda: self.compact_btn.configure(state="normal", text="Compact DB"))
+
+        task_executor.submit("db", work)
+
+    def destroy(self):
+        if self._refresh_job:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        super().destroy()
+
+
 def main():
     """Main entry point"""
     app = FBManagerApp()
@@ -1,13 +1,31 @@
 """
 Tabs Package
+
+Các tab được import lười (khi dùng lần đầu) - app chỉ nạp module của tab đang mở.
 """
-from .profiles_tab import ProfilesTab
-from .scripts_tab import ScriptsTab
-from .posts_tab import PostsTab
-from .content_tab import ContentTab
-from .groups_tab import GroupsTab
-from .login_tab import LoginTab
-from .pages_tab import PagesTab
-from .reels_page_tab import ReelsPageTab
+import importlib
+
+_TAB_MODULES = {
+    'ProfilesTab': '.profiles_tab',
+    'ScriptsTab': '.scripts_tab',
+    'PostsTab': '.posts_tab',
+    'ContentTab': '.content_tab',
+    'GroupsTab': '.groups_tab',
+    'LoginTab': '.login_tab',
+    'PagesTab': '.pages_tab',
+    'ReelsPageTab': '.reels_page_tab',
+}
 
 __all__ = ['ProfilesTab', 'ScriptsTab', 'PostsTab', 'ContentTab', 'GroupsTab', 'LoginTab', 'PagesTab', 'ReelsPageTab']
+
+
+def __getattr__(name: str):
+    if name not in _TAB_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_TAB_MODULES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_TAB_MODULES))
@@ -9,10 +9,10 @@ import os
 import random
 from datetime import datetime
 from config import COLORS, FONTS, SPACING, RADIUS
-from widgets import ModernButton, ModernEntry, ModernTextbox, SearchBar, Badge, EmptyState
+from widgets import ModernButton, ModernEntry, ModernTextbox, SearchBar, Badge, EmptyState, font
 from db import (
     get_categories, save_category, delete_category,
-    get_contents, get_content_by_id, save_content, delete_content
+    get_contents, get_content_by_id, save_content, delete_content, search_contents
 )
 
 
@@ -492,7 +492,7 @@ class ContentTab(ctk.CTkFrame):
         title_label = ctk.CTkLabel(
             info,
             text=title,
-            font=ctk.CTkFont(size=FONTS["size_sm"], weight="bold"),
+            font=font(FONTS["size_sm"], "bold"),
             text_color=COLORS["text_primary"],
             anchor="w"
         )
@@ -505,7 +505,7 @@ class ContentTab(ctk.CTkFrame):
             ctk.CTkLabel(
                 info,
                 text=preview + "..." if len(content.get('content', '')) > 40 else preview,
-                font=ctk.CTkFont(size=FONTS["size_xs"]),
+                font=font(FONTS["size_xs"]),
                 text_color=COLORS["text_tertiary"],
                 anchor="w"
             ).pack(anchor="w")
@@ -679,11 +679,10 @@ class ContentTab(ctk.CTkFrame):
             self._render_content_list()
             return
 
-        filtered = [
-            c for c in self.contents
-            if query.lower() in c.get('title', '').lower()
-            or query.lower() in c.get('content', '').lower()
-        ]
+        # FTS5 index trong DB (bỏ dấu), giữ thứ tự theo độ liên quan
+        contents_by_id = {c['id']: c for c in self.contents}
+        ids = search_contents(query, category_id=self.current_category_id, limit=None)
+        filtered = [contents_by_id[cid] for cid in ids if cid in contents_by_id]
         self._render_content_list(filtered)
 
     def _insert_macro(self, macro: str):
@@ -8,34 +8,27 @@ import random
 import os
 import re
 import time
-import unicodedata
+import importlib.util
 from datetime import datetime, date
 from tkinter import filedialog
 from config import COLORS
-from widgets import ModernButton, ModernEntry
+from widgets import (
+    ModernButton, ModernEntry, VirtualList, Debouncer, SEARCH_DEBOUNCE_MS, ui_updates, font, text_style
+)
 from db import (
-    get_profiles, get_profile_by_uuid, get_groups, get_groups_for_profiles, save_group, delete_group,
-    update_group_selection, get_selected_groups, sync_groups, clear_groups,
+    get_profiles, get_profile_by_uuid, get_groups, get_groups_for_profiles, get_groups_by_profile,
+    save_group, delete_group, get_selected_groups, sync_groups, clear_groups,
     get_contents, get_categories, save_post_history, get_post_history,
-    get_post_history_filtered, get_post_history_count
+    get_post_history_count, get_post_history_page,
+    SearchIndex, group_selection
 )
 from api_service import api
+from task_service import task_executor, current_token
 from automation.window_manager import acquire_window_slot, release_window_slot, get_window_bounds
 
-# Import for web scraping
+# Import for web scraping (bs4 chỉ import khi parse HTML lần đầu)
 import requests
-try:
-    from bs4 import BeautifulSoup
-    BS4_AVAILABLE = True
-except ImportError:
-    BS4_AVAILABLE = False
-
-# Import CDP MAX helper (optional, for improved automation)
-try:
-    from automation import CDPHelper
-    CDP_MAX_AVAILABLE = True
-except ImportError:
-    CDP_MAX_AVAILABLE = False
+BS4_AVAILABLE = importlib.util.find_spec("bs4") is not None
 
 
 class GroupsTab(ctk.CTkFrame):
@@ -63,6 +56,7 @@ class GroupsTab(ctk.CTkFrame):
         self._boost_page = 0
         self._boost_page_size = 30  # Items per page
         self._boost_total_count = 0
+        self._boost_cursors: List = [None]  # Keyset cursor (created_at, id) đầu mỗi trang
         self._boost_posts_cache: List[Dict] = []  # Cache current page posts
         self._boost_widgets_cache: Dict[int, ctk.CTkFrame] = {}  # Cache widgets by post id
 
@@ -70,12 +64,9 @@ class GroupsTab(ctk.CTkFrame):
         self.selected_profile_uuids: List[str] = []
         self.folders: List[Dict] = []
         self.profile_checkbox_vars: Dict = {}
-        self.group_checkbox_widgets: Dict = {}
-        self.group_checkbox_vars: Dict = {}
-
-        # Widget caches for optimized rendering
-        self._scan_checkbox_vars: Dict[int, ctk.BooleanVar] = {}  # group_id -> BooleanVar
-        self._post_checkbox_vars: Dict[int, ctk.BooleanVar] = {}  # group_id -> BooleanVar
+        self._post_groups: List[Dict] = []  # Groups của tab Đăng trước khi lọc
+        self._post_groups_index: Optional[SearchIndex] = None  # Index lọc theo tên, dựng lại khi _post_groups đổi
+        self._post_groups_indexed: Optional[List[Dict]] = None  # List _post_groups mà index đang dùng
 
         self._create_ui()
         self._load_profiles()
@@ -273,17 +264,16 @@ class GroupsTab(ctk.CTkFrame):
                 text_color=COLORS["text_primary"]
             ).pack(side="left", padx=3)
 
-        # Groups list
-        self.scan_list = ctk.CTkScrollableFrame(self.tab_scan, fg_color="transparent")
-        self.scan_list.pack(fill="both", expand=True, padx=10, pady=(0, 10))
-
-        self.scan_empty_label = ctk.CTkLabel(
-            self.scan_list,
-            text="Chưa có nhóm nào\nChọn profile và bấm 'Quét nhóm' để bắt đầu",
-            font=ctk.CTkFont(size=13),
-            text_color=COLORS["text_secondary"]
+        # Groups list (chỉ tạo row cho các nhóm đang hiển thị)
+        self.scan_list = VirtualList(
+            self.tab_scan,
+            row_height=40,
+            row_gap=4,
+            create_row=self._create_scan_row,
+            bind_row=self._bind_scan_row,
+            empty_text="Chưa có nhóm nào\nChọn profile và bấm 'Quét nhóm' để bắt đầu"
         )
-        self.scan_empty_label.pack(pady=50)
+        self.scan_list.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
     def _create_post_tab(self):
         """Tạo tab Đăng nhóm"""
@@ -352,6 +342,7 @@ class GroupsTab(ctk.CTkFrame):
         ctk.CTkLabel(filter_row, text="🔍", width=20).pack(side="left")
         self.group_filter_var = ctk.StringVar()
         self.group_filter_var.trace_add("write", self._on_group_filter_change)
+        self._group_filter_debounce = Debouncer(self, SEARCH_DEBOUNCE_MS, self._apply_group_filter)
         self.group_filter_entry = ctk.CTkEntry(
             filter_row,
             placeholder_text="Lọc theo tên nhóm...",
@@ -362,21 +353,16 @@ class GroupsTab(ctk.CTkFrame):
         )
         self.group_filter_entry.pack(side="left", padx=5)
 
-        # Groups checkboxes list
-        self.post_groups_list = ctk.CTkScrollableFrame(left_panel, fg_color="transparent")
-        self.post_groups_list.pack(fill="both", expand=True, padx=5, pady=(0, 10))
-
-        # Store checkbox widgets for optimization
-        self.group_checkbox_widgets = {}
-        self.group_checkbox_vars = {}
-
-        self.post_empty_label = ctk.CTkLabel(
-            self.post_groups_list,
-            text="Chưa có nhóm\nQuét nhóm trước",
-            font=ctk.CTkFont(size=12),
-            text_color=COLORS["text_secondary"]
+        # Groups checkboxes list (chỉ tạo row cho các nhóm đang hiển thị)
+        self.post_groups_list = VirtualList(
+            left_panel,
+            row_height=30,
+            row_gap=2,
+            create_row=self._create_post_group_row,
+            bind_row=self._bind_post_group_row,
+            empty_text="Chưa có nhóm\nQuét nhóm trước"
         )
-        self.post_empty_label.pack(pady=30)
+        self.post_groups_list.pack(fill="both", expand=True, padx=5, pady=(0, 10))
 
         # ========== RIGHT PANEL - Post Content ==========
         right_panel = ctk.CTkFrame(main_container, fg_color=COLORS["bg_card"], corner_radius=10)
@@ -952,8 +938,7 @@ class GroupsTab(ctk.CTkFrame):
             ctk.CTkLabel(
                 self.profile_list_scroll,
                 text="Không có profile",
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["text_secondary"]
+                **text_style("row_muted")
             ).pack(pady=10)
             return
 
@@ -969,7 +954,7 @@ class GroupsTab(ctk.CTkFrame):
                 text=f"{name} ({uuid[:8]})",
                 variable=var,
                 fg_color=COLORS["accent"],
-                font=ctk.CTkFont(size=10),
+                font=font(10),
                 command=lambda u=uuid, v=var: self._toggle_profile_selection(u, v)
             )
             cb.pack(anchor="w", pady=1)
@@ -999,32 +984,31 @@ class GroupsTab(ctk.CTkFrame):
         self._set_status("Đang load nhóm...", "info")
 
         def do_load():
+            token = current_token()
             try:
                 if self.multi_profile_var.get() and self.selected_profile_uuids:
-                    # Multi-profile: load từng profile riêng
-                    profile_groups_data = {}
-                    all_groups = []
-                    for uuid in self.selected_profile_uuids:
-                        groups = get_groups(uuid)
-                        profile_groups_data[uuid] = groups
-                        all_groups.extend(groups)
-
-                    self.after(0, lambda: self._on_groups_loaded_multi(profile_groups_data, all_groups))
+                    # Multi-profile: một query, DB trả về sẵn theo từng profile
+                    profile_groups_data = get_groups_by_profile(self.selected_profile_uuids)
+                    all_groups = [g for groups in profile_groups_data.values() for g in groups]
+
+                    self.after(0, token.guard(self._on_groups_loaded_multi, profile_groups_data, all_groups))
                 elif self.current_profile_uuid:
                     # Single profile
                     groups = get_groups(self.current_profile_uuid)
-                    self.after(0, lambda: self._on_groups_loaded(groups))
+                    self.after(0, token.guard(self._on_groups_loaded, groups))
                 else:
-                    self.after(0, lambda: self._on_groups_loaded([]))
+                    self.after(0, token.guard(self._on_groups_loaded, []))
             except Exception as e:
-                self.after(0, lambda: self._set_status(f"Lỗi: {e}", "error"))
+                self.after(0, token.guard(self._set_status, f"Lỗi: {e}", "error"))
 
-        threading.Thread(target=do_load, daemon=True).start()
+        # Đổi lựa chọn profile liên tục: chỉ lần load mới nhất được hiển thị
+        task_executor.submit("db", do_load, key="groups.load")
 
     def _on_groups_loaded(self, groups: List[Dict]):
         """Callback khi load groups xong (single profile)"""
         self.groups = groups
-        self.selected_group_ids = [g['id'] for g in self.groups if g.get('is_selected')]
+        group_selection.prime(self.groups)
+        self.selected_group_ids = [g['id'] for g in self.groups if group_selection.is_selected(g['id'])]
 
         # Ẩn profile tabs
         self.profile_tabs_frame.pack_forget()
@@ -1053,7 +1037,8 @@ class GroupsTab(ctk.CTkFrame):
             for g in groups:
                 self.profile_group_vars[uuid][g['id']] = ctk.BooleanVar(value=g.get('is_selected', False))
 
-        self.selected_group_ids = [g['id'] for g in all_groups if g.get('is_selected')]
+        group_selection.prime(all_groups)
+        self.selected_group_ids = [g['id'] for g in all_groups if group_selection.is_selected(g['id'])]
 
         # Tạo profile tabs
         self._create_profile_tabs()
@@ -1225,12 +1210,12 @@ class GroupsTab(ctk.CTkFrame):
                         # Update progress
                         self._scan_completed_count += 1
                         progress = self._scan_completed_count / total
-                        self.after(0, lambda p=progress, c=self._scan_completed_count, t=total:
-                                   self._update_scan_progress(p, c, t))
+                        ui_updates.publish(self, "scan_progress", self._update_scan_progress,
+                                           progress, self._scan_completed_count, total)
                     except Exception as e:
                         print(f"[ERROR] Future {uuid}: {e}")
 
-            self.after(0, lambda: self._on_scan_complete(all_groups))
+            ui_updates.post(self, self._on_scan_complete, all_groups)
 
         threading.Thread(target=do_parallel_scan, daemon=True).start()
 
@@ -1398,6 +1383,7 @@ class GroupsTab(ctk.CTkFrame):
                 return []
 
             # Parse HTML
+            from bs4 import BeautifulSoup
             soup = BeautifulSoup(html_content, 'html.parser')
 
             # Thử nhiều cách tìm links nhóm
@@ -1482,15 +1468,15 @@ class GroupsTab(ctk.CTkFrame):
     def _execute_group_scan(self) -> List[Dict]:
         """Thực hiện quét nhóm từ Facebook sử dụng CDP"""
         if not BS4_AVAILABLE:
-            self.after(0, lambda: self._set_status("Cần cài: pip install beautifulsoup4", "error"))
+            ui_updates.publish(self, "status", self._set_status, "Cần cài: pip install beautifulsoup4", "error")
             return []
 
         groups_found = []
 
         try:
             # Bước 1: Mở browser qua Hidemium API
-            self.after(0, lambda: self._set_status("Đang mở browser...", "info"))
-            self.after(0, lambda: self.scan_progress.set(0.05))
+            ui_updates.publish(self, "status", self._set_status, "Đang mở browser...", "info")
+            ui_updates.publish(self, "scan_progress", self.scan_progress.set, 0.05)
 
             result = api.open_browser(self.current_profile_uuid)
             print(f"[DEBUG] open_browser response: {result}")
@@ -1500,7 +1486,7 @@ class GroupsTab(ctk.CTkFrame):
             if status not in ['successfully', 'success', True]:
                 if 'already' not in str(result).lower() and 'running' not in str(result).lower():
                     error = result.get('message') or result.get('title') or str(result)
-                    self.after(0, lambda e=error: self._set_status(f"Lỗi mở browser: {e}", "error"))
+                    ui_updates.publish(self, "status", self._set_status, f"Lỗi mở browser: {error}", "error")
                     return []
 
             # Lấy thông tin CDP
@@ -1514,20 +1500,20 @@ class GroupsTab(ctk.CTkFrame):
                     remote_port = int(match.group(1))
 
             if not remote_port:
-                self.after(0, lambda: self._set_status("Không lấy được remote_port", "error"))
+                ui_updates.publish(self, "status", self._set_status, "Không lấy được remote_port", "error")
                 return []
 
             cdp_base = f"http://127.0.0.1:{remote_port}"
             print(f"[DEBUG] CDP base: {cdp_base}")
 
             # Đợi browser khởi động
-            self.after(0, lambda: self._set_status("Đợi browser khởi động...", "info"))
-            self.after(0, lambda: self.scan_progress.set(0.1))
+            ui_updates.publish(self, "status", self._set_status, "Đợi browser khởi động...", "info")
+            ui_updates.publish(self, "scan_progress", self.scan_progress.set, 0.1)
             time.sleep(3)
 
             # Bước 2: Lấy danh sách tabs qua CDP
-            self.after(0, lambda: self._set_status("Đang kết nối CDP...", "info"))
-            self.after(0, lambda: self.scan_progress.set(0.15))
+            ui_updates.publish(self, "status", self._set_status, "Đang kết nối CDP...", "info")
+            ui_updates.publish(self, "scan_progress", self.scan_progress.set, 0.15)
 
             try:
                 resp = requests.get(f"{cdp_base}/json", timeout=10)
@@ -1535,7 +1521,7 @@ class GroupsTab(ctk.CTkFrame):
                 print(f"[DEBUG] Found {len(tabs)} tabs")
             except Exception as e:
                 print(f"[DEBUG] CDP connection error: {e}")
-                self.after(0, lambda err=str(e): self._set_status(f"Lỗi kết nối CDP: {err}", "error"))
+                ui_updates.publish(self, "status", self._set_status, f"Lỗi kết nối CDP: {e}", "error")
                 return []
 
             # Tìm tab page (không phải devtools, extension...)
@@ -1546,7 +1532,7 @@ class GroupsTab(ctk.CTkFrame):
                     break
 
             if not page_ws:
-                self.after(0, lambda: self._set_status("Không tìm thấy tab page", "error"))
+                ui_updates.publish(self, "status", self._set_status, "Không tìm thấy tab page", "error")
                 return []
 
             print(f"[DEBUG] Page WebSocket: {page_ws}")
@@ -1555,8 +1541,8 @@ class GroupsTab(ctk.CTkFrame):
             import websocket
             import json as json_module
 
-            self.after(0, lambda: self._set_status("Đang mở trang nhóm...", "info"))
-            self.after(0, lambda: self.scan_progress.set(0.2))
+            ui_updates.publish(self, "status", self._set_status, "Đang mở trang nhóm...", "info")
+            ui_updates.publish(self, "scan_progress", self.scan_progress.set, 0.2)
 
             # Kết nối WebSocket - thử nhiều cách để bypass CORS
             ws = None
@@ -1597,7 +1583,7 @@ class GroupsTab(ctk.CTkFrame):
                     print(f"[DEBUG] default failed: {e3}")
 
             if ws is None:
-                self.after(0, lambda err=connection_error: self._set_status(f"Lỗi WebSocket: {err}", "error"))
+                ui_updates.publish(self, "status", self._set_status, f"Lỗi WebSocket: {connection_error}", "error")
                 return []
 
             # Navigate đến trang nhóm
@@ -1610,13 +1596,13 @@ class GroupsTab(ctk.CTkFrame):
             ws.recv()  # Nhận response
 
             # Đợi trang load
-            self.after(0, lambda: self._set_status("Đợi trang load...", "info"))
-            self.after(0, lambda: self.scan_progress.set(0.25))
+            ui_updates.publish(self, "status", self._set_status, "Đợi trang load...", "info")
+            ui_updates.publish(self, "scan_progress", self.scan_progress.set, 0.25)
             time.sleep(8)
 
             # Bước 4: Scroll để load nhóm
-            self.after(0, lambda: self._set_status("Đang scroll load nhóm...", "info"))
-            self.after(0, lambda: self.scan_progress.set(0.3))
+            ui_updates.publish(self, "status", self._set_status, "Đang scroll load nhóm...", "info")
+            ui_updates.publish(self, "scan_progress", self.scan_progress.set, 0.3)
 
             for i in range(10):
                 # Scroll xuống
@@ -1629,12 +1615,12 @@ class GroupsTab(ctk.CTkFrame):
                 time.sleep(2)
 
                 progress = 0.3 + (i / 10) * 0.4
-                self.after(0, lambda p=progress, s=i+1: self._set_status(f"Scroll lần {s}...", "info"))
-                self.after(0, lambda p=progress: self.scan_progress.set(p))
+                ui_updates.publish(self, "status", self._set_status, f"Scroll lần {i + 1}...", "info")
+                ui_updates.publish(self, "scan_progress", self.scan_progress.set, progress)
 
             # Bước 5: Lấy HTML content
-            self.after(0, lambda: self._set_status("Đang lấy nội dung trang...", "info"))
-            self.after(0, lambda: self.scan_progress.set(0.75))
+            ui_updates.publish(self, "status", self._set_status, "Đang lấy nội dung trang...", "info")
+            ui_updates.publish(self, "scan_progress", self.scan_progress.set, 0.75)
 
             ws.send(json_module.dumps({
                 "id": 200,
@@ -1647,20 +1633,21 @@ class GroupsTab(ctk.CTkFrame):
             ws.close()
 
             if not html_content:
-                self.after(0, lambda: self._set_status("Không lấy được HTML", "error"))
+                ui_updates.publish(self, "status", self._set_status, "Không lấy được HTML", "error")
                 return []
 
             print(f"[DEBUG] Got HTML length: {len(html_content)}")
 
             # Bước 6: Parse HTML
-            self.after(0, lambda: self._set_status("Đang phân tích...", "info"))
-            self.after(0, lambda: self.scan_progress.set(0.85))
+            ui_updates.publish(self, "status", self._set_status, "Đang phân tích...", "info")
+            ui_updates.publish(self, "scan_progress", self.scan_progress.set, 0.85)
 
+            from bs4 import BeautifulSoup
             soup = BeautifulSoup(html_content, 'html.parser')
             links = soup.find_all('a', {'aria-label': 'Xem nhóm'})
 
             print(f"[DEBUG] Found {len(links)} group links")
-            self.after(0, lambda n=len(links): self._set_status(f"Tìm thấy {n} link nhóm...", "info"))
+            ui_updates.publish(self, "status", self._set_status, f"Tìm thấy {len(links)} link nhóm...", "info")
 
             for link in links:
                 href = link.get('href', '')
@@ -1702,14 +1689,14 @@ class GroupsTab(ctk.CTkFrame):
                                 'member_count': 0
                             })
 
-            self.after(0, lambda: self.scan_progress.set(0.95))
-            self.after(0, lambda n=len(groups_found): self._set_status(f"Tìm thấy {n} nhóm!", "info"))
+            ui_updates.publish(self, "scan_progress", self.scan_progress.set, 0.95)
+            ui_updates.publish(self, "status", self._set_status, f"Tìm thấy {len(groups_found)} nhóm!", "info")
 
         except Exception as e:
             import traceback
             error_detail = traceback.format_exc()
             print(f"Scan error: {error_detail}")
-            self.after(0, lambda err=str(e): self._set_status(f"Lỗi: {err}", "error"))
+            ui_updates.publish(self, "status", self._set_status, f"Lỗi: {e}", "error")
 
         return groups_found
 
@@ -1754,87 +1741,71 @@ class GroupsTab(ctk.CTkFrame):
         else:
             self.groups = []
 
-        self.selected_group_ids = [g['id'] for g in self.groups if g.get('is_selected')]
+        group_selection.prime(self.groups)
+        self.selected_group_ids = [g['id'] for g in self.groups if group_selection.is_selected(g['id'])]
         self._render_scan_list()
         self._render_post_groups_list(force_rebuild=True)  # Rebuild khi load profile mới
         self._update_stats()
 
     def _render_scan_list(self):
         """Render danh sách nhóm trong tab Quét"""
-        for widget in self.scan_list.winfo_children():
-            widget.destroy()
-
-        # Clear cache when re-rendering
-        self._scan_checkbox_vars.clear()
-
-        if not self.groups:
-            self.scan_empty_label = ctk.CTkLabel(
-                self.scan_list,
-                text="Chưa có nhóm nào\nChọn profile và bấm 'Quét nhóm'",
-                font=ctk.CTkFont(size=13),
-                text_color=COLORS["text_secondary"]
-            )
-            self.scan_empty_label.pack(pady=50)
-            return
-
-        for group in self.groups:
-            self._create_scan_row(group)
+        self.scan_list.set_items(list(self.groups))
 
-    def _create_scan_row(self, group: Dict):
-        """Tạo row cho group"""
-        row = ctk.CTkFrame(self.scan_list, fg_color=COLORS["bg_secondary"], corner_radius=5, height=36)
-        row.pack(fill="x", pady=2)
+    def _create_scan_row(self, parent) -> ctk.CTkFrame:
+        """Row rỗng cho scan_list, dữ liệu gắn qua _bind_scan_row"""
+        row = ctk.CTkFrame(parent, fg_color=COLORS["bg_secondary"], corner_radius=5, height=36)
         row.pack_propagate(False)
+        row.group_id = None
 
-        var = ctk.BooleanVar(value=group['id'] in self.selected_group_ids)
-        # Cache the BooleanVar for later sync
-        self._scan_checkbox_vars[group['id']] = var
-
-        cb = ctk.CTkCheckBox(
-            row, text="", variable=var, width=25,
+        row.var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            row, text="", variable=row.var, width=25,
             checkbox_width=18, checkbox_height=18,
             fg_color=COLORS["accent"],
-            command=lambda gid=group['id'], v=var: self._toggle_group_selection(gid, v)
-        )
-        cb.pack(side="left", padx=3)
+            command=lambda: self._toggle_group_selection(row.group_id, row.var)
+        ).pack(side="left", padx=3)
 
-        ctk.CTkLabel(row, text=str(group.get('id', '')), width=50,
-                     font=ctk.CTkFont(size=10), text_color=COLORS["text_secondary"]).pack(side="left")
+        row.id_label = ctk.CTkLabel(row, text="", width=50, **text_style("row_small_muted"))
+        row.id_label.pack(side="left")
 
-        name = group.get('group_name', 'Unknown')[:25]
-        ctk.CTkLabel(row, text=name, width=220, font=ctk.CTkFont(size=10),
-                     text_color=COLORS["text_primary"], anchor="w").pack(side="left", padx=3)
+        row.name_label = ctk.CTkLabel(row, text="", width=220, **text_style("row_small"), anchor="w")
+        row.name_label.pack(side="left", padx=3)
 
-        gid = group.get('group_id', '')[:18]
-        ctk.CTkLabel(row, text=gid, width=150, font=ctk.CTkFont(size=9),
-                     text_color=COLORS["accent"], anchor="w").pack(side="left", padx=3)
+        row.gid_label = ctk.CTkLabel(row, text="", width=150, **text_style("row_tiny_link"), anchor="w")
+        row.gid_label.pack(side="left", padx=3)
 
-        members = group.get('member_count', 0)
-        ctk.CTkLabel(row, text=f"{members:,}" if members else "-", width=90,
-                     font=ctk.CTkFont(size=10), text_color=COLORS["text_secondary"]).pack(side="left")
+        row.members_label = ctk.CTkLabel(row, text="", width=90, **text_style("row_small_muted"))
+        row.members_label.pack(side="left")
 
-        created = group.get('created_at', '')[:10] if group.get('created_at') else '-'
-        ctk.CTkLabel(row, text=created, width=100, font=ctk.CTkFont(size=9),
-                     text_color=COLORS["text_secondary"]).pack(side="left")
+        row.created_label = ctk.CTkLabel(row, text="", width=100, **text_style("row_tiny_muted"))
+        row.created_label.pack(side="left")
 
         ctk.CTkButton(row, text="X", width=25, height=22, fg_color=COLORS["error"],
                       hover_color="#ff4757", corner_radius=4,
-                      command=lambda gid=group['id']: self._delete_group(gid)).pack(side="right", padx=3)
+                      command=lambda: self._delete_group(row.group_id)).pack(side="right", padx=3)
+        return row
+
+    def _bind_scan_row(self, row: ctk.CTkFrame, index: int, group: Dict):
+        """Gắn group vào row của scan_list"""
+        row.group_id = group['id']
+        row.var.set(group_selection.is_selected(group['id']))
+        row.id_label.configure(text=str(group.get('id', '')))
+        row.name_label.configure(text=group.get('group_name', 'Unknown')[:25])
+        row.gid_label.configure(text=group.get('group_id', '')[:18])
+        members = group.get('member_count', 0)
+        row.members_label.configure(text=f"{members:,}" if members else "-")
+        row.created_label.configure(text=group.get('created_at', '')[:10] if group.get('created_at') else '-')
 
     def _toggle_group_selection(self, group_id: int, var: ctk.BooleanVar):
         """Toggle chọn group - optimized to avoid full re-render"""
         is_selected = var.get()
-        update_group_selection(group_id, 1 if is_selected else 0)
+        group_selection.set(group_id, is_selected)  # Ghi xuống DB theo lô (debounce)
 
         if is_selected and group_id not in self.selected_group_ids:
             self.selected_group_ids.append(group_id)
         elif not is_selected and group_id in self.selected_group_ids:
             self.selected_group_ids.remove(group_id)
 
-        # Sync với checkbox trong post tab (không render lại)
-        if group_id in self.group_checkbox_vars:
-            self.group_checkbox_vars[group_id].set(is_selected)
-
         self._update_stats()
         # Sync checkbox state in post_groups_list without full re-render
         self._sync_checkbox_state(group_id, is_selected, 'post')
@@ -1884,121 +1855,67 @@ class GroupsTab(ctk.CTkFrame):
     # ==================== POST TAB ====================
 
     def _on_group_filter_change(self, *args):
-        """Khi filter thay đổi"""
-        self._apply_group_filter()
-
-    def _normalize_vietnamese(self, text: str) -> str:
-        """Chuẩn hóa text tiếng Việt để tìm kiếm - bỏ dấu, lowercase"""
-        if not text:
-            return ""
-        # Lowercase
-        text = text.lower()
-        # Normalize unicode
-        text = unicodedata.normalize('NFD', text)
-        # Remove diacritics (combining characters)
-        text = ''.join(c for c in text if unicodedata.category(c) != 'Mn')
-        # Normalize back
-        text = unicodedata.normalize('NFC', text)
-        # Thay thế đ -> d
-        text = text.replace('đ', 'd').replace('Đ', 'd')
-        return text
-
-    def _apply_group_filter(self):
+        """Khi filter thay đổi - lọc sau khi ngừng gõ"""
+        self._group_filter_debounce()
+
+    def _apply_group_filter(self, keep_position: bool = False):
         """Áp dụng filter cho danh sách nhóm - hỗ trợ tiếng Việt"""
+        self._group_filter_debounce.cancel()
         filter_text = self.group_filter_var.get().strip()
 
         if not filter_text:
             # Hiển thị tất cả nếu không có filter
-            for widget in self.group_checkbox_widgets.values():
-                widget.pack(fill="x", pady=1)
+            self.post_groups_list.set_items(list(self._post_groups), keep_position=keep_position)
             return
 
-        # Chuẩn hóa filter text
-        filter_normalized = self._normalize_vietnamese(filter_text)
-        filter_lower = filter_text.lower()
-
-        for group_id, widget in self.group_checkbox_widgets.items():
-            group = next((g for g in self.groups if g['id'] == group_id), None)
-            if group:
-                group_name = group.get('group_name', '')
-                # Kiểm tra cả 2 cách: có dấu và không dấu
-                name_lower = group_name.lower()
-                name_normalized = self._normalize_vietnamese(group_name)
-
-                # Match nếu tìm thấy trong bản gốc hoặc bản không dấu
-                if filter_lower in name_lower or filter_normalized in name_normalized:
-                    widget.pack(fill="x", pady=1)
-                else:
-                    widget.pack_forget()
+        # Index trong bộ nhớ đã bỏ dấu (đ -> d), gõ thêm ký tự chỉ lọc tiếp trên kết quả trước
+        index = self._post_groups_index
+        if (index is None or self._post_groups_indexed is not self._post_groups
+                or len(index) != len(self._post_groups)):
+            index = self._post_groups_index = SearchIndex(self._post_groups, fields=('group_name',))
+            self._post_groups_indexed = self._post_groups
+        self.post_groups_list.set_items(index.search(filter_text), keep_position=keep_position)
 
     def _render_post_groups_list(self, force_rebuild=False):
         """Render danh sách nhóm với checkbox - tối ưu cho multi-profile tabs"""
-        # Chỉ rebuild khi cần thiết
-        if force_rebuild or not self.group_checkbox_widgets:
-            for widget in self.post_groups_list.winfo_children():
-                widget.destroy()
-            self.group_checkbox_widgets = {}
-            self.group_checkbox_vars = {}
-
-        # Clear cache when re-rendering
-        self._post_checkbox_vars.clear()
-
         # Xác định danh sách groups để hiển thị
         if self.current_tab_profile and self.current_tab_profile in self.profile_groups:
             # Multi-profile mode: hiển thị groups của tab hiện tại
-            groups_to_show = self.profile_groups[self.current_tab_profile]
+            self._post_groups = self.profile_groups[self.current_tab_profile]
         else:
             # Single profile mode
-            groups_to_show = self.groups
+            self._post_groups = self.groups
 
-        if not groups_to_show:
-            self.post_empty_label = ctk.CTkLabel(
-                self.post_groups_list,
-                text="Chưa có nhóm\nQuét nhóm trước",
-                font=ctk.CTkFont(size=12),
-                text_color=COLORS["text_secondary"]
-            )
-            self.post_empty_label.pack(pady=30)
-            return
-
-        # Tạo hoặc cập nhật widgets
-        for group in groups_to_show:
-            group_id = group['id']
-
-            if group_id in self.group_checkbox_widgets:
-                # Cập nhật giá trị checkbox
-                self.group_checkbox_vars[group_id].set(group_id in self.selected_group_ids)
-            else:
-                # Tạo mới
-                row = ctk.CTkFrame(self.post_groups_list, fg_color="transparent", height=28)
-                row.pack(fill="x", pady=1)
-                row.pack_propagate(False)
-
-                var = ctk.BooleanVar(value=group_id in self.selected_group_ids)
-                self.group_checkbox_vars[group_id] = var
-                # Cache for sync function
-                self._post_checkbox_vars[group_id] = var
-
-                cb = ctk.CTkCheckBox(
-                    row,
-                    text=group.get('group_name', 'Unknown')[:35],
-                    variable=var, width=300,
-                    checkbox_width=16, checkbox_height=16,
-                    fg_color=COLORS["accent"],
-                    font=ctk.CTkFont(size=10),
-                    command=lambda gid=group_id, v=var: self._toggle_group_selection_post(gid, v)
-                )
-                cb.pack(side="left", padx=3)
+        # Áp dụng filter (giữ vị trí cuộn nếu chỉ cập nhật trạng thái chọn)
+        self._apply_group_filter(keep_position=not force_rebuild)
 
-                self.group_checkbox_widgets[group_id] = row
+    def _create_post_group_row(self, parent) -> ctk.CTkFrame:
+        """Row rỗng cho post_groups_list"""
+        row = ctk.CTkFrame(parent, fg_color="transparent", height=28)
+        row.pack_propagate(False)
+        row.group_id = None
+        row.var = ctk.BooleanVar(value=False)
+        row.checkbox = ctk.CTkCheckBox(
+            row,
+            text="",
+            variable=row.var, width=300,
+            checkbox_width=16, checkbox_height=16,
+            fg_color=COLORS["accent"],
+            font=font(10),
+            command=lambda: self._toggle_group_selection_post(row.group_id, row.var)
+        )
+        row.checkbox.pack(side="left", padx=3)
+        return row
 
-        # Áp dụng filter
-        self._apply_group_filter()
+    def _bind_post_group_row(self, row: ctk.CTkFrame, index: int, group: Dict):
+        row.group_id = group['id']
+        row.var.set(group_selection.is_selected(group['id']))
+        row.checkbox.configure(text=group.get('group_name', 'Unknown')[:35])
 
     def _toggle_group_selection_post(self, group_id: int, var: ctk.BooleanVar):
         """Toggle group từ tab Đăng - optimized to avoid full re-render"""
         is_selected = var.get()
-        update_group_selection(group_id, 1 if is_selected else 0)
+        group_selection.set(group_id, is_selected)  # Ghi xuống DB theo lô (debounce)
 
         if is_selected and group_id not in self.selected_group_ids:
             self.selected_group_ids.append(group_id)
@@ -2018,25 +1935,13 @@ class GroupsTab(ctk.CTkFrame):
             is_selected: New selection state
             target: 'scan' to sync scan_list, 'post' to sync post_groups_list
         """
-        if target == 'scan':
-            var = self._scan_checkbox_vars.get(group_id)
-        else:
-            var = self._post_checkbox_vars.get(group_id)
-
-        if var is not None:
-            var.set(is_selected)
+        # Row đọc trạng thái chọn từ group_selection khi gắn dữ liệu: chỉ cần gắn lại các row đang hiển thị
+        target_list = self.scan_list if target == 'scan' else self.post_groups_list
+        target_list.refresh()
 
     def _get_visible_group_ids(self) -> List[int]:
         """Lấy danh sách group IDs đang hiển thị (sau khi lọc)"""
-        visible_ids = []
-        for group_id, widget in self.group_checkbox_widgets.items():
-            # Check if widget is currently visible (packed)
-            try:
-                if widget.winfo_ismapped():
-                    visible_ids.append(group_id)
-            except:
-                pass
-        return visible_ids
+        return [g['id'] for g in self.post_groups_list.items]
 
     def _toggle_select_all(self):
         """Toggle chọn tất cả - chỉ chọn các nhóm đang hiển thị"""
@@ -2045,26 +1950,21 @@ class GroupsTab(ctk.CTkFrame):
         # Lấy danh sách group IDs đang hiển thị (sau filter)
         visible_group_ids = self._get_visible_group_ids()
 
+        # Một lần ghi cho cả danh sách thay vì mỗi nhóm một UPDATE
+        group_selection.set_many(visible_group_ids, select_all)
+
         if select_all:
             # Chỉ chọn các nhóm đang hiển thị
-            for gid in visible_group_ids:
-                if gid not in self.selected_group_ids:
-                    self.selected_group_ids.append(gid)
-                update_group_selection(gid, 1)
-                # Sync checkbox
-                if gid in self.group_checkbox_vars:
-                    self.group_checkbox_vars[gid].set(True)
+            already = set(self.selected_group_ids)
+            self.selected_group_ids.extend(gid for gid in visible_group_ids if gid not in already)
         else:
             # Bỏ chọn các nhóm đang hiển thị
-            for gid in visible_group_ids:
-                if gid in self.selected_group_ids:
-                    self.selected_group_ids.remove(gid)
-                update_group_selection(gid, 0)
-                # Sync checkbox
-                if gid in self.group_checkbox_vars:
-                    self.group_checkbox_vars[gid].set(False)
+            visible = set(visible_group_ids)
+            self.selected_group_ids = [gid for gid in self.selected_group_ids if gid not in visible]
 
-        self._render_scan_list()
+        # Sync checkbox
+        self.post_groups_list.refresh()
+        self.scan_list.refresh()
         self._update_stats()
 
     def _load_contents(self):
@@ -2253,7 +2153,7 @@ class GroupsTab(ctk.CTkFrame):
                 except Exception as e:
                     import traceback
                     print(f"[ERROR] Posting {puuid}: {traceback.format_exc()}")
-                    self.after(0, lambda: self._on_posting_error(str(e)))
+                    ui_updates.post(self, self._on_posting_error, str(e))
 
             threading.Thread(target=do_post, daemon=True).start()
 
@@ -2264,12 +2164,12 @@ class GroupsTab(ctk.CTkFrame):
         import json as json_module
 
         total = len(groups)
-        self.after(0, lambda: self._set_status("Đang kết nối browser...", "info"))
+        ui_updates.publish(self, "status", self._set_status, "Đang kết nối browser...", "info")
 
         # Mở browser và lấy thông tin CDP
         result = api.open_browser(profile_uuid)
         if result.get('type') == 'error':
-            self.after(0, lambda: self._on_posting_error(f"Không mở được browser: {result.get('title', '')}"))
+            ui_updates.post(self, self._on_posting_error, f"Không mở được browser: {result.get('title', '')}")
             return
 
         data = result.get('data', {})
@@ -2282,7 +2182,7 @@ class GroupsTab(ctk.CTkFrame):
                 remote_port = int(match.group(1))
 
         if not remote_port:
-            self.after(0, lambda: self._on_posting_error("Không lấy được remote_port"))
+            ui_updates.post(self, self._on_posting_error, "Không lấy được remote_port")
             return
 
         cdp_base = f"http://127.0.0.1:{remote_port}"
@@ -2358,7 +2258,7 @@ class GroupsTab(ctk.CTkFrame):
                 time.sleep(1)
 
         if not page_ws:
-            self.after(0, lambda: self._on_posting_error("Không kết nối được CDP"))
+            ui_updates.post(self, self._on_posting_error, "Không kết nối được CDP")
             return
 
         # Kết nối WebSocket
@@ -2372,11 +2272,11 @@ class GroupsTab(ctk.CTkFrame):
                 try:
                     ws = websocket.create_connection(page_ws, timeout=30)
                 except Exception as e:
-                    self.after(0, lambda: self._on_posting_error(f"WebSocket error: {e}"))
+                    ui_updates.post(self, self._on_posting_error, f"WebSocket error: {e}")
                     return
 
         if not ws:
-            self.after(0, lambda: self._on_posting_error("Không kết nối được WebSocket"))
+            ui_updates.post(self, self._on_posting_error, "Không kết nối được WebSocket")
             return
 
         self._thread_local.posting_ws = ws
@@ -2398,11 +2298,11 @@ class GroupsTab(ctk.CTkFrame):
                 break
 
             group_name = group.get('group_name', 'Unknown')
-            self.after(0, lambda g=group_name, n=i+1, t=total:
-                       self.post_status_label.configure(text=f"Đang đăng: {g} ({n}/{t})"))
+            ui_updates.publish(self, "post_status", self.post_status_label.configure,
+                               text=f"Đang đăng: {group_name} ({i + 1}/{total})")
 
             progress = (i + 1) / total
-            self.after(0, lambda p=progress: self.post_progress.set(p))
+            ui_updates.publish(self, "post_progress", self.post_progress.set, progress)
 
             # Get random content
             content = self._get_random_content()
@@ -2432,7 +2332,7 @@ class GroupsTab(ctk.CTkFrame):
                 'post_url': post_url if result else '',
                 'status': 'success' if result else 'failed',
                 'error_message': '' if result else 'Posting failed'
-            })
+            }, defer=True)
 
             # Add to posted URLs
             if result:
@@ -2442,7 +2342,7 @@ class GroupsTab(ctk.CTkFrame):
                     'post_url': post_url,
                     'time': datetime.now().strftime('%H:%M:%S')
                 })
-                self.after(0, self._render_posted_urls)
+                ui_updates.post(self, self._render_posted_urls)
 
             # Delay
             if i < total - 1:
@@ -2461,7 +2361,7 @@ class GroupsTab(ctk.CTkFrame):
         except:
             pass
 
-        self.after(0, lambda: self._on_posting_complete(success_count))
+        ui_updates.post(self, self._on_posting_complete, success_count)
 
     def _post_to_group(self, group: Dict, content: str, images: List[str]) -> bool:
         """Đăng bài vào group - placeholder (dùng _post_to_group_cdp thay thế)"""
@@ -3999,8 +3899,7 @@ class GroupsTab(ctk.CTkFrame):
             self.posted_empty = ctk.CTkLabel(
                 self.posted_urls_list,
                 text="Chưa có bài đăng nào",
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["text_secondary"]
+                **text_style("row_muted")
             )
             self.posted_empty.pack(pady=20)
             return
@@ -4011,19 +3910,19 @@ class GroupsTab(ctk.CTkFrame):
             row.pack_propagate(False)
 
             ctk.CTkLabel(row, text=item['group_name'][:18], width=150,
-                         font=ctk.CTkFont(size=9), text_color=COLORS["text_primary"],
+                         font=font(9), text_color=COLORS["text_primary"],
                          anchor="w").pack(side="left", padx=3)
 
             url = item['post_url']
             url_label = ctk.CTkLabel(row, text=url[:45], width=280,
-                                     font=ctk.CTkFont(size=9), text_color=COLORS["accent"],
+                                     **text_style("row_tiny_link"),
                                      anchor="w", cursor="hand2")
             url_label.pack(side="left", padx=3)
             # Bind click để mở URL trong browser
             url_label.bind("<Button-1>", lambda e, u=url: self._open_url(u))
 
             ctk.CTkLabel(row, text=item['time'], width=60,
-                         font=ctk.CTkFont(size=9), text_color=COLORS["text_secondary"]).pack(side="left")
+                         **text_style("row_tiny_muted")).pack(side="left")
 
     # ==================== BOOST TAB ====================
 
@@ -4034,6 +3933,7 @@ class GroupsTab(ctk.CTkFrame):
 
         # Reset to first page when filter changes
         self._boost_page = 0
+        self._boost_cursors = [None]
 
         # Calculate date_from based on filter
         filter_val = self.date_filter_var.get()
@@ -4065,16 +3965,21 @@ class GroupsTab(ctk.CTkFrame):
         if not self.current_profile_uuid:
             return
 
-        offset = self._boost_page * self._boost_page_size
+        if self._boost_page >= len(self._boost_cursors):
+            # Dữ liệu đổi sau lần đếm (trang trước hết bài): chưa có cursor cho trang này, về trang đầu
+            self._boost_page = 0
+            self._boost_cursors = [None]
 
-        # Fetch posts with SQL-level filtering and pagination
-        posts = get_post_history_filtered(
+        # Keyset pagination: seek từ cursor của trang, không scan OFFSET
+        posts, next_cursor = get_post_history_page(
             profile_uuid=self.current_profile_uuid,
             date_from=date_from,
             status='success',
             limit=self._boost_page_size,
-            offset=offset
+            after=self._boost_cursors[self._boost_page]
         )
+        if next_cursor and len(self._boost_cursors) == self._boost_page + 1:
+            self._boost_cursors.append(next_cursor)
 
         self._boost_posts_cache = posts
         self._render_boost_urls(posts)
@@ -4141,7 +4046,7 @@ class GroupsTab(ctk.CTkFrame):
             self.boost_empty_label = ctk.CTkLabel(
                 self.boost_urls_list,
                 text="Chưa có bài đăng nào\nĐăng bài ở tab trước",
-                font=ctk.CTkFont(size=12),
+                font=font(12),
                 text_color=COLORS["text_secondary"]
             )
             self.boost_empty_label.pack(pady=40)
@@ -4164,7 +4069,7 @@ class GroupsTab(ctk.CTkFrame):
                 width=350,
                 checkbox_width=16, checkbox_height=16,
                 fg_color=COLORS["accent"],
-                font=ctk.CTkFont(size=10)
+                font=font(10)
             )
             cb.pack(side="left", padx=3)
 
@@ -4205,7 +4110,7 @@ class GroupsTab(ctk.CTkFrame):
             try:
                 self._execute_commenting(selected_posts, comments)
             except Exception as e:
-                self.after(0, lambda: self._on_commenting_error(str(e)))
+                ui_updates.post(self, self._on_commenting_error, str(e))
 
         threading.Thread(target=do_comment, daemon=True).start()
 
@@ -4217,12 +4122,12 @@ class GroupsTab(ctk.CTkFrame):
         total = len(posts)
         profile_uuid = self.current_profile_uuid
 
-        self.after(0, lambda: self._set_status("Đang kết nối browser...", "info"))
+        ui_updates.publish(self, "status", self._set_status, "Đang kết nối browser...", "info")
 
         # Mở browser
         result = api.open_browser(profile_uuid)
         if result.get('type') == 'error':
-            self.after(0, lambda: self._on_commenting_error(f"Không mở được browser"))
+            ui_updates.post(self, self._on_commenting_error, "Không mở được browser")
             return
 
         data = result.get('data', {})
@@ -4235,7 +4140,7 @@ class GroupsTab(ctk.CTkFrame):
                 remote_port = int(match.group(1))
 
         if not remote_port:
-            self.after(0, lambda: self._on_commenting_error("Không lấy được remote_port"))
+            ui_updates.post(self, self._on_commenting_error, "Không lấy được remote_port")
             return
 
         cdp_base = f"http://127.0.0.1:{remote_port}"
@@ -4272,7 +4177,7 @@ class GroupsTab(ctk.CTkFrame):
                 time.sleep(1)
 
         if not page_ws:
-            self.after(0, lambda: self._on_commenting_error("Không kết nối được CDP"))
+            ui_updates.post(self, self._on_commenting_error, "Không kết nối được CDP")
             return
 
         # Kết nối WebSocket
@@ -4283,7 +4188,7 @@ class GroupsTab(ctk.CTkFrame):
             try:
                 ws = websocket.create_connection(page_ws, timeout=30)
             except:
-                self.after(0, lambda: self._on_commenting_error("WebSocket error"))
+                ui_updates.post(self, self._on_commenting_error, "WebSocket error")
                 return
 
         self._commenting_ws = ws
@@ -4295,11 +4200,11 @@ class GroupsTab(ctk.CTkFrame):
                 break
 
             url = post.get('post_url', '')
-            self.after(0, lambda n=i+1, t=total:
-                       self.comment_status_label.configure(text=f"Đang comment: {n}/{t}"))
+            ui_updates.publish(self, "comment_status", self.comment_status_label.configure,
+                               text=f"Đang comment: {i + 1}/{total}")
 
             progress = (i + 1) / total
-            self.after(0, lambda p=progress: self.comment_progress.set(p))
+            ui_updates.publish(self, "comment_progress", self.comment_progress.set, progress)
 
             # Random comment
             comment = random.choice(comments)
@@ -4313,7 +4218,7 @@ class GroupsTab(ctk.CTkFrame):
             if result:
                 success_count += 1
             log_text = f"[{timestamp}] {status}: {url[:40]}... - '{comment[:25]}...'"
-            self.after(0, lambda t=log_text: self._append_comment_log(t))
+            ui_updates.post(self, self._append_comment_log, log_text)
 
             # Delay
             if i < total - 1:
@@ -4332,7 +4237,7 @@ class GroupsTab(ctk.CTkFrame):
         except:
             pass
 
-        self.after(0, lambda: self._on_commenting_complete(success_count))
+        ui_updates.post(self, self._on_commenting_complete, success_count)
 
     def _comment_on_post(self, post: Dict, comment: str) -> bool:
         """Bình luận vào bài - placeholder"""
@@ -9,7 +9,7 @@ import os
 import queue
 from datetime import datetime
 from config import COLORS
-from widgets import ModernCard, ModernButton, ModernEntry
+from widgets import ModernCard, ModernButton, ModernEntry, font, text_style
 from api_service import api
 from automation.window_manager import get_window_manager, acquire_window_slot, release_window_slot, get_window_bounds
 
@@ -441,7 +441,7 @@ class LoginTab(ctk.CTkFrame):
             ctk.CTkLabel(
                 self.profile_scroll,
                 text="Không có profile nào",
-                font=ctk.CTkFont(size=12),
+                font=font(12),
                 text_color=COLORS["text_secondary"]
             ).pack(pady=30)
             return
@@ -490,7 +490,7 @@ class LoginTab(ctk.CTkFrame):
             ctk.CTkLabel(
                 pf,
                 text=status_text,
-                font=ctk.CTkFont(size=11),
+                font=font(11),
                 text_color=status_color
             ).pack(side="right", padx=5)
 
@@ -746,8 +746,7 @@ class LoginTab(ctk.CTkFrame):
             ctk.CTkLabel(
                 self.account_scroll,
                 text="Không có tài khoản nào",
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["text_secondary"]
+                **text_style("row_muted")
             ).pack(pady=30)
             return
 
@@ -764,7 +763,7 @@ class LoginTab(ctk.CTkFrame):
             ctk.CTkLabel(
                 self.account_scroll,
                 text=text,
-                font=ctk.CTkFont(size=11),
+                font=font(11),
                 text_color=color
             ).pack(anchor="w", pady=1)
 
@@ -772,8 +771,7 @@ class LoginTab(ctk.CTkFrame):
             ctk.CTkLabel(
                 self.account_scroll,
                 text=f"... và {len(self.accounts) - 50} tài khoản khác",
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["text_secondary"]
+                **text_style("row_muted")
             ).pack(anchor="w", pady=5)
 
     def _update_xlsx_status(self, row: int, status: str):
@@ -10,28 +10,13 @@ import re
 import requests
 from datetime import datetime
 from config import COLORS
-from widgets import ModernButton, ModernEntry
+from widgets import ModernButton, ModernEntry, VirtualList, ui_updates, font, text_style
 from db import (
     get_profiles, get_pages, get_pages_for_profiles, save_page, delete_page, delete_pages_bulk,
-    update_page_selection, sync_pages, clear_pages, get_pages_count
+    page_selection, sync_pages, clear_pages, get_pages_count
 )
-from api_service import api
+from api_service import api, status_poller
 from automation.window_manager import acquire_window_slot, release_window_slot, get_window_bounds
-from automation.cdp_helper import CDPHelper
-
-# Import BeautifulSoup for HTML parsing
-try:
-    from bs4 import BeautifulSoup
-    BS4_AVAILABLE = True
-except ImportError:
-    BS4_AVAILABLE = False
-
-# Import CDP helper (optional)
-try:
-    from automation import CDPHelper
-    CDP_AVAILABLE = True
-except ImportError:
-    CDP_AVAILABLE = False
 
 
 class PagesTab(ctk.CTkFrame):
@@ -48,10 +33,10 @@ class PagesTab(ctk.CTkFrame):
         # Multi-profile support
         self.selected_profile_uuids: List[str] = []
         self.profile_checkbox_vars: Dict = {}
+        self._status_dots: Dict[str, ctk.CTkLabel] = {}  # uuid -> chấm trạng thái running
 
         # Page selection
-        self.page_checkbox_vars: Dict = {}
-        self.page_checkbox_widgets: Dict = {}
+        self._profile_names: Dict[str, str] = {}  # uuid -> tên profile, cho cột Profile
 
         # State flags
         self._is_scanning = False
@@ -59,6 +44,21 @@ class PagesTab(ctk.CTkFrame):
 
         self._create_ui()
         self._load_profiles()
+        # Trạng thái running lấy từ poller dùng chung, không đọc cột status trong DB
+        self._status_token = status_poller.subscribe(
+            lambda added, removed, running: ui_updates.publish(self, "running", self._on_running_changed, running)
+        )
+
+    def destroy(self):
+        status_poller.unsubscribe(self._status_token)
+        super().destroy()
+
+    def _on_running_changed(self, running: set):
+        """Tô lại chấm trạng thái của các profile đang hiển thị"""
+        for uuid, dot in self._status_dots.items():
+            color = COLORS["success"] if uuid in running else COLORS["text_secondary"]
+            if dot.cget("text_color") != color:
+                dot.configure(text_color=color)
 
     def _create_ui(self):
         """Tạo giao diện"""
@@ -259,18 +259,16 @@ class PagesTab(ctk.CTkFrame):
                 text_color=COLORS["text_primary"]
             ).pack(side="left", padx=3)
 
-        # Pages list
-        self.pages_list = ctk.CTkScrollableFrame(right_panel, fg_color="transparent")
-        self.pages_list.pack(fill="both", expand=True, padx=15, pady=(0, 15))
-
-        # Empty state
-        self.empty_label = ctk.CTkLabel(
-            self.pages_list,
-            text="Chưa có Page nào\nChọn profile và bấm 'Scan Page' để quét",
-            font=ctk.CTkFont(size=13),
-            text_color=COLORS["text_secondary"]
+        # Pages list (chỉ tạo row cho các page đang hiển thị)
+        self.pages_list = VirtualList(
+            right_panel,
+            row_height=44,
+            row_gap=4,
+            create_row=self._create_page_row,
+            bind_row=self._bind_page_row,
+            empty_text="Chưa có Page nào\nChọn profile và bấm 'Scan Page' để quét"
         )
-        self.empty_label.pack(pady=50)
+        self.pages_list.pack(fill="both", expand=True, padx=15, pady=(0, 15))
 
     def _load_profiles(self):
         """Load danh sách profiles và folders từ database"""
@@ -302,13 +300,13 @@ class PagesTab(ctk.CTkFrame):
         for widget in self.profile_list.winfo_children():
             widget.destroy()
         self.profile_checkbox_vars.clear()
+        self._status_dots.clear()
 
         if not self.profiles:
             ctk.CTkLabel(
                 self.profile_list,
                 text="Không có profile",
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["text_secondary"]
+                **text_style("row_muted")
             ).pack(pady=10)
             self._update_profile_stats()
             return
@@ -316,7 +314,6 @@ class PagesTab(ctk.CTkFrame):
         for profile in self.profiles:
             uuid = profile.get('uuid', '')
             name = profile.get('name', 'Unknown')
-            status = profile.get('status', 'stopped')
 
             frame = ctk.CTkFrame(self.profile_list, fg_color=COLORS["bg_card"], corner_radius=8, height=40)
             frame.pack(fill="x", pady=2)
@@ -336,19 +333,21 @@ class PagesTab(ctk.CTkFrame):
             cb.pack(side="left", padx=(10, 5))
 
             # Status indicator
-            status_color = COLORS["success"] if status == "running" else COLORS["text_secondary"]
-            ctk.CTkLabel(
+            status_color = COLORS["success"] if status_poller.is_running(uuid) else COLORS["text_secondary"]
+            dot = ctk.CTkLabel(
                 frame,
                 text="●",
-                font=ctk.CTkFont(size=10),
+                font=font(10),
                 text_color=status_color,
                 width=15
-            ).pack(side="left")
+            )
+            dot.pack(side="left")
+            self._status_dots[uuid] = dot
 
             ctk.CTkLabel(
                 frame,
                 text=name[:25] + "..." if len(name) > 25 else name,
-                font=ctk.CTkFont(size=12),
+                font=font(12),
                 text_color=COLORS["text_primary"],
                 anchor="w"
             ).pack(side="left", fill="x", expand=True, padx=5)
@@ -425,21 +424,14 @@ class PagesTab(ctk.CTkFrame):
 
         print(f"[Pages UI] Loading pages for profiles: {self.selected_profile_uuids}")
         self.pages = get_pages_for_profiles(self.selected_profile_uuids)
+        page_selection.prime(self.pages)
         print(f"[Pages UI] Loaded {len(self.pages)} pages from DB")
-        for p in self.pages:
-            print(f"[Pages UI]   - {p.get('page_name')} (page_id={p.get('page_id')}, profile={p.get('profile_uuid', '')[:12]})")
         self._render_pages()
 
     def _render_pages(self, search_text: str = None):
         """Render danh sách pages"""
         print(f"[Pages UI] _render_pages called with {len(self.pages)} pages")
 
-        # Clear existing
-        for widget in self.pages_list.winfo_children():
-            widget.destroy()
-        self.page_checkbox_vars.clear()
-        self.page_checkbox_widgets.clear()
-
         # Filter by search
         pages_to_show = self.pages
         if search_text:
@@ -448,122 +440,125 @@ class PagesTab(ctk.CTkFrame):
 
         print(f"[Pages UI] pages_to_show: {len(pages_to_show)}")
 
-        if not pages_to_show:
-            self.empty_label = ctk.CTkLabel(
-                self.pages_list,
-                text="Chưa có Page nào\nChọn profile và bấm 'Scan Page' để quét",
-                font=ctk.CTkFont(size=13),
-                text_color=COLORS["text_secondary"]
-            )
-            self.empty_label.pack(pady=50)
-            self._update_page_stats()
-            return
-
         # Get profile name map
-        profile_map = {p['uuid']: p.get('name', 'Unknown') for p in self.profiles}
-
-        for i, page in enumerate(pages_to_show):
-            page_id = page.get('id')
-            page_name = page.get('page_name', 'Unknown')
-            print(f"[Pages UI] Rendering page {i+1}: {page_name} (id={page_id})")
-            followers = page.get('follower_count', 0)
-            profile_uuid = page.get('profile_uuid', '')
-            profile_name = profile_map.get(profile_uuid, 'Unknown')
-            role = page.get('role', 'admin')
-            created = page.get('created_at', '')[:10] if page.get('created_at') else ''
-
-            frame = ctk.CTkFrame(self.pages_list, fg_color=COLORS["bg_card"], corner_radius=8, height=40)
-            frame.pack(fill="x", pady=2)
-            frame.pack_propagate(False)
+        self._profile_names = {p['uuid']: p.get('name', 'Unknown') for p in self.profiles}
+        self.pages_list.set_items(list(pages_to_show))
+        self._update_page_stats()
 
-            var = ctk.BooleanVar(value=False)
-            self.page_checkbox_vars[page_id] = var
+    def _create_page_row(self, parent) -> ctk.CTkFrame:
+        """Row rỗng cho pages_list, dữ liệu gắn qua _bind_page_row"""
+        frame = ctk.CTkFrame(parent, fg_color=COLORS["bg_card"], corner_radius=8, height=40)
+        frame.pack_propagate(False)
+        frame.page_id = None
 
-            cb = ctk.CTkCheckBox(
-                frame,
-                text="",
-                variable=var,
-                fg_color=COLORS["accent"],
-                width=30,
-                command=self._update_page_stats
-            )
-            cb.pack(side="left", padx=(10, 5))
-            self.page_checkbox_widgets[page_id] = cb
+        frame.var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            frame,
+            text="",
+            variable=frame.var,
+            fg_color=COLORS["accent"],
+            width=30,
+            command=lambda: self._toggle_page_selection(frame.page_id, frame.var)
+        ).pack(side="left", padx=(10, 5))
 
-            # Page name
-            ctk.CTkLabel(
-                frame,
-                text=page_name[:30] + "..." if len(page_name) > 30 else page_name,
-                font=ctk.CTkFont(size=12),
-                text_color=COLORS["text_primary"],
-                width=200,
-                anchor="w"
-            ).pack(side="left", padx=3)
+        # Page name
+        frame.name_label = ctk.CTkLabel(
+            frame,
+            text="",
+            font=font(12),
+            text_color=COLORS["text_primary"],
+            width=200,
+            anchor="w"
+        )
+        frame.name_label.pack(side="left", padx=3)
 
-            # Followers
-            followers_text = f"{followers:,}" if followers else "0"
-            ctk.CTkLabel(
-                frame,
-                text=followers_text,
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["accent"],
-                width=80,
-                anchor="w"
-            ).pack(side="left", padx=3)
+        # Followers
+        frame.followers_label = ctk.CTkLabel(
+            frame,
+            text="",
+            **text_style("row_link"),
+            width=80,
+            anchor="w"
+        )
+        frame.followers_label.pack(side="left", padx=3)
 
-            # Profile name
-            ctk.CTkLabel(
-                frame,
-                text=profile_name[:20] + "..." if len(profile_name) > 20 else profile_name,
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["text_secondary"],
-                width=150,
-                anchor="w"
-            ).pack(side="left", padx=3)
+        # Profile name
+        frame.profile_label = ctk.CTkLabel(
+            frame,
+            text="",
+            **text_style("row_muted"),
+            width=150,
+            anchor="w"
+        )
+        frame.profile_label.pack(side="left", padx=3)
 
-            # Role
-            role_color = COLORS["success"] if role == "admin" else COLORS["warning"]
-            ctk.CTkLabel(
-                frame,
-                text=role.capitalize(),
-                font=ctk.CTkFont(size=11),
-                text_color=role_color,
-                width=70,
-                anchor="w"
-            ).pack(side="left", padx=3)
+        # Role
+        frame.role_label = ctk.CTkLabel(
+            frame,
+            text="",
+            font=font(11),
+            width=70,
+            anchor="w"
+        )
+        frame.role_label.pack(side="left", padx=3)
 
-            # Created date
-            ctk.CTkLabel(
-                frame,
-                text=created,
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["text_secondary"],
-                width=100,
-                anchor="w"
-            ).pack(side="left", padx=3)
+        # Created date
+        frame.created_label = ctk.CTkLabel(
+            frame,
+            text="",
+            **text_style("row_muted"),
+            width=100,
+            anchor="w"
+        )
+        frame.created_label.pack(side="left", padx=3)
+        return frame
 
-        self._update_page_stats()
+    def _bind_page_row(self, frame: ctk.CTkFrame, index: int, page: Dict):
+        """Gắn page vào row"""
+        frame.page_id = page.get('id')
+        frame.var.set(page_selection.is_selected(frame.page_id))
+
+        page_name = page.get('page_name', 'Unknown')
+        frame.name_label.configure(text=page_name[:30] + "..." if len(page_name) > 30 else page_name)
+
+        followers = page.get('follower_count', 0)
+        frame.followers_label.configure(text=f"{followers:,}" if followers else "0")
+
+        profile_name = self._profile_names.get(page.get('profile_uuid', ''), 'Unknown')
+        frame.profile_label.configure(text=profile_name[:20] + "..." if len(profile_name) > 20 else profile_name)
+
+        role = page.get('role', 'admin')
+        frame.role_label.configure(
+            text=role.capitalize(),
+            text_color=COLORS["success"] if role == "admin" else COLORS["warning"]
+        )
+        frame.created_label.configure(text=page.get('created_at', '')[:10] if page.get('created_at') else '')
 
     def _on_search_change(self, *args):
         """Khi thay đổi search text"""
         self._render_pages(self.search_var.get())
 
+    def _toggle_page_selection(self, page_id: int, var: ctk.BooleanVar):
+        """Toggle chọn page (ghi xuống DB theo lô)"""
+        page_selection.set(page_id, var.get())
+        self._update_page_stats()
+
     def _toggle_select_all_pages(self):
         """Toggle chọn tất cả pages"""
         select_all = self.select_all_pages_var.get()
-        for page_id, var in self.page_checkbox_vars.items():
-            var.set(select_all)
+        page_selection.set_many([p.get('id') for p in self.pages_list.items], select_all)
+        self.pages_list.refresh()
         self._update_page_stats()
 
     def _update_page_stats(self):
         """Cập nhật thống kê pages"""
-        total = len(self.page_checkbox_vars)
-        selected = sum(1 for var in self.page_checkbox_vars.values() if var.get())
+        total = len(self.pages_list.items)
+        selected = len(self._get_selected_page_ids())
         self.page_stats.configure(text=f"Tổng: {total} | Đã chọn: {selected}")
 
     def _get_selected_page_ids(self) -> List[int]:
-        """Lấy danh sách page IDs đã chọn"""
-        return [pid for pid, var in self.page_checkbox_vars.items() if var.get()]
+        """Lấy danh sách page IDs đã chọn (trong các page đang hiển thị)"""
+        return [p.get('id') for p in self.pages_list.items if page_selection.is_selected(p.get('id'))]
 
     def _scan_pages(self):
         """Scan pages từ các profiles đã chọn"""
@@ -589,7 +584,7 @@ class PagesTab(ctk.CTkFrame):
                         continue
 
                     profile_name = profile.get('name', 'Unknown')
-                    self.after(0, lambda n=profile_name: self._set_status(f"Đang scan: {n}...", "info"))
+                    ui_updates.publish(self, "status", self._set_status, f"Đang scan: {profile_name}...", "info")
 
                     # Scan pages for this profile (sync_pages đã được gọi bên trong)
                     pages = self._scan_pages_for_profile(uuid)
@@ -598,16 +593,16 @@ class PagesTab(ctk.CTkFrame):
 
                     # Update progress
                     progress = (i + 1) / total
-                    self.after(0, lambda p=progress: self.progress_bar.set(p))
+                    ui_updates.publish(self, "progress_bar", self.progress_bar.set, progress)
 
                     # Random delay
                     if i < total - 1:
                         time.sleep(random.uniform(1, 2))
 
-                self.after(0, lambda: self._on_scan_complete(scanned_count))
+                ui_updates.post(self, self._on_scan_complete, scanned_count)
 
             except Exception as e:
-                self.after(0, lambda: self._set_status(f"Lỗi scan: {e}", "error"))
+                ui_updates.publish(self, "status", self._set_status, f"Lỗi scan: {e}", "error")
             finally:
                 self._is_scanning = False
 
@@ -667,7 +662,8 @@ class PagesTab(ctk.CTkFrame):
                 print(f"[Pages] No page tab found")
                 return []
 
-            # Bước 3: Kết nối CDPHelper
+            # Bước 3: Kết nối CDPHelper (import khi dùng: kéo theo cả stack CDP MAX)
+            from automation.cdp_helper import CDPHelper
             cdp = CDPHelper()
             if not cdp.connect(remote_port=remote_port, ws_url=page_ws):
                 print(f"[Pages] Failed to connect CDPHelper")
@@ -1053,8 +1049,8 @@ class CreatePageDialog(ctk.CTkToplevel):
                         continue
 
                     profile_name = profile.get('name', 'Unknown')
-                    self.after(0, lambda n=profile_name, idx=i+1, t=total:
-                        self.progress_label.configure(text=f"Đang tạo Page cho {n} ({idx}/{t})..."))
+                    ui_updates.publish(self, "progress_label", self.progress_label.configure,
+                                       text=f"Đang tạo Page cho {profile_name} ({i + 1}/{total})...")
 
                     # Create page (placeholder - needs CDP implementation)
                     success = self._create_page_for_profile(uuid, page_name, category, description)
@@ -1063,17 +1059,17 @@ class CreatePageDialog(ctk.CTkToplevel):
 
                     # Update progress
                     progress = (i + 1) / total
-                    self.after(0, lambda p=progress: self.progress_bar.set(p))
+                    ui_updates.publish(self, "progress_bar", self.progress_bar.set, progress)
 
                     # Delay
                     if i < total - 1:
                         time.sleep(delay + random.uniform(0, 2))
 
-                self.after(0, lambda: self._on_create_complete(created_count))
+                ui_updates.post(self, self._on_create_complete, created_count)
 
             except Exception as e:
-                self.after(0, lambda: self.progress_label.configure(
-                    text=f"Lỗi: {e}", text_color=COLORS["error"]))
+                ui_updates.publish(self, "progress_label", self.progress_label.configure,
+                                   text=f"Lỗi: {e}", text_color=COLORS["error"])
             finally:
                 self._is_creating = False
 
@@ -10,7 +10,7 @@ import re
 import requests
 from datetime import datetime, date, timedelta
 from config import COLORS
-from widgets import ModernButton, ModernEntry
+from widgets import ModernButton, ModernEntry, VirtualList, ui_updates, font, text_style
 from db import get_post_history
 from api_service import api
 from automation.window_manager import acquire_window_slot, release_window_slot, get_window_bounds
@@ -30,8 +30,8 @@ class PostsTab(ctk.CTkFrame):
         self._stop_requested = False
 
         # Store post status
-        self.post_vars = {}  # {post_id: BooleanVar}
-        self.post_widgets = {}  # {post_id: widget dict}
+        self.selected_post_ids = set()
+        self._post_index = {}  # {post_id: index trong post_list}
         self.post_status = {}  # {post_id: {target, liked, completed, error}}
 
         self._create_ui()
@@ -186,18 +186,16 @@ class PostsTab(ctk.CTkFrame):
                 text_color=COLORS["text_primary"]
             ).pack(side="left", padx=3)
 
-        # Scrollable post list
-        self.post_list_scroll = ctk.CTkScrollableFrame(list_frame, fg_color="transparent")
-        self.post_list_scroll.pack(fill="both", expand=True, padx=10, pady=(0, 10))
-
-        self.empty_label = ctk.CTkLabel(
-            self.post_list_scroll,
-            text="📭 Chưa có bài đăng nào\nĐăng bài ở tab 'Đăng Nhóm' trước",
-            font=ctk.CTkFont(size=14),
-            text_color=COLORS["text_secondary"],
-            justify="center"
+        # Post list (chỉ tạo row cho các bài đang hiển thị)
+        self.post_list = VirtualList(
+            list_frame,
+            row_height=44,
+            row_gap=4,
+            create_row=self._create_post_row,
+            bind_row=self._bind_post_row,
+            empty_text="📭 Chưa có bài đăng nào\nĐăng bài ở tab 'Đăng Nhóm' trước"
         )
-        self.empty_label.pack(pady=50)
+        self.post_list.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
         # ========== ACTION SECTION ==========
         action_frame = ctk.CTkFrame(self, fg_color=COLORS["bg_secondary"], corner_radius=15)
@@ -370,29 +368,14 @@ class PostsTab(ctk.CTkFrame):
 
     def _render_post_list(self):
         """Render danh sách bài đăng"""
-        # Clear existing
-        for widget in self.post_list_scroll.winfo_children():
-            widget.destroy()
-
-        self.post_vars = {}
-        self.post_widgets = {}
-
-        if not self.posts:
-            self.empty_label = ctk.CTkLabel(
-                self.post_list_scroll,
-                text="📭 Chưa có bài đăng nào\nĐăng bài ở tab 'Đăng Nhóm' trước",
-                font=ctk.CTkFont(size=14),
-                text_color=COLORS["text_secondary"],
-                justify="center"
-            )
-            self.empty_label.pack(pady=50)
-            return
+        self.selected_post_ids = set()
+        self._post_index = {}
 
         target_likes = int(self.like_count_entry.get() or 5)
 
         for i, post in enumerate(self.posts):
             post_id = post.get('id', i)
-            post_url = post.get('post_url', '')
+            self._post_index[post_id] = i
 
             # Initialize status if not exists
             if post_id not in self.post_status:
@@ -403,91 +386,111 @@ class PostsTab(ctk.CTkFrame):
                     'error': False
                 }
 
-            row = ctk.CTkFrame(self.post_list_scroll, fg_color=COLORS["bg_card"], corner_radius=8, height=40)
-            row.pack(fill="x", pady=2)
-            row.pack_propagate(False)
-
-            # Checkbox
-            var = ctk.BooleanVar(value=False)
-            self.post_vars[post_id] = var
-            cb = ctk.CTkCheckBox(
-                row,
-                text="",
-                variable=var,
-                fg_color=COLORS["accent"],
-                width=35
-            )
-            cb.pack(side="left", padx=5)
-
-            # Link (clickable)
-            link_label = ctk.CTkLabel(
-                row,
-                text=post_url[:50] + "..." if len(post_url) > 50 else post_url,
-                width=300,
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["accent"],
-                cursor="hand2",
-                anchor="w"
-            )
-            link_label.pack(side="left", padx=3)
-            link_label.bind("<Button-1>", lambda e, url=post_url: self._open_url(url))
-
-            # Target
-            target_label = ctk.CTkLabel(
-                row,
-                text=str(self.post_status[post_id]['target']),
-                width=60,
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["text_primary"]
-            )
-            target_label.pack(side="left", padx=3)
-
-            # Liked count
-            liked_label = ctk.CTkLabel(
-                row,
-                text=str(self.post_status[post_id]['liked']),
-                width=60,
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["success"]
-            )
-            liked_label.pack(side="left", padx=3)
-
-            # Status (Completed)
-            completed = self.post_status[post_id]['completed']
-            completed_label = ctk.CTkLabel(
-                row,
-                text="Đã like hôm nay" if completed else "-",
-                width=110,
-                font=ctk.CTkFont(size=10),
-                text_color=COLORS["success"] if completed else COLORS["text_secondary"]
-            )
-            completed_label.pack(side="left", padx=3)
-
-            # Error
-            error = self.post_status[post_id]['error']
-            error_label = ctk.CTkLabel(
-                row,
-                text="✗" if error else "-",
-                width=40,
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["danger"] if error else COLORS["text_secondary"]
-            )
-            error_label.pack(side="left", padx=3)
-
-            # Store widgets for updating
-            self.post_widgets[post_id] = {
-                'row': row,
-                'target': target_label,
-                'liked': liked_label,
-                'completed': completed_label,
-                'error': error_label
-            }
+        self.post_list.set_items(list(self.posts))
+
+    def _create_post_row(self, parent) -> ctk.CTkFrame:
+        """Row rỗng cho post_list, dữ liệu gắn qua _bind_post_row"""
+        row = ctk.CTkFrame(parent, fg_color=COLORS["bg_card"], corner_radius=8, height=40)
+        row.pack_propagate(False)
+        row.post_id = None
+        row.post_url = ""
+
+        # Checkbox
+        row.var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            row,
+            text="",
+            variable=row.var,
+            fg_color=COLORS["accent"],
+            width=35,
+            command=lambda: self._toggle_post_selection(row.post_id, row.var.get())
+        ).pack(side="left", padx=5)
+
+        # Link (clickable)
+        row.link_label = ctk.CTkLabel(
+            row,
+            text="",
+            width=300,
+            **text_style("row_link"),
+            cursor="hand2",
+            anchor="w"
+        )
+        row.link_label.pack(side="left", padx=3)
+        row.link_label.bind("<Button-1>", lambda e: self._open_url(row.post_url))
+
+        # Target
+        row.target_label = ctk.CTkLabel(
+            row,
+            text="",
+            width=60,
+            **text_style("row_text")
+        )
+        row.target_label.pack(side="left", padx=3)
+
+        # Liked count
+        row.liked_label = ctk.CTkLabel(
+            row,
+            text="",
+            width=60,
+            font=font(11),
+            text_color=COLORS["success"]
+        )
+        row.liked_label.pack(side="left", padx=3)
+
+        # Status (Completed)
+        row.completed_label = ctk.CTkLabel(
+            row,
+            text="",
+            width=110,
+            font=font(10)
+        )
+        row.completed_label.pack(side="left", padx=3)
+
+        # Error
+        row.error_label = ctk.CTkLabel(
+            row,
+            text="",
+            width=40,
+            font=font(11)
+        )
+        row.error_label.pack(side="left", padx=3)
+        return row
+
+    def _bind_post_row(self, row: ctk.CTkFrame, index: int, post: Dict):
+        """Gắn bài đăng và trạng thái like vào row"""
+        row.post_id = post.get('id', index)
+        row.post_url = post.get('post_url', '')
+        status = self.post_status[row.post_id]
+
+        row.var.set(row.post_id in self.selected_post_ids)
+        row.link_label.configure(text=row.post_url[:50] + "..." if len(row.post_url) > 50 else row.post_url)
+        row.target_label.configure(text=str(status['target']))
+        row.liked_label.configure(text=str(status['liked']))
+        row.completed_label.configure(
+            text="Đã like hôm nay" if status['completed'] else "-",
+            text_color=COLORS["success"] if status['completed'] else COLORS["text_secondary"]
+        )
+        row.error_label.configure(
+            text="✗" if status['error'] else "-",
+            text_color=COLORS["danger"] if status['error'] else COLORS["text_secondary"]
+        )
+        # Nền xanh khi đã hoàn thành
+        row.configure(fg_color="#1a472a" if status['completed'] else COLORS["bg_card"])
+
+    def _toggle_post_selection(self, post_id, selected: bool):
+        if selected:
+            self.selected_post_ids.add(post_id)
+        else:
+            self.selected_post_ids.discard(post_id)
 
     def _toggle_select_all(self):
         """Toggle chọn tất cả"""
         select_all = self.select_all_var.get()
-        for var in self.post_vars.values():
-            var.set(select_all)
+        if select_all:
+            self.selected_post_ids = set(self._post_index)
+        else:
+            self.selected_post_ids = set()
+        self.post_list.refresh()
 
     def _on_date_filter_change(self, choice):
         """Khi đổi filter ngày"""
@@ -525,26 +528,9 @@ class PostsTab(ctk.CTkFrame):
         if error is not None:
             self.post_status[post_id]['error'] = error
 
-        # Update UI
-        if post_id in self.post_widgets:
-            widgets = self.post_widgets[post_id]
-            if target is not None:
-                widgets['target'].configure(text=str(target))
-            if liked is not None:
-                widgets['liked'].configure(text=str(liked))
-            if completed is not None:
-                widgets['completed'].configure(
-                    text="Đã like hôm nay" if completed else "-",
-                    text_color=COLORS["success"] if completed else COLORS["text_secondary"]
-                )
-                # Đổi màu nền row thành xanh khi hoàn thành
-                if completed:
-                    widgets['row'].configure(fg_color="#1a472a")  # Dark green
-            if error is not None:
-                widgets['error'].configure(
-                    text="✗" if error else "-",
-                    text_color=COLORS["danger"] if error else COLORS["text_secondary"]
-                )
+        # Update UI (chỉ gắn lại nếu row đang hiển thị)
+        if post_id in self._post_index:
+            self.post_list.refresh(self._post_index[post_id])
 
     def _set_status(self, text: str, status_type: str = "info"):
         """Cập nhật status"""
@@ -559,9 +545,8 @@ class PostsTab(ctk.CTkFrame):
 
         # Get selected posts
         selected_posts = []
-        for post in self.posts:
-            post_id = post.get('id', self.posts.index(post))
-            if post_id in self.post_vars and self.post_vars[post_id].get():
+        for i, post in enumerate(self.posts):
+            if post.get('id', i) in self.selected_post_ids:
                 selected_posts.append(post)
 
         if not selected_posts:
@@ -594,11 +579,8 @@ class PostsTab(ctk.CTkFrame):
                 self.post_status[post_id]['liked'] = 0
                 self.post_status[post_id]['completed'] = False
                 self.post_status[post_id]['error'] = False
-            # Update target in UI as well
+            # Update target in UI as well (row về màu thường vì completed=False)
             self._update_post_status(post_id, target=like_count, liked=0, completed=False, error=False)
-            # Reset row color
-            if post_id in self.post_widgets:
-                self.post_widgets[post_id]['row'].configure(fg_color=COLORS["bg_card"])
 
         self._is_running = True
         self._stop_requested = False
@@ -634,8 +616,8 @@ class PostsTab(ctk.CTkFrame):
 
         # Log profile names
         profile_names = [p.get('name', 'N/A') for p in available_profiles[:10]]
-        self.after(0, lambda pn=profile_names: self._log(f"Profiles: {', '.join(pn)}{'...' if len(available_profiles) > 10 else ''}"))
-        self.after(0, lambda: self._log(f"Có {len(available_profiles)} profiles sẵn sàng"))
+        ui_updates.post(self, self._log, f"Profiles: {', '.join(profile_names)}{'...' if len(available_profiles) > 10 else ''}")
+        ui_updates.post(self, self._log, f"Có {len(available_profiles)} profiles sẵn sàng")
 
         for post in posts:
             if self._stop_requested:
@@ -645,11 +627,11 @@ class PostsTab(ctk.CTkFrame):
             post_url = post.get('post_url', '')
 
             if not post_url:
-                self.after(0, lambda pid=post_id: self._update_post_status(pid, error=True))
+                ui_updates.post(self, self._update_post_status, post_id, error=True)
                 completed_posts += 1
                 continue
 
-            self.after(0, lambda msg=f"Đang like: {post_url[:50]}...": self._log(msg))
+            ui_updates.post(self, self._log, f"Đang like: {post_url[:50]}...")
 
             # Get profiles for this post
             profiles_to_use = available_profiles[:like_count]
@@ -676,29 +658,28 @@ class PostsTab(ctk.CTkFrame):
                         success = future.result()
                         if success:
                             liked_count += 1
-                            self.after(0, lambda pid=post_id, lc=liked_count: self._update_post_status(pid, liked=lc))
+                            ui_updates.post(self, self._update_post_status, post_id, liked=liked_count)
                     except Exception as e:
                         error_occurred = True
-                        self.after(0, lambda msg=f"Lỗi: {e}": self._log(msg))
+                        ui_updates.post(self, self._log, f"Lỗi: {e}")
 
             # Update final status
             is_completed = liked_count >= like_count
-            self.after(0, lambda pid=post_id, c=is_completed, e=error_occurred:
-                       self._update_post_status(pid, completed=c, error=e if not c else False))
+            ui_updates.post(self, self._update_post_status, post_id,
+                            completed=is_completed, error=error_occurred if not is_completed else False)
 
             completed_posts += 1
             progress = completed_posts / total_posts
-            self.after(0, lambda p=progress: self.progress_bar.set(p))
-            self.after(0, lambda cp=completed_posts, tp=total_posts:
-                       self._set_status(f"Đang chạy... {cp}/{tp}"))
+            ui_updates.publish(self, "progress_bar", self.progress_bar.set, progress)
+            ui_updates.publish(self, "status", self._set_status, f"Đang chạy... {completed_posts}/{total_posts}")
 
             # Delay between posts
             if not self._stop_requested and completed_posts < total_posts:
                 time.sleep(random.uniform(2, 5))
 
         self._is_running = False
-        self.after(0, lambda: self._set_status("Hoàn tất"))
-        self.after(0, lambda: self._log(f"Hoàn tất like {completed_posts}/{total_posts} bài"))
+        ui_updates.publish(self, "status", self._set_status, "Hoàn tất")
+        ui_updates.post(self, self._log, f"Hoàn tất like {completed_posts}/{total_posts} bài")
 
     def _like_post_with_profile(self, profile: Dict, post_url: str) -> bool:
         """Like bài viết với 1 profile qua CDP MAX"""
@@ -710,14 +691,14 @@ class PostsTab(ctk.CTkFrame):
         profile_name = profile.get('name', 'Unknown')
 
         if not profile_uuid:
-            self.after(0, lambda: self._log(f"[{profile_name}] Không có UUID"))
+            ui_updates.post(self, self._log, f"[{profile_name}] Không có UUID")
             return False
 
         # Acquire window slot for positioning
         slot_id = acquire_window_slot()
         helper = None
         try:
-            self.after(0, lambda pn=profile_name, pu=profile_uuid[:8]: self._log(f"[{pn}] ({pu}) Đang mở browser..."))
+            ui_updates.post(self, self._log, f"[{profile_name}] ({profile_uuid[:8]}) Đang mở browser...")
 
             # Mở browser và lấy remote port
             result = api.open_browser(profile_uuid)
@@ -725,7 +706,7 @@ class PostsTab(ctk.CTkFrame):
             # Kiểm tra lỗi
             if result.get('type') == 'error':
                 err_msg = result.get('message') or result.get('title', 'Unknown error')
-                self.after(0, lambda pn=profile_name, e=err_msg: self._log(f"[{pn}] Lỗi: {e}"))
+                ui_updates.post(self, self._log, f"[{profile_name}] Lỗi: {err_msg}")
                 return False
 
             # Kiểm tra status
@@ -733,7 +714,7 @@ class PostsTab(ctk.CTkFrame):
             if status not in ['successfully', 'success', True]:
                 if 'already' not in str(result).lower() and 'running' not in str(result).lower():
                     err_msg = result.get('message') or result.get('title', f'Status: {status}')
-                    self.after(0, lambda pn=profile_name, e=err_msg: self._log(f"[{pn}] Lỗi: {e}"))
+                    ui_updates.post(self, self._log, f"[{profile_name}] Lỗi: {err_msg}")
                     return False
 
             # Lấy remote port
@@ -755,10 +736,10 @@ class PostsTab(ctk.CTkFrame):
                     remote_port = int(match.group(1))
 
             if not remote_port:
-                self.after(0, lambda pn=profile_name: self._log(f"[{pn}] Không có port"))
+                ui_updates.post(self, self._log, f"[{profile_name}] Không có port")
                 return False
 
-            self.after(0, lambda pn=profile_name, p=remote_port: self._log(f"[{pn}] Đã mở, port: {p}"))
+            ui_updates.post(self, self._log, f"[{profile_name}] Đã mở, port: {remote_port}")
 
             # Set window bounds - thu nhỏ và sắp xếp cửa sổ
             try:
@@ -802,12 +783,12 @@ class PostsTab(ctk.CTkFrame):
                         time.sleep(1)  # Đợi ngắn trước khi thử lại
 
             if not connected:
-                self.after(0, lambda pn=profile_name: self._log(f"[{pn}] Không kết nối được CDP"))
+                ui_updates.post(self, self._log, f"[{profile_name}] Không kết nối được CDP")
                 return False
 
             # Navigate đến bài viết
             if not helper.navigate(post_url):
-                self.after(0, lambda pn=profile_name: self._log(f"[{pn}] Không navigate được"))
+                ui_updates.post(self, self._log, f"[{profile_name}] Không navigate được")
                 return False
 
             # Đợi page load (giảm timeout)
@@ -817,16 +798,16 @@ class PostsTab(ctk.CTkFrame):
             like_result = helper.click_like_button()
 
             if like_result:
-                self.after(0, lambda pn=profile_name: self._log(f"[{pn}] ✓ Đã like thành công"))
+                ui_updates.post(self, self._log, f"[{profile_name}] ✓ Đã like thành công")
             else:
-                self.after(0, lambda pn=profile_name: self._log(f"[{pn}] ✗ Không tìm thấy nút Like"))
+                ui_updates.post(self, self._log, f"[{profile_name}] ✗ Không tìm thấy nút Like")
 
             time.sleep(random.uniform(0.3, 0.8))
 
             return like_result
 
         except Exception as e:
-            self.after(0, lambda pn=profile_name, err=str(e): self._log(f"[{pn}] Lỗi: {err}"))
+            ui_updates.post(self, self._log, f"[{profile_name}] Lỗi: {e}")
             return False
 
         finally:
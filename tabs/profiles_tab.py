@@ -2,13 +2,47 @@
 Profiles Tab - Modern Profile Management Interface
 Premium design with stats cards and smooth interactions
 """
-import customtkinter as ctk
-from typing import List, Dict
 import threading
+from collections import deque
+import customtkinter as ctk
+from typing import List, Dict, Callable, Optional
 from config import COLORS, FONTS, SPACING, RADIUS, HEIGHTS
-from widgets import ModernCard, ModernButton, ModernEntry, ProfileCard, SearchBar, Badge, EmptyState
-from api_service import api
-from db import get_profiles as db_get_profiles, sync_profiles, update_profile_local
+from widgets import (
+    ModernCard, ModernButton, ModernEntry, ProfileCard, SearchBar, Badge, EmptyState, VirtualList,
+    SEARCH_DEBOUNCE_MS, font
+)
+from api_service import api, status_poller
+from task_service import task_executor, current_token
+from db import get_profiles as db_get_profiles, sync_profiles, update_profile_local, SearchIndex
+
+
+def sync_from_hidemium(on_page: Callable[[List[Dict]], None] = None, client=api, poller=status_poller,
+                       page_size: int = 100) -> Optional[int]:
+    """
+    Tải toàn bộ profiles từ Hidemium và lưu DB từng trang (phần không có UI của _sync_profiles).
+
+    Args:
+        on_page: Gọi với mỗi trang sau khi đã lưu DB (trên thread hiện tại)
+        client, poller: API/poller dùng thay cho singleton (benchmark)
+
+    Returns:
+        Số profiles đang chạy, None nếu task bị hủy giữa chừng
+
+    Raises:
+        ConnectionError: Không tải được một trang (xem HidemiumAPI.iter_profiles)
+    """
+    token = current_token()
+    client.invalidate_cache()  # Đồng bộ thủ công: lấy lại folders/tags mới nhất
+    running_uuids = poller.refresh() or set()
+    for page in client.iter_profiles(page_size=page_size, is_local=True):
+        if token.cancelled:
+            return None  # Đã có lần đồng bộ mới hơn
+        for profile in page:
+            profile['check_open'] = 1 if profile.get('uuid') in running_uuids else 0
+        sync_profiles(page)
+        if on_page:
+            on_page(page)
+    return len(running_uuids)
 
 
 class ProfilesTab(ctk.CTkFrame):
@@ -20,11 +54,14 @@ class ProfilesTab(ctk.CTkFrame):
         self.status_callback = status_callback
         self.profiles: List[Dict] = []
         self.selected_profiles: List[Dict] = []
-        self.profile_cards: List[ProfileCard] = []
+        self._selected_uuids = set()
+        self._search_index = None  # SearchIndex trên self.profiles, dựng lại khi danh sách thay đổi
         self.folders: List[Dict] = []
         self.folder_id_to_name: Dict[int, str] = {}
-        self._auto_refresh_job = None
-        self._is_polling = False
+        self._status_token = None
+        self._status_synced = False  # Đã đối chiếu toàn bộ self.profiles với snapshot running chưa
+        self._toggle_lock = threading.Lock()
+        self._toggle_queues: Dict[str, deque] = {}  # uuid -> lệnh mở/đóng chờ chạy, phần tử đầu đang chạy
 
         self._create_ui()
         self._load_folders()
@@ -32,8 +69,11 @@ class ProfilesTab(ctk.CTkFrame):
         self._start_auto_refresh()
 
     def _start_auto_refresh(self):
-        """Start auto-refresh every 5 seconds"""
-        self._auto_refresh_silent()
+        """Nhận thay đổi trạng thái running từ poller dùng chung"""
+        self._status_token = status_poller.subscribe(
+            lambda added, removed, running: self._safe_after(
+                0, lambda: self._on_running_changed(added, removed, running))
+        )
 
     def _safe_after(self, delay, callback):
         """Thread-safe wrapper for self.after"""
@@ -43,31 +83,30 @@ class ProfilesTab(ctk.CTkFrame):
         except (RuntimeError, Exception):
             pass
 
-    def _auto_refresh_silent(self):
-        """Silent auto-refresh of running status"""
-        if self._is_polling:
-            self._auto_refresh_job = self.after(5000, self._auto_refresh_silent)
-            return
-
-        self._is_polling = True
-
-        def fetch():
-            try:
-                running_uuids = api.get_running_profiles(is_local=True)
-                self._safe_after(0, lambda: self._on_auto_refresh_complete(running_uuids))
-            except Exception:
-                self._safe_after(0, lambda: self._on_auto_refresh_error())
-
-        threading.Thread(target=fetch, daemon=True).start()
-
-    def _on_auto_refresh_complete(self, running_uuids: List[str]):
-        """Handle auto-refresh completion"""
-        self._is_polling = False
+    def _reconcile_running_status(self):
+        """Đối chiếu toàn bộ danh sách với snapshot của poller (khi danh sách vừa thay)"""
+        self._status_synced = False
+        running = status_poller.running_uuids()
+        if running is not None:
+            self._on_running_changed(set(), set(), running)
+        # Chưa có snapshot: lần poll đầu tiên sẽ đối chiếu
+
+    def _on_running_changed(self, added: set, removed: set, running: set):
+        """Chỉ cập nhật các profile có trạng thái thay đổi"""
+        if not self._status_synced:
+            # Danh sách vừa load lại: đối chiếu toàn bộ một lần
+            self._status_synced = True
+            changed_uuids = {p.get('uuid') for p in self.profiles}
+        else:
+            changed_uuids = added | removed
 
+        profiles_by_uuid = {p.get('uuid'): p for p in self.profiles}
         changed = False
-        for profile in self.profiles:
-            uuid = profile.get('uuid')
-            new_status = 1 if uuid in running_uuids else 0
+        for uuid in changed_uuids:
+            profile = profiles_by_uuid.get(uuid)
+            if profile is None:
+                continue
+            new_status = 1 if uuid in running else 0
             if profile.get('check_open') != new_status:
                 profile['check_open'] = new_status
                 update_profile_local(uuid, {'check_open': new_status})
@@ -77,17 +116,10 @@ class ProfilesTab(ctk.CTkFrame):
         if changed:
             self._update_stats()
 
-        self._auto_refresh_job = self.after(5000, self._auto_refresh_silent)
-
-    def _on_auto_refresh_error(self):
-        """Handle auto-refresh error"""
-        self._is_polling = False
-        self._auto_refresh_job = self.after(5000, self._auto_refresh_silent)
-
     def destroy(self):
         """Cleanup on destroy"""
-        if self._auto_refresh_job:
-            self.after_cancel(self._auto_refresh_job)
+        if self._status_token:
+            status_poller.unsubscribe(self._status_token)
         super().destroy()
 
     def _create_ui(self):
@@ -198,7 +230,8 @@ class ProfilesTab(ctk.CTkFrame):
         self.search_bar = SearchBar(
             toolbar_inner,
             placeholder="Tim kiem profile...",
-            on_search=self._search_profiles
+            on_search=self._search_profiles,
+            live_delay=SEARCH_DEBOUNCE_MS
         )
         self.search_bar.pack(side="left")
 
@@ -288,16 +321,20 @@ class ProfilesTab(ctk.CTkFrame):
         ).pack(side="left", padx=2)
 
         # ========== PROFILES LIST ==========
-        self.scroll_frame = ctk.CTkScrollableFrame(
-            self,
-            fg_color="transparent",
-            scrollbar_button_color=COLORS["border"],
-            scrollbar_button_hover_color=COLORS["accent"]
+        self.list_container = ctk.CTkFrame(self, fg_color="transparent")
+        self.list_container.pack(fill="both", expand=True, padx=SPACING["2xl"], pady=(0, SPACING["xl"]))
+
+        # Chỉ tạo card cho các dòng đang hiển thị, dùng lại khi cuộn
+        self.profile_list = VirtualList(
+            self.list_container,
+            row_height=72 + 2 * SPACING["xs"],
+            row_gap=2 * SPACING["xs"],
+            create_row=self._create_profile_row,
+            bind_row=self._bind_profile_row
         )
-        self.scroll_frame.pack(fill="both", expand=True, padx=SPACING["2xl"], pady=(0, SPACING["xl"]))
 
         # Loading state
-        self.loading_frame = ctk.CTkFrame(self.scroll_frame, fg_color="transparent")
+        self.loading_frame = ctk.CTkFrame(self.list_container, fg_color="transparent")
         self.loading_frame.pack(fill="both", expand=True)
 
         ctk.CTkLabel(
@@ -338,14 +375,14 @@ class ProfilesTab(ctk.CTkFrame):
         ctk.CTkLabel(
             top_row,
             text=icon,
-            font=ctk.CTkFont(size=FONTS["size_lg"]),
+            font=font(FONTS["size_lg"]),
             text_color=color
         ).pack(side="left")
 
         value_label = ctk.CTkLabel(
             top_row,
             text=value,
-            font=ctk.CTkFont(size=FONTS["size_2xl"], weight="bold"),
+            font=font(FONTS["size_2xl"], "bold"),
             text_color=color
         )
         value_label.pack(side="right")
@@ -354,7 +391,7 @@ class ProfilesTab(ctk.CTkFrame):
         ctk.CTkLabel(
             inner,
             text=label,
-            font=ctk.CTkFont(size=FONTS["size_sm"]),
+            font=font(FONTS["size_sm"]),
             text_color=COLORS["text_secondary"]
         ).pack(anchor="w")
 
@@ -366,68 +403,83 @@ class ProfilesTab(ctk.CTkFrame):
     def _load_profiles(self):
         """Load profiles from local database"""
         self.profiles = db_get_profiles()
+        self._search_index = None
 
         if self.profiles:
             self._apply_folder_names_to_profiles()
             self._render_profiles(self.profiles)
             self._update_stats()
-            self._refresh_running_status()
+            self._reconcile_running_status()
         else:
             self._sync_profiles()
 
     def _sync_profiles(self):
-        """Sync profiles from Hidemium API"""
+        """Sync profiles from Hidemium API (render từng trang ngay khi tải về)"""
         self._set_status("Dang dong bo profiles tu Hidemium...", "info")
         self.loading_label.configure(text="Dang dong bo tu Hidemium...")
-        self.loading_frame.pack(fill="both", expand=True)
+        self._show_loading()
 
-        for card in self.profile_cards:
-            card.destroy()
-        self.profile_cards.clear()
+        self.profile_list.set_items([])
+        self.profiles = []
+        self._search_index = None
 
         def fetch():
-            profiles_result = api.get_profiles(limit=100, is_local=True)
-            running_uuids = api.get_running_profiles(is_local=True)
-            self._safe_after(0, lambda: self._on_sync_complete(profiles_result, running_uuids))
-
-        threading.Thread(target=fetch, daemon=True).start()
-
-    def _on_sync_complete(self, result, running_uuids: List[str] = None):
+            token = current_token()
+            try:
+                running_count = sync_from_hidemium(
+                    lambda page: self._safe_after(0, token.guard(self._on_profiles_page, page)))
+            except Exception as e:
+                self._safe_after(0, token.guard(self._on_sync_error, str(e)))
+                return
+            if running_count is not None:
+                self._safe_after(0, token.guard(self._on_sync_complete, running_count))
+
+        task_executor.submit("io", fetch, key="profiles.sync")
+
+    def _on_profiles_page(self, page: List[Dict]):
+        """Một trang profiles vừa về: thêm vào danh sách và render ngay"""
+        if not self.profiles:
+            self._show_profile_list()
+        self.profiles.extend(page)
+        self._search_index = None
+        self._apply_folder_names_to_profiles(page)
+        self.profile_list.append_items(page)
+        self._set_status(f"Dang dong bo... {len(self.profiles)} profiles", "info")
+
+    def _on_sync_complete(self, running_count: int = 0):
         """Handle sync completion"""
-        self.loading_frame.pack_forget()
-        running_uuids = running_uuids or []
-
-        if isinstance(result, list) and result:
-            for profile in result:
-                uuid = profile.get('uuid')
-                profile['check_open'] = 1 if uuid in running_uuids else 0
-
-            sync_profiles(result)
-            self.profiles = result
-            self._apply_folder_names_to_profiles()
-
-            running_count = len(running_uuids)
-            self._set_status(f"Da dong bo {len(result)} profiles ({running_count} dang chay)", "success")
-        elif isinstance(result, dict) and result.get('type') == 'error':
-            self._set_status(result.get('title', 'Loi'), "error")
-            self._show_empty_state("Khong the dong bo", result.get('title', ''))
-            return
+        self._reconcile_running_status()
+        if self.profiles:
+            self._set_status(f"Da dong bo {len(self.profiles)} profiles ({running_count} dang chay)", "success")
         else:
-            self.profiles = []
+            self.loading_frame.pack_forget()
             self._set_status("Khong co profiles", "warning")
-
-        self._render_profiles(self.profiles)
+            self._render_profiles(self.profiles)
         self._update_stats()
 
+    def _on_sync_error(self, error: str):
+        """Handle sync error"""
+        self.loading_frame.pack_forget()
+        if self.profiles:
+            # Lỗi giữa chừng: giữ các trang đã tải nhưng báo rõ danh sách chưa đủ
+            self._set_status(f"Dong bo chua du ({len(self.profiles)} profiles): {error or 'Loi'}", "error")
+            self._update_stats()
+            return
+        self._set_status(error or 'Loi', "error")
+        self._show_empty_state("Khong the dong bo", error)
+
     def _refresh_running_status(self):
         """Refresh running status from API"""
         self._set_status("Dang kiem tra trang thai...", "info")
 
         def fetch():
-            running_uuids = api.get_running_profiles(is_local=True)
-            self._safe_after(0, lambda: self._on_running_status_received(running_uuids))
+            running_uuids = status_poller.refresh()
+            if running_uuids is None:
+                self._safe_after(0, lambda: self._set_status("Khong the kiem tra trang thai", "error"))
+                return
+            self._safe_after(0, current_token().guard(self._on_running_status_received, running_uuids))
 
-        threading.Thread(target=fetch, daemon=True).start()
+        task_executor.submit("io", fetch, key="profiles.running")
 
     def _on_running_status_received(self, running_uuids: List[str]):
         """Handle running status update"""
@@ -445,29 +497,38 @@ class ProfilesTab(ctk.CTkFrame):
 
     def _render_profiles(self, profiles: List[Dict]):
         """Render profile cards"""
-        for card in self.profile_cards:
-            card.destroy()
-        self.profile_cards.clear()
-
         if not profiles:
+            self.profile_list.set_items([])
             self._show_empty_state("Chua co profile nao", "Bam 'Tao Profile' de bat dau")
             return
 
-        # Create cards
-        for profile in profiles:
-            card = ProfileCard(
-                self.scroll_frame,
-                profile_data=profile,
-                on_toggle=self._toggle_profile,
-                on_edit=self._edit_profile,
-                on_select=self._on_profile_select
-            )
-            card.pack(fill="x", pady=SPACING["xs"])
-            self.profile_cards.append(card)
+        self._show_profile_list()
+        self.profile_list.set_items(list(profiles))
+
+    def _create_profile_row(self, parent) -> ProfileCard:
+        """Card rỗng cho VirtualList"""
+        return ProfileCard(
+            parent,
+            profile_data={},
+            on_toggle=self._toggle_profile,
+            on_edit=self._edit_profile,
+            on_select=self._on_profile_select
+        )
+
+    def _bind_profile_row(self, card: ProfileCard, index: int, profile: Dict):
+        card.set_profile(profile, selected=profile.get('uuid') in self._selected_uuids)
+
+    def _show_profile_list(self):
+        self.loading_frame.pack_forget()
+        self.profile_list.pack(fill="both", expand=True)
+
+    def _show_loading(self):
+        self.profile_list.pack_forget()
+        self.loading_frame.pack(fill="both", expand=True)
 
     def _show_empty_state(self, title: str, description: str):
         """Show empty state"""
-        self.loading_frame.pack(fill="both", expand=True)
+        self._show_loading()
         for widget in self.loading_frame.winfo_children():
             widget.destroy()
 
@@ -496,17 +557,14 @@ class ProfilesTab(ctk.CTkFrame):
         self._update_folder_filter()
 
     def _search_profiles(self, query: str):
-        """Search profiles"""
-        if not query:
+        """Search profiles theo tên/uuid (không phân biệt dấu), index dựng một lần mỗi lần load"""
+        if not query.strip():
             self._render_profiles(self.profiles)
             return
 
-        filtered = [
-            p for p in self.profiles
-            if query.lower() in p.get('name', '').lower()
-            or query.lower() in p.get('uuid', '').lower()
-        ]
-        self._render_profiles(filtered)
+        if self._search_index is None:
+            self._search_index = SearchIndex(self.profiles, fields=('name', 'uuid'), key='uuid')
+        self._render_profiles(self._search_index.search(query))
 
     def _filter_profiles(self):
         """Filter profiles by status"""
@@ -540,9 +598,9 @@ class ProfilesTab(ctk.CTkFrame):
         """Load folders from API"""
         def fetch():
             folders = api.get_folders(is_local=True)
-            self._safe_after(0, lambda: self._on_folders_loaded(folders))
+            self._safe_after(0, current_token().guard(self._on_folders_loaded, folders))
 
-        threading.Thread(target=fetch, daemon=True).start()
+        task_executor.submit("io", fetch, key="profiles.folders")
 
     def _on_folders_loaded(self, folders: List):
         """Handle folders loaded"""
@@ -558,9 +616,9 @@ class ProfilesTab(ctk.CTkFrame):
         self._apply_folder_names_to_profiles()
         self._update_folder_filter()
 
-    def _apply_folder_names_to_profiles(self):
+    def _apply_folder_names_to_profiles(self, profiles: List[Dict] = None):
         """Apply folder names to profiles"""
-        for p in self.profiles:
+        for p in self.profiles if profiles is None else profiles:
             fid = p.get('folder_id')
             if fid and fid in self.folder_id_to_name:
                 p['folder_name'] = self.folder_id_to_name[fid]
@@ -586,12 +644,14 @@ class ProfilesTab(ctk.CTkFrame):
 
     def _on_profile_select(self, profile: Dict, selected: bool):
         """Handle profile selection"""
+        uuid = profile.get('uuid')
         if selected:
-            if profile not in self.selected_profiles:
+            if uuid not in self._selected_uuids:
+                self._selected_uuids.add(uuid)
                 self.selected_profiles.append(profile)
-        else:
-            if profile in self.selected_profiles:
-                self.selected_profiles.remove(profile)
+        elif uuid in self._selected_uuids:
+            self._selected_uuids.discard(uuid)
+            self.selected_profiles = [p for p in self.selected_profiles if p.get('uuid') != uuid]
         self._update_stats()
 
     def _toggle_profile(self, profile: Dict, open_browser: bool):
@@ -601,32 +661,60 @@ class ProfilesTab(ctk.CTkFrame):
 
         if open_browser:
             self._set_status(f"Dang mo profile {name}...", "info")
-
-            def do_action():
-                result = api.open_browser(uuid)
-                self._safe_after(0, lambda: self._on_toggle_complete(result, profile, True))
         else:
             self._set_status(f"Dang dong profile {name}...", "info")
 
-            def do_action():
-                result = api.close_browser(uuid)
-                self._safe_after(0, lambda: self._on_toggle_complete(result, profile, False))
-
-        threading.Thread(target=do_action, daemon=True).start()
+        def done(result):
+            self._safe_after(0, lambda: self._on_toggle_complete(result, profile, open_browser))
+
+        if self._enqueue_toggle(profile, open_browser, done):
+            task_executor.submit("browser", self._run_toggles, uuid)
+
+    def _enqueue_toggle(self, profile: Dict, open_browser: bool, done: Callable[[Dict], None]) -> bool:
+        """
+        Xếp lệnh mở/đóng vào hàng của UUID.
+
+        Mở/đóng là thao tác đổi trạng thái: không dùng key (key hủy lệnh cũ nhưng Hidemium có
+        thể đã thực hiện), mà xếp hàng theo UUID để các lệnh cùng profile (lẻ hay hàng loạt)
+        chạy lần lượt. done(result) luôn được gọi khi lệnh chạy xong.
+
+        Returns:
+            True nếu lệnh đứng đầu hàng: người gọi phải chạy nó rồi gọi _finish_toggle()
+        """
+        with self._toggle_lock:
+            queue = self._toggle_queues.setdefault(profile.get('uuid'), deque())
+            queue.append((profile, open_browser, done))
+            return len(queue) == 1
+
+    def _finish_toggle(self, uuid: str, result: Dict) -> bool:
+        """Báo kết quả lệnh đầu hàng của UUID, trả True nếu còn lệnh chờ chạy"""
+        with self._toggle_lock:
+            queue = self._toggle_queues[uuid]
+            _, _, done = queue.popleft()
+            if not queue:
+                del self._toggle_queues[uuid]
+            more = bool(queue)
+        done(result)
+        return more
+
+    def _run_toggles(self, uuid: str):
+        """Chạy lần lượt các lệnh mở/đóng đang chờ của một profile, kết quả nào cũng được áp dụng"""
+        while True:
+            with self._toggle_lock:
+                profile, open_browser, _ = self._toggle_queues[uuid][0]
+            try:
+                result = api.open_browser(uuid) if open_browser else api.close_browser(uuid)
+            except Exception as e:
+                result = {"type": "error", "title": str(e), "content": None}
+            if not self._finish_toggle(uuid, result):
+                return
 
     def _on_toggle_complete(self, result, profile: Dict, was_opening: bool):
         """Handle toggle completion"""
         action = "mo" if was_opening else "dong"
         uuid = profile.get('uuid')
 
-        is_success = False
-        if was_opening:
-            is_success = result.get('status') == 'successfully'
-        else:
-            message = result.get('message', '')
-            is_success = 'closed' in message.lower() or message == 'Profile closed'
-
-        if is_success:
+        if self._toggle_succeeded(result, was_opening):
             self._set_status(f"Da {action} profile {profile.get('name')} thanh cong", "success")
 
             new_check_open = 1 if was_opening else 0
@@ -642,33 +730,20 @@ class ProfilesTab(ctk.CTkFrame):
             error_msg = result.get('message') or result.get('title') or 'Loi khong xac dinh'
             self._set_status(f"Loi {action}: {error_msg}", "error")
 
+    @staticmethod
+    def _toggle_succeeded(result: Dict, was_opening: bool) -> bool:
+        if was_opening:
+            return result.get('status') == 'successfully'
+        message = result.get('message', '')
+        return 'closed' in message.lower() or message == 'Profile closed'
+
     def _update_card_status(self, uuid: str, check_open: int):
-        """Update card status without reloading"""
-        for card in self.profile_cards:
-            if card.profile_data.get('uuid') == uuid:
-                card.profile_data['check_open'] = check_open
-                card.is_running = check_open == 1
-
-                if card.is_running:
-                    card.toggle_btn.configure(
-                        text=" Dung",
-                        fg_color=COLORS["error"],
-                        hover_color=COLORS["error_hover"]
-                    )
-                    card.status_label.configure(
-                        text="  RUNNING",
-                        text_color=COLORS["success"]
-                    )
-                else:
-                    card.toggle_btn.configure(
-                        text=" Mo",
-                        fg_color=COLORS["success"],
-                        hover_color=COLORS["success_hover"]
-                    )
-                    card.status_label.configure(
-                        text="  STOPPED",
-                        text_color=COLORS["text_tertiary"]
-                    )
+        """Update card status without reloading (chỉ card đang hiển thị)"""
+        items = self.profile_list.items
+        for index in self.profile_list.visible_range():
+            if items[index].get('uuid') == uuid:
+                items[index]['check_open'] = check_open
+                self.profile_list.refresh(index)
                 break
 
     def _edit_profile(self, profile: Dict):
@@ -682,8 +757,7 @@ class ProfilesTab(ctk.CTkFrame):
             self._set_status("Chua chon profile nao", "warning")
             return
 
-        for profile in self.selected_profiles:
-            self._toggle_profile(profile, True)
+        self._toggle_many(list(self.selected_profiles), True)
 
     def _close_selected(self):
         """Close all selected profiles"""
@@ -691,8 +765,66 @@ class ProfilesTab(ctk.CTkFrame):
             self._set_status("Chua chon profile nao", "warning")
             return
 
-        for profile in self.selected_profiles:
-            self._toggle_profile(profile, False)
+        self._toggle_many(list(self.selected_profiles), False)
+
+    def _toggle_many(self, profiles: List[Dict], open_browser: bool):
+        """Open/close nhieu profiles qua AsyncHidemiumAPI (khong tao thread cho moi profile)"""
+        # Import muộn: aiohttp nặng, chỉ cần khi mở/đóng hàng loạt (không làm chậm khởi động)
+        from async_api_service import async_api, submit as submit_async
+
+        by_uuid = {p.get('uuid'): p for p in profiles if p.get('uuid')}
+        if not by_uuid:
+            return
+        action = "mo" if open_browser else "dong"
+        self._set_status(f"Dang {action} {len(by_uuid)} profiles...", "info")
+
+        results = {}
+        results_lock = threading.Lock()
+
+        def collect(uuid):
+            def done(result):
+                with results_lock:
+                    results[uuid] = result
+                    finished = len(results) == len(by_uuid)
+                if finished:
+                    self._safe_after(0, lambda: self._on_toggle_many_complete(results, by_uuid, open_browser))
+            return done
+
+        # Cùng hàng đợi theo UUID với _toggle_profile: profile đang có lệnh chạy thì lệnh hàng
+        # loạt chờ tới lượt (chạy qua _run_toggles), còn lại gửi một lượt qua asyncio
+        heads = [uuid for uuid, profile in by_uuid.items()
+                 if self._enqueue_toggle(profile, open_browser, collect(uuid))]
+        if not heads:
+            return
+
+        if open_browser:
+            future = submit_async(async_api.open_many(heads))
+        else:
+            future = submit_async(async_api.close_many(heads))
+
+        def on_done(fut):
+            try:
+                batch = fut.result()
+            except Exception as e:
+                batch = {uuid: {"type": "error", "title": str(e), "content": None} for uuid in heads}
+            for uuid in heads:
+                result = batch.get(uuid) or {"type": "error", "title": "Khong co ket qua", "content": None}
+                if self._finish_toggle(uuid, result):
+                    task_executor.submit("browser", self._run_toggles, uuid)
+
+        future.add_done_callback(on_done)
+
+    def _on_toggle_many_complete(self, results: Dict, by_uuid: Dict, was_opening: bool):
+        """Cap nhat tung profile, roi hien tong ket"""
+        for uuid, result in results.items():
+            self._on_toggle_complete(result, by_uuid[uuid], was_opening)
+
+        action = "mo" if was_opening else "dong"
+        failed = sum(1 for result in results.values() if not self._toggle_succeeded(result, was_opening))
+        if failed:
+            self._set_status(f"Da {action} {len(results) - failed}/{len(results)} profiles, {failed} loi", "warning")
+        else:
+            self._set_status(f"Da {action} {len(results)} profiles thanh cong", "success")
 
     def _delete_selected(self):
         """Delete selected profiles"""
@@ -707,13 +839,14 @@ class ProfilesTab(ctk.CTkFrame):
             result = api.delete_profiles(uuids)
             self._safe_after(0, lambda: self._on_delete_complete(result))
 
-        threading.Thread(target=do_delete, daemon=True).start()
+        task_executor.submit("io", do_delete)
 
     def _on_delete_complete(self, result):
         """Handle delete completion"""
         if result.get('type') == 'success':
             self._set_status("Da xoa thanh cong", "success")
             self.selected_profiles.clear()
+            self._selected_uuids.clear()
             self._load_profiles()
         else:
             self._set_status(f"Loi xoa: {result.get('title', 'Unknown')}", "error")
@@ -735,7 +868,7 @@ class ProfilesTab(ctk.CTkFrame):
                 result = api.create_profile(dialog.result)
                 self._safe_after(0, lambda: self._on_create_complete(result))
 
-            threading.Thread(target=do_create, daemon=True).start()
+            task_executor.submit("io", do_create)
 
     def _on_create_complete(self, result):
         """Handle create completion"""
@@ -13,15 +13,15 @@ import json as json_module
 from datetime import datetime, timedelta
 from tkinter import filedialog
 from config import COLORS
-from widgets import ModernButton, ModernEntry
+from widgets import ModernButton, ModernEntry, ui_updates, font, text_style
 from db import (
     get_profiles, get_pages, get_pages_for_profiles,
     save_reel_schedule, get_reel_schedules, update_reel_schedule,
     delete_reel_schedule, save_posted_reel, get_posted_reels
 )
 from api_service import api
+from task_service import task_executor, current_token
 from automation.window_manager import acquire_window_slot, release_window_slot, get_window_bounds
-from automation.cdp_helper import CDPHelper
 
 
 class ReelsPageTab(ctk.CTkFrame):
@@ -528,10 +528,14 @@ class ReelsPageTab(ctk.CTkFrame):
     def _load_profiles(self):
         """Load danh sách profiles"""
         def load():
-            self.profiles = get_profiles()
-            self.after(0, self._update_profile_menu)
+            profiles = get_profiles()
 
-        threading.Thread(target=load, daemon=True).start()
+            def apply():
+                self.profiles = profiles
+                self._update_profile_menu()
+            self.after(0, current_token().guard(apply))
+
+        task_executor.submit("db", load, key="reels.profiles")
 
     def _update_profile_menu(self):
         """Cập nhật dropdown profiles"""
@@ -569,11 +573,18 @@ class ReelsPageTab(ctk.CTkFrame):
         if not self.current_profile_uuid:
             return
 
+        profile_uuid = self.current_profile_uuid
+
         def load():
-            self.pages = get_pages_for_profiles([self.current_profile_uuid])
-            self.after(0, self._update_pages_list)
+            pages = get_pages_for_profiles([profile_uuid])
 
-        threading.Thread(target=load, daemon=True).start()
+            def apply():
+                self.pages = pages
+                self._update_pages_list()
+            self.after(0, current_token().guard(apply))
+
+        # Đổi profile liên tục: chỉ danh sách pages của profile chọn cuối được hiển thị
+        task_executor.submit("db", load, key="reels.pages")
 
     def _clear_pages_list(self):
         """Xóa danh sách pages"""
@@ -643,8 +654,7 @@ class ReelsPageTab(ctk.CTkFrame):
         ctk.CTkLabel(
             info_frame,
             text=page_name,
-            font=ctk.CTkFont(size=12, weight="bold"),
-            text_color=COLORS["text_primary"]
+            **text_style("row_title")
         ).pack(anchor="w")
 
         category = page.get('category', '')
@@ -652,8 +662,7 @@ class ReelsPageTab(ctk.CTkFrame):
             ctk.CTkLabel(
                 info_frame,
                 text=f"📁 {category}",
-                font=ctk.CTkFont(size=10),
-                text_color=COLORS["text_secondary"]
+                **text_style("row_small_muted")
             ).pack(anchor="w")
 
     def _update_selected_count(self):
@@ -763,36 +772,34 @@ class ReelsPageTab(ctk.CTkFrame):
                 continue
 
             page_name = page.get('page_name', 'Unknown')
-            self.after(0, lambda n=page_name, i=idx, t=total:
-                self.progress_label.configure(text=f"Đang đăng lên {n} ({i+1}/{t})...")
-            )
+            ui_updates.publish(self, "progress_label", self.progress_label.configure,
+                               text=f"Đang đăng lên {page_name} ({idx + 1}/{total})...")
 
             # TODO: Implement actual Reels posting via CDP
             # For now, simulate posting
             try:
                 self._post_reel_to_page(page, caption, hashtags)
                 success += 1
-                self._set_status(f"Đã đăng Reels lên {page_name}", "success")
+                ui_updates.publish(self, "status", self._set_status, f"Đã đăng Reels lên {page_name}", "success")
             except Exception as e:
                 failed += 1
-                self._set_status(f"Lỗi đăng lên {page_name}: {str(e)}", "error")
+                ui_updates.publish(self, "status", self._set_status, f"Lỗi đăng lên {page_name}: {e}", "error")
 
             # Delay between posts
             if idx < total - 1 and self._is_posting:
                 delay = random.randint(delay_min, delay_max)
-                self.after(0, lambda d=delay:
-                    self.progress_label.configure(text=f"Đợi {d} giây...")
-                )
+                ui_updates.publish(self, "progress_label", self.progress_label.configure,
+                                   text=f"Đợi {delay} giây...")
                 time.sleep(delay)
 
         # Done
         self._is_posting = False
-        self.after(0, lambda: self.post_btn.configure(state="normal"))
-        self.after(0, lambda: self.stop_btn.configure(state="disabled"))
-        self.after(0, lambda s=success, f=failed:
-            self.progress_label.configure(text=f"Hoàn tất: {s} thành công, {f} thất bại")
-        )
-        self._set_status(f"Hoàn tất đăng Reels: {success}/{total}", "success" if failed == 0 else "warning")
+        ui_updates.post(self, self.post_btn.configure, state="normal")
+        ui_updates.post(self, self.stop_btn.configure, state="disabled")
+        ui_updates.publish(self, "progress_label", self.progress_label.configure,
+                           text=f"Hoàn tất: {success} thành công, {failed} thất bại")
+        ui_updates.publish(self, "status", self._set_status, f"Hoàn tất đăng Reels: {success}/{total}",
+                           "success" if failed == 0 else "warning")
 
     def _open_browser_with_cdp(self, profile_uuid: str, max_browser_retries: int = 2):
         """
@@ -887,6 +894,7 @@ class ReelsPageTab(ctk.CTkFrame):
                 raise Exception("Không tìm thấy tab Facebook")
 
             # Bước 2: Kết nối CDPHelper
+            from automation.cdp_helper import CDPHelper
             cdp = CDPHelper()
             if not cdp.connect(remote_port=remote_port, ws_url=page_ws):
                 raise Exception("Không kết nối được CDPHelper")
@@ -1280,7 +1288,7 @@ class ReelsPageTab(ctk.CTkFrame):
                 'hashtags': hashtags,
                 'video_path': self.video_path,
                 'status': 'success'
-            })
+            }, defer=True)
 
             print(f"[ReelsPage] SUCCESS - Đã đăng Reels lên {page_name}")
             if final_reel_url:
@@ -1303,7 +1311,7 @@ class ReelsPageTab(ctk.CTkFrame):
                     'video_path': self.video_path if hasattr(self, 'video_path') else '',
                     'status': 'failed',
                     'error_message': str(e)
-                })
+                }, defer=True)
             except:
                 pass
             raise e
@@ -1375,9 +1383,9 @@ class ReelsPageTab(ctk.CTkFrame):
         """Load danh sách lịch đăng"""
         def load():
             schedules = get_reel_schedules(self.current_profile_uuid if self.current_profile_uuid else None)
-            self.after(0, lambda s=schedules: self._update_schedules_list(s))
+            self.after(0, current_token().guard(self._update_schedules_list, schedules))
 
-        threading.Thread(target=load, daemon=True).start()
+        task_executor.submit("db", load, key="reels.schedules")
 
     def _update_schedules_list(self, schedules: List[Dict]):
         """Cập nhật danh sách lịch đăng"""
@@ -1414,7 +1422,7 @@ class ReelsPageTab(ctk.CTkFrame):
         ctk.CTkLabel(
             frame,
             text=status_text.get(status, '⏳'),
-            font=ctk.CTkFont(size=20),
+            font=font(20),
             text_color=status_colors.get(status, COLORS["text_secondary"])
         ).pack(side="left", padx=10, pady=10)
 
@@ -1426,7 +1434,7 @@ class ReelsPageTab(ctk.CTkFrame):
         ctk.CTkLabel(
             info_frame,
             text=page_name,
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=font(13, "bold"),
             text_color=COLORS["text_primary"]
         ).pack(anchor="w")
 
@@ -1434,8 +1442,7 @@ class ReelsPageTab(ctk.CTkFrame):
         ctk.CTkLabel(
             info_frame,
             text=f"📅 {scheduled_time}",
-            font=ctk.CTkFont(size=11),
-            text_color=COLORS["text_secondary"]
+            **text_style("row_muted")
         ).pack(anchor="w")
 
         caption = schedule.get('caption', '')[:50]
@@ -1443,8 +1450,7 @@ class ReelsPageTab(ctk.CTkFrame):
             ctk.CTkLabel(
                 info_frame,
                 text=f"✏️ {caption}...",
-                font=ctk.CTkFont(size=10),
-                text_color=COLORS["text_secondary"]
+                **text_style("row_small_muted")
             ).pack(anchor="w")
 
         # Actions
@@ -1515,7 +1521,7 @@ class ReelsPageTab(ctk.CTkFrame):
         ctk.CTkLabel(
             info_frame,
             text=f"{status_icon} {reel.get('page_name', 'Unknown')}",
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=font(13, "bold"),
             text_color=status_color
         ).pack(anchor="w")
 
@@ -1526,8 +1532,7 @@ class ReelsPageTab(ctk.CTkFrame):
             url_label = ctk.CTkLabel(
                 info_frame,
                 text=url_display,
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["accent"],
+                **text_style("row_link"),
                 cursor="hand2"
             )
             url_label.pack(anchor="w")
@@ -1540,8 +1545,7 @@ class ReelsPageTab(ctk.CTkFrame):
             ctk.CTkLabel(
                 info_frame,
                 text=f"📝 {caption_display}",
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["text_secondary"]
+                **text_style("row_muted")
             ).pack(anchor="w")
 
         # Time
@@ -1550,8 +1554,7 @@ class ReelsPageTab(ctk.CTkFrame):
             ctk.CTkLabel(
                 info_frame,
                 text=f"🕐 {posted_at}",
-                font=ctk.CTkFont(size=10),
-                text_color=COLORS["text_secondary"]
+                **text_style("row_small_muted")
             ).pack(anchor="w")
 
         # Right: Action buttons
@@ -1655,6 +1658,7 @@ class ReelsPageTab(ctk.CTkFrame):
                 raise Exception("Không tìm thấy tab")
 
             # Kết nối CDPHelper
+            from automation.cdp_helper import CDPHelper
             cdp = CDPHelper()
             if not cdp.connect(remote_port=remote_port, ws_url=page_ws):
                 raise Exception("Không kết nối được CDPHelper")
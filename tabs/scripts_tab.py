@@ -12,13 +12,12 @@ import random
 import re
 from datetime import datetime, timedelta
 from config import COLORS
-from widgets import ModernCard, ModernButton, ModernEntry, ModernTextbox
+from widgets import ModernCard, ModernButton, ModernEntry, ModernTextbox, font, text_style
 from db import (
     get_schedules, get_schedule, save_schedule, delete_schedule,
     update_schedule_stats, get_categories, get_groups, get_contents
 )
 from api_service import api
-from automation import CDPHelper
 from automation.window_manager import acquire_window_slot, release_window_slot, get_window_bounds
 
 
@@ -537,8 +536,7 @@ class ScriptsTab(ctk.CTkFrame):
             ctk.CTkLabel(
                 self.profile_scroll,
                 text="Không có profile nào",
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["text_secondary"]
+                **text_style("row_muted")
             ).pack(pady=20)
             return
 
@@ -621,7 +619,7 @@ class ScriptsTab(ctk.CTkFrame):
             self.empty_label = ctk.CTkLabel(
                 self.schedule_list,
                 text="📭 Chưa có kịch bản nào\nBấm '+ Tạo kịch bản' để bắt đầu",
-                font=ctk.CTkFont(size=13),
+                font=font(13),
                 text_color=COLORS["text_secondary"],
                 justify="center"
             )
@@ -651,14 +649,14 @@ class ScriptsTab(ctk.CTkFrame):
         ctk.CTkLabel(
             header_row,
             text=status_text,
-            font=ctk.CTkFont(size=14)
+            font=font(14)
         ).pack(side="left")
 
         # Name
         ctk.CTkLabel(
             header_row,
             text=schedule.get('name', 'Không tên'),
-            font=ctk.CTkFont(size=13, weight="bold"),
+            font=font(13, "bold"),
             text_color=COLORS["text_primary"]
         ).pack(side="left", padx=5)
 
@@ -666,8 +664,7 @@ class ScriptsTab(ctk.CTkFrame):
         ctk.CTkLabel(
             inner,
             text=f"📁 {schedule.get('folder_name', 'N/A')}",
-            font=ctk.CTkFont(size=11),
-            text_color=COLORS["text_secondary"]
+            **text_style("row_muted")
         ).pack(anchor="w")
 
         # Time slots
@@ -683,8 +680,7 @@ class ScriptsTab(ctk.CTkFrame):
         ctk.CTkLabel(
             inner,
             text=f"⏰ {time_text}",
-            font=ctk.CTkFont(size=11),
-            text_color=COLORS["text_secondary"]
+            **text_style("row_muted")
         ).pack(anchor="w")
 
         # Stats
@@ -692,7 +688,7 @@ class ScriptsTab(ctk.CTkFrame):
         ctk.CTkLabel(
             inner,
             text=stats_text,
-            font=ctk.CTkFont(size=10),
+            font=font(10),
             text_color=COLORS["success"] if schedule.get('success_count', 0) > 0 else COLORS["text_secondary"]
         ).pack(anchor="w")
 
@@ -883,8 +879,7 @@ class ScriptsTab(ctk.CTkFrame):
             ctk.CTkLabel(
                 self.group_scroll,
                 text="Không có nhóm nào",
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["text_secondary"]
+                **text_style("row_muted")
             ).pack(pady=20)
             return
 
@@ -903,8 +898,7 @@ class ScriptsTab(ctk.CTkFrame):
             ctk.CTkLabel(
                 self.group_scroll,
                 text=f"Không tìm thấy nhóm nào với '{filter_text}'",
-                font=ctk.CTkFont(size=11),
-                text_color=COLORS["text_secondary"]
+                **text_style("row_muted")
             ).pack(pady=20)
             return
 
@@ -1160,6 +1154,7 @@ class ScriptsTab(ctk.CTkFrame):
             time.sleep(1)
 
             # Kết nối CDP
+            from automation import CDPHelper
             helper = CDPHelper()
             if not helper.connect(remote_port=remote_port, ws_url=ws_url):
                 self.after(0, lambda pn=profile_name: self._log(f"[{pn}] ❌ Không kết nối được CDP"))
@@ -0,0 +1,288 @@
+"""
+Executor dùng chung cho việc nền của UI: pool giới hạn theo nhóm (io, browser, db),
+submit theo key thay thế task cũ cùng key, cancel token để task dừng sớm.
+
+Cách dùng:
+    def fetch():
+        folders = api.get_folders()
+        # guard: bỏ kết quả nếu đã có request mới hơn cùng key (kiểm tra lúc chạy trên UI thread)
+        self._safe_after(0, current_token().guard(self._on_folders_loaded, folders))
+
+    task_executor.submit("io", fetch, key="profiles.folders")
+"""
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+# Số worker tối đa mỗi nhóm: io = gọi Hidemium API/HTTP, browser = mở/đóng/điều khiển browser, db = SQLite
+TASK_CATEGORIES = {
+    "io": 8,
+    "browser": 4,
+    "db": 2,
+}
+TASK_STATS_WINDOW = 200  # Số task gần nhất để tính độ trễ
+
+
+class TaskCancelled(Exception):
+    """Task bị hủy (bởi cancel() hoặc bị task mới cùng key thay thế)"""
+
+
+class CancelToken:
+    """Cờ hủy cho task - task tự kiểm tra ở các điểm dừng hợp lý"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        self._event.set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TaskCancelled()
+
+    def wait(self, timeout: float) -> bool:
+        """Ngủ tối đa timeout giây, dậy sớm nếu bị hủy. Trả True nếu đã bị hủy"""
+        return self._event.wait(timeout)
+
+    def guard(self, func: Callable, *args, **kwargs) -> Callable:
+        """Callback chỉ chạy func nếu token chưa bị hủy lúc được gọi (dùng với after())"""
+        def call():
+            if not self._event.is_set():
+                return func(*args, **kwargs)
+        return call
+
+
+_NEVER_CANCELLED = CancelToken()
+_local = threading.local()
+
+
+def current_token() -> CancelToken:
+    """Token của task đang chạy trên thread hiện tại (ngoài executor: token không bao giờ bị hủy)"""
+    return getattr(_local, "token", None) or _NEVER_CANCELLED
+
+
+class TaskHandle:
+    """Kết quả submit: future + token + key"""
+
+    def __init__(self, category: str, key: Optional[str], future: Future, token: CancelToken):
+        self.category = category
+        self.key = key
+        self.future = future
+        self.token = token
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def cancel(self):
+        """Hủy: task chưa chạy thì bỏ luôn, đang chạy thì báo qua token"""
+        self.token.cancel()
+        self.future.cancel()
+
+
+class _WorkerPool:
+    """
+    Pool thread daemon (như các threading.Thread(daemon=True) trước đây: không giữ app khi thoát),
+    tạo thêm worker khi không có worker rảnh, tối đa max_workers.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._queue = queue.SimpleQueue()
+        self._idle = threading.Semaphore(0)
+        self._threads = []
+
+    def submit(self, fn: Callable) -> Future:
+        future = Future()
+        self._queue.put((future, fn))
+        if not self._idle.acquire(blocking=False) and len(self._threads) < self.max_workers:
+            thread = threading.Thread(target=self._worker, name=f"{self.name}-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+        return future
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, fn = item
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn())
+                except BaseException as e:
+                    future.set_exception(e)
+            self._idle.release()
+
+    def shutdown(self):
+        for _ in self._threads:
+            self._queue.put(None)
+
+
+class _CategoryStats:
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.superseded = 0
+        self.queued = 0
+        self.running = 0
+        self.waits = deque(maxlen=TASK_STATS_WINDOW)  # giây từ submit tới lúc bắt đầu chạy
+        self.durations = deque(maxlen=TASK_STATS_WINDOW)
+
+
+class TaskExecutor:
+    """
+    Pool thread theo nhóm, tạo lười khi nhóm được dùng lần đầu.
+
+    Args:
+        limits: {nhóm: số worker tối đa}, mặc định TASK_CATEGORIES
+    """
+
+    def __init__(self, limits: Dict[str, int] = None):
+        self.limits = dict(limits or TASK_CATEGORIES)
+        self._lock = threading.Lock()
+        self._pools: Dict[str, _WorkerPool] = {}
+        self._keyed: Dict[str, TaskHandle] = {}
+        self._stats = {category: _CategoryStats() for category in self.limits}
+
+    def submit(self, category: str, func: Callable, *args, key: Optional[str] = None, **kwargs) -> TaskHandle:
+        """
+        Chạy func(*args, **kwargs) trên pool của nhóm.
+
+        Args:
+            category: Nhóm pool ("io", "browser", "db")
+            key: Task đang chờ/chạy cùng key bị hủy và thay bằng task này
+        """
+        if category not in self.limits:
+            raise ValueError(f"Unknown task category: {category}")
+
+        token = CancelToken()
+        stats = self._stats[category]
+        submitted_at = time.perf_counter()
+
+        def run():
+            # Lock cũng đảm bảo submit() đã gán xong `handle` trước khi task chạy
+            with self._lock:
+                stats.queued -= 1
+                stats.running += 1
+                stats.waits.append(time.perf_counter() - submitted_at)
+            started = time.perf_counter()
+            outcome = "completed"
+            _local.token = token
+            try:
+                token.raise_if_cancelled()
+                return func(*args, **kwargs)
+            except TaskCancelled:
+                outcome = "cancelled"
+                raise
+            except Exception as e:
+                outcome = "failed"
+                print(f"[Task] {category}/{key or getattr(func, '__name__', 'task')} failed: {e}")
+                raise
+            finally:
+                _local.token = None
+                with self._lock:
+                    stats.running -= 1
+                    stats.durations.append(time.perf_counter() - started)
+                    if outcome == "completed" and token.cancelled:
+                        outcome = "cancelled"  # Chạy hết nhưng kết quả đã bị thay thế
+                    setattr(stats, outcome, getattr(stats, outcome) + 1)
+                    if key is not None and self._keyed.get(key) is handle:
+                        del self._keyed[key]
+
+        with self._lock:
+            pool = self._pools.get(category)
+            if pool is None:
+                pool = self._pools[category] = _WorkerPool(f"task-{category}", self.limits[category])
+            previous = self._keyed.get(key) if key is not None else None
+            stats.submitted += 1
+            stats.queued += 1
+            future = pool.submit(run)
+            handle = TaskHandle(category, key, future, token)
+            if key is not None:
+                self._keyed[key] = handle
+
+        if previous is not None and not previous.done():
+            previous.token.cancel()
+            if previous.future.cancel():
+                # Chưa kịp chạy: run() không được gọi, tự trừ hàng đợi
+                with self._lock:
+                    prev_stats = self._stats[previous.category]
+                    prev_stats.queued -= 1
+                    prev_stats.cancelled += 1
+            with self._lock:
+                self._stats[previous.category].superseded += 1
+        return handle
+
+    def cancel(self, key: str) -> bool:
+        """Hủy task đang chờ/chạy theo key"""
+        with self._lock:
+            handle = self._keyed.get(key)
+        if handle is None:
+            return False
+        handle.token.cancel()
+        if handle.future.cancel():
+            with self._lock:
+                stats = self._stats[handle.category]
+                stats.queued -= 1
+                stats.cancelled += 1
+                if self._keyed.get(key) is handle:
+                    del self._keyed[key]
+        return True
+
+    def stats(self) -> Dict[str, Dict]:
+        """Số liệu mỗi nhóm: hàng đợi, đang chạy, số task theo kết quả, độ trễ chờ/chạy (ms)"""
+        result = {}
+        with self._lock:
+            for category, stats in self._stats.items():
+                waits = sorted(stats.waits)
+                durations = sorted(stats.durations)
+                result[category] = {
+                    "workers": self.limits[category],
+                    "queued": stats.queued,
+                    "running": stats.running,
+                    "submitted": stats.submitted,
+                    "completed": stats.completed,
+                    "failed": stats.failed,
+                    "cancelled": stats.cancelled,
+                    "superseded": stats.superseded,
+                    "wait_p50_ms": _percentile(waits, 0.5) * 1000,
+                    "wait_p95_ms": _percentile(waits, 0.95) * 1000,
+                    "run_p50_ms": _percentile(durations, 0.5) * 1000,
+                    "run_p95_ms": _percentile(durations, 0.95) * 1000,
+                }
+        return result
+
+    def shutdown(self):
+        """Hủy mọi task keyed và dừng các pool (task đang chạy tự dừng theo token)"""
+        with self._lock:
+            handles = list(self._keyed.values())
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for handle in handles:
+            handle.token.cancel()
+        for pool in pools:
+            pool.shutdown()
+
+
+def _percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+task_executor = TaskExecutor()
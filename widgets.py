@@ -3,8 +3,47 @@ Custom Widgets - SonCuto FB Pro
 Modern UI components
 """
 import customtkinter as ctk
-from typing import Callable, Optional, List, Dict
-from config import COLORS
+import itertools
+import threading
+from typing import Callable, Optional, List, Dict, Tuple
+from config import COLORS, FONTS, TEXT_STYLES, HEIGHTS, SPACING, RADIUS
+
+
+# ==================== STYLE CACHE ====================
+# Row/card dựng hàng nghìn lần: dùng chung CTkFont và bộ style thay vì tạo mới cho từng widget.
+# Font dùng chung không được configure() tại chỗ (sẽ đổi font của mọi widget đang dùng nó).
+
+_fonts: Dict[Tuple[int, str, Optional[str]], ctk.CTkFont] = {}
+_text_styles: Dict[str, Dict] = {}
+
+
+def font(size: int = FONTS["size_base"], weight: str = "normal", family: Optional[str] = None) -> ctk.CTkFont:
+    """CTkFont dùng chung theo (size, weight, family), tạo lần đầu khi cần (sau khi đã có Tk root)"""
+    key = (size, weight, family)
+    cached = _fonts.get(key)
+    if cached is None:
+        cached = _fonts[key] = ctk.CTkFont(family=family, size=size, weight=weight)
+    return cached
+
+
+def text_style(name: str) -> Dict:
+    """font + text_color dựng sẵn theo config.TEXT_STYLES: ctk.CTkLabel(row, text="", **text_style("row_muted"))"""
+    style = _text_styles.get(name)
+    if style is None:
+        size, weight, family, color = TEXT_STYLES[name]
+        style = _text_styles[name] = {"font": font(size, weight, family), "text_color": COLORS[color]}
+    return style
+
+
+# Màu ModernButton theo variant: (fg, hover, text)
+BUTTON_VARIANTS = {
+    "primary": (COLORS["primary"], COLORS["primary_hover"], COLORS["bg_main"]),
+    "secondary": (COLORS["secondary"], COLORS["secondary_hover"], "#fff"),
+    "success": (COLORS["success"], COLORS["primary_hover"], COLORS["bg_main"]),
+    "warning": (COLORS["warning"], "#f5c842", COLORS["bg_main"]),
+    "danger": (COLORS["error"], "#ff6b6b", "#fff"),
+    "ghost": (COLORS["bg_card"], COLORS["bg_card_hover"], COLORS["text_primary"]),
+}
 
 
 class ModernCard(ctk.CTkFrame):
@@ -25,7 +64,7 @@ class ModernCard(ctk.CTkFrame):
             self.title_label = ctk.CTkLabel(
                 self,
                 text=title,
-                font=ctk.CTkFont(size=13, weight="bold"),
+                font=font(13, "bold"),
                 text_color=COLORS.get("text_primary", "#f0f6fc")
             )
             self.title_label.pack(anchor="w", padx=12, pady=(10, 6))
@@ -34,18 +73,7 @@ class ModernCard(ctk.CTkFrame):
 class ModernButton(ctk.CTkButton):
     """Button component - Modern style"""
     def __init__(self, master, text: str, variant: str = "primary", icon: str = None, **kwargs):
-        # Color mappings
-        bg_main = COLORS.get("bg_main", "#0d1117")
-        colors = {
-            "primary": (COLORS.get("primary", "#00d97e"), COLORS.get("primary_hover", "#2ee89a"), bg_main),
-            "secondary": (COLORS.get("secondary", "#ff6b9d"), COLORS.get("secondary_hover", "#ff85b1"), "#fff"),
-            "success": (COLORS.get("success", "#00d97e"), COLORS.get("primary_hover", "#2ee89a"), bg_main),
-            "warning": (COLORS.get("warning", "#f0b429"), "#f5c842", bg_main),
-            "danger": (COLORS.get("error", "#f85149"), "#ff6b6b", "#fff"),
-            "ghost": (COLORS.get("bg_card", "#21262d"), COLORS.get("bg_card_hover", "#30363d"), COLORS.get("text_primary", "#f0f6fc"))
-        }
-
-        fg, hover, txt = colors.get(variant, colors["primary"])
+        fg, hover, txt = BUTTON_VARIANTS.get(variant, BUTTON_VARIANTS["primary"])
 
         super().__init__(
             master,
@@ -53,9 +81,9 @@ class ModernButton(ctk.CTkButton):
             fg_color=fg,
             hover_color=hover,
             corner_radius=6,
-            font=ctk.CTkFont(size=12, weight="bold"),
+            font=font(12, "bold"),
             text_color=txt,
-            height=34,
+            height=HEIGHTS["button"],
             **kwargs
         )
 
@@ -71,8 +99,8 @@ class ModernEntry(ctk.CTkEntry):
             text_color=COLORS.get("text_primary", "#f0f6fc"),
             placeholder_text_color=COLORS.get("text_muted", "#6e7681"),
             corner_radius=6,
-            height=34,
-            font=ctk.CTkFont(size=12),
+            height=HEIGHTS["input"],
+            font=font(12),
             **kwargs
         )
 
@@ -86,7 +114,7 @@ class ModernTextbox(ctk.CTkTextbox):
             border_color=COLORS.get("border", "#30363d"),
             text_color=COLORS.get("text_primary", "#f0f6fc"),
             corner_radius=6,
-            font=ctk.CTkFont(family="Consolas", size=11),
+            font=font(11, family=FONTS["family_mono"]),
             border_width=1,
             **kwargs
         )
@@ -114,10 +142,11 @@ class ProfileCard(ctk.CTkFrame):
         self.on_edit = on_edit
         self.on_select = on_select
         self.is_selected = False
-        self.is_running = profile_data.get('check_open') == 1
+        self.is_running = False
 
         self.pack_propagate(False)
         self._create_widgets()
+        self.set_profile(profile_data)
         self.bind("<Enter>", self._on_enter)
         self.bind("<Leave>", self._on_leave)
 
@@ -140,7 +169,7 @@ class ProfileCard(ctk.CTkFrame):
         self.avatar = ctk.CTkLabel(
             self,
             text="👤",
-            font=ctk.CTkFont(size=20),
+            font=font(20),
             width=32,
             height=32
         )
@@ -151,60 +180,42 @@ class ProfileCard(ctk.CTkFrame):
         info_frame.place(x=80, y=14)
 
         # Name
-        name = self.profile_data.get('name', 'Unknown')
-        ctk.CTkLabel(
+        self.name_label = ctk.CTkLabel(
             info_frame,
-            text=name[:22] + "..." if len(name) > 22 else name,
-            font=ctk.CTkFont(size=12, weight="bold"),
-            text_color=COLORS.get("text_primary", "#f0f6fc")
-        ).pack(anchor="w")
+            text="",
+            **text_style("row_title")
+        )
+        self.name_label.pack(anchor="w")
 
         # UUID + Status
         meta_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
         meta_frame.pack(anchor="w")
 
-        uuid = self.profile_data.get('uuid', '')[:10]
-        ctk.CTkLabel(
+        self.uuid_label = ctk.CTkLabel(
             meta_frame,
-            text=f"{uuid}...",
-            font=ctk.CTkFont(family="Consolas", size=9),
-            text_color=COLORS.get("text_muted", "#6e7681")
-        ).pack(side="left")
+            text="",
+            **text_style("row_mono")
+        )
+        self.uuid_label.pack(side="left")
 
-        self.is_running = self.profile_data.get('check_open', 0) == 1
-        status_color = COLORS.get("online", "#3fb950") if self.is_running else COLORS.get("offline", "#6e7681")
-        status_text = "● ON" if self.is_running else "● OFF"
-        ctk.CTkLabel(
+        self.status_label = ctk.CTkLabel(
             meta_frame,
-            text=f"  {status_text}",
-            font=ctk.CTkFont(size=9),
-            text_color=status_color
-        ).pack(side="left")
+            text="",
+            font=font(9)
+        )
+        self.status_label.pack(side="left")
 
         # Buttons
         btn_frame = ctk.CTkFrame(self, fg_color="transparent")
         btn_frame.place(relx=1.0, x=-10, y=22, anchor="ne")
 
-        bg_main = COLORS.get("bg_main", "#0d1117")
-        if self.is_running:
-            btn_text = "Stop"
-            btn_color = COLORS.get("error", "#f85149")
-            btn_hover = "#ff6b6b"
-        else:
-            btn_text = "Start"
-            btn_color = COLORS.get("primary", "#00d97e")
-            btn_hover = COLORS.get("primary_hover", "#2ee89a")
-
         self.toggle_btn = ctk.CTkButton(
             btn_frame,
-            text=btn_text,
+            text="",
             width=55,
             height=26,
-            fg_color=btn_color,
-            hover_color=btn_hover,
             corner_radius=4,
-            font=ctk.CTkFont(size=10, weight="bold"),
-            text_color=bg_main if not self.is_running else "#fff",
+            font=font(10, "bold"),
             command=self._on_toggle_click
         )
         self.toggle_btn.pack(side="left", padx=2)
@@ -220,6 +231,33 @@ class ProfileCard(ctk.CTkFrame):
             command=lambda: self.on_edit(self.profile_data) if self.on_edit else None
         )
         self.edit_btn.pack(side="left", padx=2)
+
+    def set_profile(self, profile_data: Dict, selected: bool = False):
+        """Gắn profile vào card (dùng lại card khi cuộn trong VirtualList)"""
+        self.profile_data = profile_data
+        self.is_selected = selected
+        self.checkbox_var.set(selected)
+        self.configure(border_color=COLORS.get("primary", "#00d97e") if selected else COLORS.get("border", "#30363d"))
+
+        name = profile_data.get('name', 'Unknown')
+        self.name_label.configure(text=name[:22] + "..." if len(name) > 22 else name)
+        self.uuid_label.configure(text=f"{profile_data.get('uuid', '')[:10]}...")
+        self.set_running(profile_data.get('check_open', 0) == 1)
+
+    def set_running(self, is_running: bool):
+        """Cập nhật trạng thái ON/OFF và nút Start/Stop"""
+        self.is_running = is_running
+        self.status_label.configure(
+            text="  ● ON" if is_running else "  ● OFF",
+            text_color=COLORS.get("online", "#3fb950") if is_running else COLORS.get("offline", "#6e7681")
+        )
+        if is_running:
+            self.toggle_btn.configure(text="Stop", fg_color=COLORS.get("error", "#f85149"),
+                                      hover_color="#ff6b6b", text_color="#fff")
+        else:
+            self.toggle_btn.configure(text="Start", fg_color=COLORS.get("primary", "#00d97e"),
+                                      hover_color=COLORS.get("primary_hover", "#2ee89a"),
+                                      text_color=COLORS.get("bg_main", "#0d1117"))
     
     def _on_toggle_click(self):
         if self.on_toggle:
@@ -270,7 +308,7 @@ class PostCard(ctk.CTkFrame):
         self.url_label = ctk.CTkLabel(
             self,
             text=f"🔗 {url_display}",
-            font=ctk.CTkFont(family="Segoe UI", size=11),
+            font=font(11, family=FONTS["family"]),
             text_color=COLORS["primary"],  # Green link
             cursor="hand2"
         )
@@ -281,7 +319,7 @@ class PostCard(ctk.CTkFrame):
         self.title_label = ctk.CTkLabel(
             self,
             text=title[:70] + "..." if len(title) > 70 else title,
-            font=ctk.CTkFont(family="Segoe UI", size=12, weight="bold"),
+            font=font(12, "bold", FONTS["family"]),
             text_color=COLORS["text_primary"]
         )
         self.title_label.pack(anchor="w", padx=12, pady=2)
@@ -300,14 +338,14 @@ class PostCard(ctk.CTkFrame):
         ctk.CTkLabel(
             stats_frame,
             text=f"❤️ {like_count}",
-            font=ctk.CTkFont(size=11),
+            font=font(11),
             text_color=COLORS["secondary"]  # Pink
         ).pack(side="left", padx=(0, 12))
 
         ctk.CTkLabel(
             stats_frame,
             text=f"💬 {comment_count}",
-            font=ctk.CTkFont(size=11),
+            font=font(11),
             text_color=COLORS["text_muted"] if "text_muted" in COLORS else COLORS["text_secondary"]
         ).pack(side="left")
 
@@ -323,7 +361,7 @@ class PostCard(ctk.CTkFrame):
             fg_color=COLORS["secondary"],  # Pink
             hover_color=COLORS["secondary_hover"],
             corner_radius=6,
-            font=ctk.CTkFont(size=10, weight="bold"),
+            font=font(10, "bold"),
             text_color=COLORS["text_primary"],
             command=lambda: self.on_like(self.post_data) if self.on_like else None
         ).pack(side="left", padx=2)
@@ -336,7 +374,7 @@ class PostCard(ctk.CTkFrame):
             fg_color=COLORS["primary"],  # Green
             hover_color=COLORS["primary_hover"],
             corner_radius=6,
-            font=ctk.CTkFont(size=10, weight="bold"),
+            font=font(10, "bold"),
             text_color=COLORS["bg_dark"],
             command=lambda: self.on_comment(self.post_data) if self.on_comment else None
         ).pack(side="left", padx=2)
@@ -384,14 +422,14 @@ class ScriptCard(ctk.CTkFrame):
         ctk.CTkLabel(
             header_frame,
             text="📜",
-            font=ctk.CTkFont(size=18)
+            font=font(18)
         ).pack(side="left", padx=(0, 8))
 
         name = self.script_data.get('name', 'Untitled Script')
         ctk.CTkLabel(
             header_frame,
             text=name,
-            font=ctk.CTkFont(family="Segoe UI", size=13, weight="bold"),
+            font=font(13, "bold", FONTS["family"]),
             text_color=COLORS["text_primary"]
         ).pack(side="left")
 
@@ -401,7 +439,7 @@ class ScriptCard(ctk.CTkFrame):
             ctk.CTkLabel(
                 self,
                 text=desc[:80] + "..." if len(desc) > 80 else desc,
-                font=ctk.CTkFont(size=11),
+                font=font(11),
                 text_color=COLORS["text_muted"] if "text_muted" in COLORS else COLORS["text_secondary"]
             ).pack(anchor="w", padx=12, pady=2)
 
@@ -417,7 +455,7 @@ class ScriptCard(ctk.CTkFrame):
             fg_color=COLORS["primary"],  # Green
             hover_color=COLORS["primary_hover"],
             corner_radius=6,
-            font=ctk.CTkFont(size=11, weight="bold"),
+            font=font(11, "bold"),
             text_color=COLORS["bg_dark"],
             command=lambda: self.on_run(self.script_data) if self.on_run else None
         ).pack(side="left", padx=2)
@@ -430,7 +468,7 @@ class ScriptCard(ctk.CTkFrame):
             fg_color=COLORS["bg_secondary"],
             hover_color=COLORS["border_light"] if "border_light" in COLORS else COLORS["border"],
             corner_radius=6,
-            font=ctk.CTkFont(size=11),
+            font=font(11),
             command=lambda: self.on_edit(self.script_data) if self.on_edit else None
         ).pack(side="left", padx=2)
 
@@ -446,13 +484,66 @@ class ScriptCard(ctk.CTkFrame):
         ).pack(side="left", padx=2)
 
 
+class Badge(ctk.CTkLabel):
+    """Nhãn nhỏ có nền màu theo variant"""
+
+    VARIANTS = {
+        "primary": (COLORS["primary"], COLORS["bg_main"]),
+        "success": (COLORS["success"], COLORS["bg_main"]),
+        "warning": (COLORS["warning"], COLORS["bg_main"]),
+        "error": (COLORS["error"], "#fff"),
+        "info": (COLORS["info"], COLORS["bg_main"]),
+        "muted": (COLORS["bg_card_hover"], COLORS["text_secondary"]),
+    }
+
+    def __init__(self, master, text: str, variant: str = "muted", **kwargs):
+        bg, fg = self.VARIANTS.get(variant, self.VARIANTS["muted"])
+        super().__init__(
+            master,
+            text=f" {text} ",
+            fg_color=bg,
+            text_color=fg,
+            corner_radius=RADIUS["sm"],
+            height=18,
+            font=font(FONTS["size_xs"], "bold"),
+            **kwargs
+        )
+
+
+class EmptyState(ctk.CTkFrame):
+    """Trạng thái danh sách rỗng: icon, tiêu đề, mô tả và nút hành động (tùy chọn)"""
+    def __init__(self, master, icon: str = "", title: str = "", description: str = "",
+                 action_text: str = None, on_action: Callable = None, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+
+        if icon:
+            ctk.CTkLabel(self, text=icon, font=font(FONTS["size_2xl"])).pack(pady=(0, SPACING["sm"]))
+        if title:
+            ctk.CTkLabel(
+                self,
+                text=title,
+                font=font(FONTS["size_md"], "bold"),
+                text_color=COLORS["text_primary"]
+            ).pack()
+        if description:
+            ctk.CTkLabel(
+                self,
+                text=description,
+                font=font(FONTS["size_sm"]),
+                text_color=COLORS["text_secondary"],
+                justify="center"
+            ).pack(pady=(SPACING["xs"], 0))
+        if action_text and on_action:
+            ModernButton(self, text=action_text, command=on_action).pack(pady=(SPACING["md"], 0))
+
+
 class StatusBar(ctk.CTkFrame):
     """Status bar - Modern compact"""
     def __init__(self, master, **kwargs):
         super().__init__(
             master,
             fg_color=COLORS.get("bg_header", "#161b22"),
-            height=26,
+            height=HEIGHTS["status_bar"],
             corner_radius=0,
             **kwargs
         )
@@ -462,7 +553,7 @@ class StatusBar(ctk.CTkFrame):
         self.status_label = ctk.CTkLabel(
             self,
             text="● Ready",
-            font=ctk.CTkFont(size=10),
+            font=font(10),
             text_color=COLORS.get("online", "#3fb950")
         )
         self.status_label.pack(side="left", padx=12)
@@ -470,27 +561,144 @@ class StatusBar(ctk.CTkFrame):
         self.info_label = ctk.CTkLabel(
             self,
             text="SonCuto FB v2.0",
-            font=ctk.CTkFont(size=9),
+            font=font(9),
             text_color=COLORS.get("text_muted", "#6e7681")
         )
         self.info_label.pack(side="right", padx=12)
 
+    STATUS_COLORS = {
+        "success": COLORS["online"],
+        "error": COLORS["error"],
+        "warning": COLORS["warning"],
+        "info": COLORS["text_muted"],
+    }
+
     def set_status(self, text: str, status_type: str = "info"):
-        colors = {
-            "success": COLORS.get("online", "#3fb950"),
-            "error": COLORS.get("error", "#f85149"),
-            "warning": COLORS.get("warning", "#f0b429"),
-            "info": COLORS.get("text_muted", "#6e7681")
-        }
-        self.status_label.configure(text=f"● {text}", text_color=colors.get(status_type, colors["info"]))
+        self.status_label.configure(
+            text=f"● {text}",
+            text_color=self.STATUS_COLORS.get(status_type, self.STATUS_COLORS["info"])
+        )
+
+
+SEARCH_DEBOUNCE_MS = 150  # Chờ ngừng gõ trước khi lọc danh sách
+
+
+class Debouncer:
+    """
+    Gộp các lần gọi liên tiếp (vd. mỗi phím gõ) thành một lần gọi callback,
+    chạy sau `delay` ms kể từ lần gọi cuối.
+
+    Args:
+        widget: Widget dùng để đặt lịch after()
+        delay: Thời gian chờ (ms)
+        callback: Hàm được gọi với tham số của lần gọi cuối
+    """
+    def __init__(self, widget, delay: int, callback: Callable):
+        self.widget = widget
+        self.delay = delay
+        self.callback = callback
+        self._job = None
+
+    def __call__(self, *args):
+        self.cancel()
+        self._job = self.widget.after(self.delay, lambda: self._fire(args))
+
+    def _fire(self, args):
+        self._job = None
+        self.callback(*args)
+
+    def cancel(self):
+        if self._job is not None:
+            try:
+                self.widget.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def flush(self, *args):
+        """Gọi callback ngay, bỏ lần gọi đang chờ"""
+        self.cancel()
+        self.callback(*args)
+
+
+class UIDispatcher:
+    """
+    Gom cập nhật UI từ worker thread, áp dụng trên Tk thread mỗi frame một lần.
+
+    - publish(owner, key, func, *args, **kwargs): cập nhật theo key (vd. "status", "scan_progress"),
+      chỉ giữ lần publish mới nhất của mỗi (owner, key) trong một frame
+    - post(owner, func, *args, **kwargs): sự kiện không được gộp (log, hoàn tất, lỗi)
+
+    Mọi cập nhật chạy theo thứ tự publish/post cuối cùng, owner đã bị destroy thì bỏ qua.
+    """
+
+    FRAME_MS = 16
+
+    def __init__(self, frame_ms: int = FRAME_MS):
+        self.frame_ms = frame_ms
+        self._root = None
+        self._lock = threading.Lock()
+        self._pending: Dict = {}  # (owner id, key) -> (owner, func, args, kwargs), theo thứ tự
+        self._event_ids = itertools.count()
+        self._scheduled = False
+        self.applied = 0
+        self.coalesced = 0  # Số cập nhật bị thay bởi bản mới hơn trước khi kịp áp dụng
+
+    def attach(self, root):
+        """Gắn Tk root (gọi trên Tk thread), áp dụng các cập nhật đang chờ"""
+        self._root = root
+        with self._lock:
+            has_pending = bool(self._pending)
+            self._scheduled = has_pending
+        if has_pending:
+            root.after(self.frame_ms, self._flush)
+
+    def publish(self, owner, key: str, func: Callable, *args, **kwargs):
+        self._add((id(owner), key), owner, func, args, kwargs)
+
+    def post(self, owner, func: Callable, *args, **kwargs):
+        self._add(("event", next(self._event_ids)), owner, func, args, kwargs)
+
+    def _add(self, slot, owner, func, args, kwargs):
+        with self._lock:
+            if self._pending.pop(slot, None) is not None:
+                self.coalesced += 1
+            self._pending[slot] = (owner, func, args, kwargs)  # Xếp lại cuối: giữ thứ tự lần publish cuối
+            if self._scheduled or self._root is None:
+                return
+            self._scheduled = True
+        try:
+            self._root.after(self.frame_ms, self._flush)
+        except RuntimeError:
+            # Root đã đóng (app đang thoát)
+            with self._lock:
+                self._scheduled = False
+
+    def _flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._scheduled = False
+        for owner, func, args, kwargs in pending.values():
+            try:
+                if owner is not None and not owner.winfo_exists():
+                    continue
+                func(*args, **kwargs)
+            except Exception as e:
+                print(f"[UI] Update {getattr(func, '__name__', func)} failed: {e}")
+        self.applied += len(pending)
+
+
+ui_updates = UIDispatcher()
 
 
 class SearchBar(ctk.CTkFrame):
-    """Thanh tìm kiếm - SonCuto themed"""
-    def __init__(self, master, placeholder: str = "Tìm kiếm...", on_search: Callable = None, **kwargs):
+    """Thanh tìm kiếm - SonCuto themed (live_delay: tìm khi gõ, sau live_delay ms ngừng gõ)"""
+    def __init__(self, master, placeholder: str = "Tìm kiếm...", on_search: Callable = None,
+                 live_delay: Optional[int] = None, **kwargs):
         super().__init__(master, fg_color="transparent", **kwargs)
 
         self.on_search = on_search
+        self._live_search = Debouncer(self, live_delay, self._do_search) if live_delay else None
 
         self.search_entry = ModernEntry(
             self,
@@ -499,6 +707,8 @@ class SearchBar(ctk.CTkFrame):
         )
         self.search_entry.pack(side="left", padx=(0, 6))
         self.search_entry.bind("<Return>", self._do_search)
+        if self._live_search:
+            self.search_entry.bind("<KeyRelease>", self._on_key_release)
 
         self.search_btn = ctk.CTkButton(
             self,
@@ -512,9 +722,217 @@ class SearchBar(ctk.CTkFrame):
         )
         self.search_btn.pack(side="left")
 
+    def _on_key_release(self, event=None):
+        if event is not None and event.keysym == "Return":
+            return
+        self._live_search()
+
     def _do_search(self, event=None):
+        if self._live_search:
+            self._live_search.cancel()
         if self.on_search:
             self.on_search(self.search_entry.get())
 
     def get_value(self) -> str:
         return self.search_entry.get()
+
+    def destroy(self):
+        if self._live_search:
+            self._live_search.cancel()
+        super().destroy()
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Danh sách ảo cho hàng nghìn dòng: chỉ tạo widget cho các dòng đang hiển thị,
+    tái sử dụng chúng khi cuộn và gắn dữ liệu theo index.
+
+    Args:
+        row_height: Chiều cao mỗi dòng (px), gồm cả row_gap
+        create_row: create_row(parent) -> widget, tạo một dòng rỗng (cao row_height - row_gap)
+        bind_row: bind_row(widget, index, item), đổ dữ liệu items[index] vào dòng
+        row_gap: Khoảng cách giữa các dòng (px)
+        empty_text: Chữ hiển thị khi danh sách rỗng
+    """
+
+    SCROLL_UNIT = 20  # px cho mỗi 'unit' của scrollbar
+    WHEEL_STEP = 60  # px cho mỗi nấc lăn chuột
+
+    def __init__(self, master, row_height: int, create_row: Callable, bind_row: Callable,
+                 row_gap: int = 2, empty_text: str = "", **kwargs):
+        kwargs.setdefault("fg_color", "transparent")
+        super().__init__(master, **kwargs)
+
+        self.row_height = row_height
+        self.row_gap = row_gap
+        self.create_row = create_row
+        self.bind_row = bind_row
+
+        self._items: List = []
+        self._offset = 0
+        self._rows: List = []  # Pool widget, dòng index i dùng _rows[i % len(_rows)]
+        self._bound: List[Optional[int]] = []  # Index đang gắn vào từng widget trong pool
+        self._placed: List[bool] = []
+
+        self._viewport = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self._viewport.pack(side="left", fill="both", expand=True)
+        self._scrollbar = ctk.CTkScrollbar(
+            self,
+            command=self._on_scrollbar,
+            button_color=COLORS["border"],
+            button_hover_color=COLORS.get("accent", COLORS["border"])
+        )
+        self._scrollbar.pack(side="right", fill="y")
+
+        self._empty_label = ctk.CTkLabel(
+            self._viewport,
+            text=empty_text,
+            font=font(13),
+            text_color=COLORS["text_secondary"],
+            justify="center"
+        )
+
+        # Lăn chuột trên mọi widget con: gắn bindtag riêng thay vì bind_all
+        self._wheel_tag = f"VirtualList{id(self)}"
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.bind_class(self._wheel_tag, sequence, self._on_mousewheel)
+        self._add_wheel_tag(self._viewport)
+        self._add_wheel_tag(self._empty_label)
+
+        self._viewport.bind("<Configure>", lambda e: self._layout())
+        self._layout()
+
+    # ============ DATA ============
+
+    @property
+    def items(self) -> List:
+        return self._items
+
+    def set_items(self, items: List, keep_position: bool = False):
+        """Thay toàn bộ dữ liệu (mặc định cuộn về đầu)"""
+        self._items = items
+        if not keep_position:
+            self._offset = 0
+        self._bound = [None] * len(self._rows)
+        self._layout()
+
+    def append_items(self, items: List):
+        """Nối thêm dữ liệu vào cuối, giữ vị trí cuộn"""
+        self._items.extend(items)
+        self._layout()
+
+    def refresh(self, index: int = None):
+        """Gắn lại dữ liệu cho các dòng đang hiển thị (hoặc chỉ dòng `index` nếu đang hiển thị)"""
+        if index is None:
+            self._bound = [None] * len(self._rows)
+        elif self._rows:
+            slot = index % len(self._rows)
+            if self._bound[slot] == index:
+                self._bound[slot] = None
+        self._layout()
+
+    def visible_range(self) -> range:
+        """Index các dòng đang hiển thị"""
+        height = self._viewport_height()
+        first = self._offset // self.row_height
+        last = min(len(self._items), -(-(self._offset + height) // self.row_height))
+        return range(first, max(first, last))
+
+    def scroll_to(self, index: int):
+        """Cuộn tới khi dòng `index` hiển thị"""
+        top = index * self.row_height
+        height = self._viewport_height()
+        if top < self._offset:
+            self._scroll_to_offset(top)
+        elif top + self.row_height > self._offset + height:
+            self._scroll_to_offset(top + self.row_height - height)
+
+    # ============ LAYOUT ============
+
+    def _viewport_height(self) -> int:
+        """Chiều cao vùng hiển thị theo đơn vị chưa scale (cùng đơn vị với row_height và place y)"""
+        return max(int(self._viewport.winfo_height() / self._get_widget_scaling()), 1)
+
+    def _max_offset(self) -> int:
+        return max(0, len(self._items) * self.row_height - self._viewport_height())
+
+    def _scroll_to_offset(self, offset: float):
+        offset = int(min(max(offset, 0), self._max_offset()))
+        if offset != self._offset:
+            self._offset = offset
+            self._layout()
+
+    def _layout(self):
+        """Đặt các dòng đang hiển thị theo vị trí cuộn, gắn dữ liệu cho dòng mới lộ ra"""
+        self._offset = min(self._offset, self._max_offset())
+        height = self._viewport_height()
+        visible = self.visible_range()
+
+        if not self._items:
+            self._empty_label.place(relx=0.5, y=50, anchor="n")
+        else:
+            self._empty_label.place_forget()
+
+        # Pool đủ cho số dòng vừa màn hình (+1 dòng bị cắt ở mép)
+        needed = min(len(self._items), height // self.row_height + 2)
+        while len(self._rows) < needed:
+            row = self.create_row(self._viewport)
+            self._add_wheel_tag(row)
+            self._rows.append(row)
+            self._bound = [None] * len(self._rows)  # Số slot đổi -> ánh xạ index % n đổi
+            self._placed = [False] * len(self._rows)
+            for widget in self._rows:
+                widget.place_forget()
+
+        used = set()
+        for index in visible:
+            slot = index % len(self._rows)
+            row = self._rows[slot]
+            if self._bound[slot] != index:
+                self.bind_row(row, index, self._items[index])
+                self._bound[slot] = index
+            row.place(x=0, y=index * self.row_height - self._offset, relwidth=1.0)
+            self._placed[slot] = True
+            used.add(slot)
+
+        for slot, row in enumerate(self._rows):
+            if self._placed[slot] and slot not in used:
+                row.place_forget()
+                self._placed[slot] = False
+
+        total = len(self._items) * self.row_height
+        if total <= height:
+            self._scrollbar.set(0.0, 1.0)
+        else:
+            self._scrollbar.set(self._offset / total, (self._offset + height) / total)
+
+    # ============ SCROLL EVENTS ============
+
+    def _on_scrollbar(self, action: str, value, unit: str = None):
+        if action == "moveto":
+            self._scroll_to_offset(float(value) * len(self._items) * self.row_height)
+        elif action == "scroll":
+            step = self._viewport_height() if unit == "pages" else self.SCROLL_UNIT
+            self._scroll_to_offset(self._offset + int(value) * step)
+
+    def _on_mousewheel(self, event):
+        if event.num == 4:
+            delta = -self.WHEEL_STEP
+        elif event.num == 5:
+            delta = self.WHEEL_STEP
+        elif abs(event.delta) >= 120:  # Windows: bội số của 120
+            delta = -event.delta // 120 * self.WHEEL_STEP
+        else:  # macOS
+            delta = -event.delta * self.WHEEL_STEP // 3
+        self._scroll_to_offset(self._offset + delta)
+        return "break"
+
+    def _add_wheel_tag(self, widget):
+        widget.bindtags(widget.bindtags() + (self._wheel_tag,))
+        for child in widget.winfo_children():
+            self._add_wheel_tag(child)
+
+    def destroy(self):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.unbind_class(self._wheel_tag, sequence)
+        super().destroy()